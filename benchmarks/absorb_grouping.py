@@ -0,0 +1,124 @@
+"""
+Absorb calls, tokens and cost of a bulk run per member group size.
+
+Streams ``--aspirations`` generated aspirations (mixed priorities, cycling
+through ``--categories`` categories) through
+``DPRSimulator.stream_multiple_aspirasi`` on the offline ``fake`` backend
+once per ``--group-sizes`` value. Group size 1 is the regular one call per
+member per aspiration; larger sizes send up to that many aspirations of a
+window to a member in one call. Reports absorb calls, absorb prompt and
+completion tokens, total cost, group items that fell back to a single
+call, and the priority of the first results delivered.
+
+Usage:
+    python benchmarks/absorb_grouping.py [--aspirations 60] [--group-sizes 1 2 4 8] [--categories 3]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import settings
+from src.core import DPRSimulator
+from src.core.komisi_data import CATEGORY_TO_KOMISI
+from src.core.metrics import metrics
+from src.core.sinks import ListSink
+from src.models import Aspirasi
+
+PRIORITIES = ("Rendah", "Sedang", "Tinggi")
+
+
+def generate(count: int, category_count: int):
+    categories = list(CATEGORY_TO_KOMISI)[:category_count]
+    for i in range(count):
+        yield Aspirasi(
+            id=i + 1,
+            source="Jawa Tengah",
+            category=categories[i % len(categories)],
+            content=f"Aspirasi nomor {i}: jalan rusak dan layanan kesehatan kurang memadai di desa kami.",
+            priority=PRIORITIES[i % len(PRIORITIES)],
+            timestamp=datetime.now(),
+        )
+
+
+def _absorb(values: Dict[tuple, float], **labels: str) -> float:
+    wanted = set(labels.items()) | {("agent", "absorb")}
+    return sum(v for k, v in values.items() if wanted <= set(k))
+
+
+async def run(args: argparse.Namespace, group_size: int) -> dict:
+    simulator = DPRSimulator(
+        api_key="sk-grouping", backend="fake", result_store_path="", deduplicate=False, memoize=False
+    )
+    simulator.create_members(args.members)
+    calls = dict(metrics.llm_calls._values)
+    tokens = dict(metrics.llm_tokens._values)
+    items = dict(metrics.absorb_group_items._values)
+    sink = ListSink()
+
+    start = time.perf_counter()
+    await simulator.stream_multiple_aspirasi(
+        generate(args.aspirations, args.categories), sink, sample_size=args.sample_size, group_size=group_size
+    )
+    elapsed = time.perf_counter() - start
+
+    def delta(after: Dict[tuple, float], before: Dict[tuple, float]) -> Dict[tuple, float]:
+        return {k: v - before.get(k, 0) for k, v in after.items()}
+
+    group_items = delta(metrics.absorb_group_items._values, items)
+    return {
+        "elapsed": elapsed,
+        "calls": _absorb(delta(metrics.llm_calls._values, calls)),
+        "prompt": _absorb(delta(metrics.llm_tokens._values, tokens), kind="prompt"),
+        "completion": _absorb(delta(metrics.llm_tokens._values, tokens), kind="completion"),
+        "cost": sum(r.total_cost_usd for r in sink.results),
+        "fallback": sum(v for k, v in group_items.items() if k != (("outcome", "ok"),)),
+        "first": "".join(r.aspirasi.priority[0] for r in sink.results[: args.window]),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--aspirations", type=int, default=60)
+    parser.add_argument("--group-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--members", type=int, default=580)
+    parser.add_argument("--sample-size", type=int, default=10)
+    parser.add_argument(
+        "--categories", type=int, default=3, help="Distinct categories (members are shared within one)"
+    )
+    parser.add_argument("--window", type=int, default=12, help="Aspirations per grouping window")
+    args = parser.parse_args()
+
+    settings.fake_llm_latency = 0.001
+    settings.fake_llm_latency_sigma = 0.0
+    settings.rate_limit_delay = 0.0
+    settings.absorb_group_window = args.window
+
+    print(f"{args.aspirations} aspirations, {args.sample_size} members each, window {args.window}")
+    print(f"{'group':>5} {'calls':>7} {'prompt tok':>11} {'compl tok':>10} {'cost $':>9} {'fallback':>9} {'s':>6}  first")
+    results = []
+    for group_size in args.group_sizes:
+        r = asyncio.run(run(args, group_size))
+        results.append(r)
+        print(
+            f"{group_size:>5} {r['calls']:>7.0f} {r['prompt']:>11.0f} {r['completion']:>10.0f} "
+            f"{r['cost']:>9.4f} {r['fallback']:>9.0f} {r['elapsed']:>6.2f}  {r['first']}"
+        )
+    if len(results) > 1:
+        baseline, r = results[0], results[-1]
+        print(
+            f"group {args.group_sizes[-1]} vs {args.group_sizes[0]}: "
+            f"{1 - r['prompt'] / baseline['prompt']:.0%} fewer absorb prompt tokens, "
+            f"{1 - r['cost'] / baseline['cost']:.0%} lower cost"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Per-call client overhead of the LLM backends.
+
+Drives each backend against an in-process mock of the chat completions
+endpoint (httpx.MockTransport with a fixed simulated latency), so only the
+client-side cost is measured: request building, response decoding and the
+library's wrappers. Reports CPU time per call, wall time, and (in a separate
+tracemalloc pass) peak and allocated memory per call.
+
+Usage:
+    python benchmarks/backend_overhead.py [--calls 1000] [--concurrency 1 64 512]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+
+from src.core.agents import AbsorbAgent
+from src.core.backends import BACKENDS, create_backend
+from src.core.member_factory import DPRMemberFactory
+from src.models import Aspirasi
+
+RESPONSE_CONTENT = json.dumps(
+    {
+        "relevansi": "Tinggi",
+        "alasan_relevansi": "Masuk lingkup komisi dan dapil",
+        "sentiment": "Kritis",
+        "quote": "Kami akan segera memanggil kementerian terkait untuk memastikan hal ini ditangani. " * 3,
+        "poin_kunci": ["anggaran", "pengawasan", "infrastruktur"],
+        "rekomendasi_awal": "Rapat dengar pendapat dengan kementerian terkait",
+    },
+    ensure_ascii=False,
+)
+
+
+def build_messages() -> list:
+    """A realistic absorb-stage prompt."""
+    member = DPRMemberFactory.create_members(1)[0]
+    aspirasi = Aspirasi(
+        id=1,
+        source="Jawa Barat",
+        category="Pendidikan",
+        content="Sekolah dasar di desa kami rusak parah dan belum diperbaiki sejak tiga tahun lalu.",
+        priority="Tinggi",
+        timestamp=datetime.now(),
+    )
+    agent = AbsorbAgent(api_key="sk-benchmark")
+    return [
+        {"role": "system", "content": agent.get_system_prompt()},
+        {"role": "user", "content": agent._build_user_prompt(member, aspirasi)},
+    ]
+
+
+def mock_client(latency: float) -> httpx.AsyncClient:
+    """HTTP client whose transport answers every request with a canned completion."""
+    body = {
+        "id": "chatcmpl-benchmark",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4.1-nano",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": RESPONSE_CONTENT},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": 900,
+            "completion_tokens": 150,
+            "total_tokens": 1050,
+            "prompt_tokens_details": {"cached_tokens": 0},
+        },
+    }
+    payload = json.dumps(body).encode()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if latency:
+            await asyncio.sleep(latency)
+        return httpx.Response(200, content=payload, headers={"content-type": "application/json"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def drive(backend_name: str, messages: list, calls: int, concurrency: int, latency: float) -> float:
+    """Run `calls` completions with at most `concurrency` in flight; return wall time."""
+    backend = create_backend(backend_name, "gpt-4.1-nano", "sk-benchmark", http_client=mock_client(latency))
+    await backend.complete(messages)  # warm up client creation and imports
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            await backend.complete(messages)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return time.perf_counter() - start
+
+
+def measure(backend_name: str, messages: list, calls: int, concurrency: int, latency: float) -> dict:
+    """CPU pass without tracemalloc, then a memory pass with it."""
+    # CPU pass (no tracemalloc overhead)
+    cpu_start = time.process_time()
+    wall = asyncio.run(drive(backend_name, messages, calls, concurrency, latency))
+    cpu = time.process_time() - cpu_start
+
+    # Memory pass
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    asyncio.run(drive(backend_name, messages, calls, concurrency, latency))
+    _, peak = tracemalloc.get_traced_memory()
+    allocated = sum(stat.size for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+
+    return {
+        "cpu_us_per_call": cpu / calls * 1e6,
+        "wall_s": wall,
+        "peak_kb_per_inflight": (peak - before) / 1024 / concurrency,
+        "peak_mb": (peak - before) / 1024 / 1024,
+        "retained_mb": allocated / 1024 / 1024,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=1000, help="Completions per configuration")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 64, 512])
+    parser.add_argument("--latency", type=float, default=0.005, help="Simulated server latency (s)")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    args = parser.parse_args()
+
+    messages = build_messages()
+    print(
+        f"{'backend':<10} {'conc':>5} {'CPU/call':>10} {'wall':>8} "
+        f"{'peak':>9} {'peak/inflight':>14} {'retained':>9}"
+    )
+    for concurrency in args.concurrency:
+        for backend_name in args.backends:
+            r = measure(backend_name, messages, args.calls, concurrency, args.latency)
+            print(
+                f"{backend_name:<10} {concurrency:>5} {r['cpu_us_per_call']:>8.0f}us {r['wall_s']:>7.2f}s "
+                f"{r['peak_mb']:>7.1f}MB {r['peak_kb_per_inflight']:>12.1f}KB {r['retained_mb']:>7.1f}MB"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Memory of a bulk run: streaming into a sink vs accumulating a list.
+
+Processes ``--aspirations`` generated aspirations on the offline ``fake``
+backend with ``DPRSimulator.stream_multiple_aspirasi`` and samples
+tracemalloc's current traced memory ten times along the run. With a
+streaming sink (results counted and dropped) memory should stay flat; with
+``--list`` (what ``process_multiple_aspirasi`` does) it grows with every
+result. Exits non-zero if a streaming run grows by more than
+``--max-growth-mb`` between the first and last checkpoint.
+
+Usage:
+    python benchmarks/bulk_memory.py [--aspirations 10000] [--concurrency 32] [--list]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import settings
+from src.core import DPRSimulator
+from src.core.komisi_data import CATEGORY_TO_KOMISI
+from src.core.sinks import CallbackSink, ListSink
+from src.models import Aspirasi
+
+
+def generate(count: int):
+    categories = list(CATEGORY_TO_KOMISI)
+    for i in range(count):
+        yield Aspirasi(
+            id=i + 1,
+            source="Jawa Tengah",
+            category=categories[i % len(categories)],
+            content=f"Aspirasi nomor {i}: jalan rusak dan layanan kesehatan kurang memadai di desa kami. " * 5,
+            priority="Sedang",
+            timestamp=datetime.now(),
+        )
+
+
+async def run(args: argparse.Namespace) -> list:
+    simulator = DPRSimulator(api_key="sk-bulk", backend="fake", result_store_path="", deduplicate=False)
+    simulator.create_members(args.members)
+    every = max(1, args.aspirations // 10)
+    checkpoints = []
+    done = 0
+
+    def checkpoint(_result) -> None:
+        nonlocal done
+        done += 1
+        if done % every == 0:
+            checkpoints.append((done, tracemalloc.get_traced_memory()[0] / 1e6))
+
+    if args.list:
+        inner = ListSink()
+
+        async def keep(result) -> None:
+            await inner.put(result)
+            checkpoint(result)
+
+        sink = CallbackSink(keep)
+    else:
+        sink = CallbackSink(checkpoint)
+
+    await simulator.stream_multiple_aspirasi(
+        generate(args.aspirations), sink, sample_size=args.sample_size, concurrency=args.concurrency
+    )
+    return checkpoints
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--aspirations", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=32, help="Aspirations in flight")
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--sample-size", type=int, default=5)
+    parser.add_argument("--list", action="store_true", help="Accumulate results in a list instead")
+    parser.add_argument("--max-growth-mb", type=float, default=5.0)
+    args = parser.parse_args()
+
+    settings.fake_llm_latency = 0.001
+    settings.fake_llm_latency_sigma = 0.0
+    settings.rate_limit_delay = 0.0
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    checkpoints = asyncio.run(run(args))
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+
+    mode = "list" if args.list else "streaming sink"
+    print(f"{mode}: {args.aspirations} aspirations in {elapsed:.1f} s, peak traced {peak:.1f} MB")
+    print(f"{'results':>8} {'traced MB':>10}")
+    for done, current in checkpoints:
+        print(f"{done:>8} {current:>10.2f}")
+
+    growth = checkpoints[-1][1] - checkpoints[0][1] if checkpoints else 0.0
+    print(f"growth first -> last checkpoint: {growth:+.2f} MB")
+    if not args.list and growth > args.max_growth_mb:
+        print(f"FAIL: streaming run grew by more than {args.max_growth_mb} MB")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
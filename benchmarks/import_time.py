@@ -0,0 +1,109 @@
+"""
+Cold-start import benchmark.
+
+Runs each scenario in a fresh interpreter and reports the median time spent
+importing and initializing, plus any heavy dependency that got loaded
+although the scenario should not need it. Exits non-zero when a scenario
+exceeds its threshold or loads a forbidden module.
+
+Usage:
+    python benchmarks/import_time.py [--repeat 5] [--scale 1.0]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["gradio", "pandas", "langchain_core", "langchain_openai", "openai", "pydantic_settings"]
+
+# name -> (code, threshold in seconds or None, modules that must stay unloaded)
+SCENARIOS = {
+    "cli --help": (
+        "import src.cli; src.cli.build_parser()",
+        0.15,
+        HEAVY_MODULES,
+    ),
+    "headless ready": (
+        "from datetime import datetime\n"
+        "from src.core import DPRSimulator\n"
+        "from src.models import Aspirasi\n"
+        "simulator = DPRSimulator(api_key='sk-benchmark')\n"
+        "simulator.create_members(575)\n"
+        "Aspirasi(id=1, source='Jawa Barat', category='Pendidikan', content='x',"
+        " priority='Sedang', timestamp=datetime.now())",
+        0.6,
+        ["gradio", "pandas", "langchain_core", "langchain_openai", "openai"],
+    ),
+    "headless first call": (
+        "from src.core import DPRSimulator\n"
+        "simulator = DPRSimulator(api_key='sk-benchmark')\n"
+        "simulator.create_members(575)\n"
+        "simulator.router.endpoints[0].backend.client",
+        None,
+        ["gradio", "pandas"],
+    ),
+    "ui": (
+        "import src.ui.app",
+        None,
+        [],
+    ),
+}
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+exec(compile({code!r}, "<scenario>", "exec"))
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_scenario(code: str, repeat: int) -> dict:
+    """Run one scenario `repeat` times in fresh interpreters."""
+    timings, loaded = [], set()
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD.format(code=code, heavy=HEAVY_MODULES)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result["elapsed"])
+        loaded.update(result["loaded"])
+    return {"median": statistics.median(timings), "min": min(timings), "loaded": sorted(loaded)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per scenario")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply thresholds (slow machines)")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'scenario':<22} {'median':>9} {'min':>9} {'limit':>9}  heavy modules loaded")
+    for name, (code, threshold, forbidden) in SCENARIOS.items():
+        result = run_scenario(code, args.repeat)
+        limit = threshold * args.scale if threshold else None
+        too_slow = limit is not None and result["median"] > limit
+        leaked = [m for m in result["loaded"] if m in forbidden]
+        failed |= too_slow or bool(leaked)
+
+        status = "FAIL" if too_slow or leaked else "ok"
+        print(
+            f"{name:<22} {result['median'] * 1000:>7.0f}ms {result['min'] * 1000:>7.0f}ms "
+            f"{(f'{limit * 1000:.0f}ms' if limit else '-'):>9}  "
+            f"{', '.join(result['loaded']) or '-'}  {status}"
+            + (f" (unexpected: {', '.join(leaked)})" if leaked else "")
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
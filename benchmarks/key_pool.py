@@ -0,0 +1,142 @@
+"""
+Throughput of an API key pool against per-key rate limits.
+
+Runs absorb-stage calls through ``EndpointRouter`` against an in-process mock
+of the chat completions endpoint that enforces a requests-per-minute quota
+per API key (keyed on the Authorization header) and answers HTTP 429 with a
+Retry-After header once a key's quota is spent. With the router's per-key
+RPM budget set to the same quota, throughput should grow linearly with the
+number of keys while the mock returns (almost) no 429s. Each key starts
+with one second of burst capacity, so short runs land slightly above the
+ideal rate.
+
+Usage:
+    python benchmarks/key_pool.py [--keys 1 2 4 8] [--rpm 600] [--duration 10]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+
+from src.config import settings
+from src.core.agents import AbsorbAgent
+from src.core.backends import BACKENDS
+from src.core.routing import EndpointRouter
+from src.models import LLMEndpoint
+
+from backend_overhead import build_messages, RESPONSE_CONTENT
+
+
+class QuotaServer:
+    """Mock API enforcing a per-key RPM quota with one-second buckets."""
+
+    def __init__(self, rpm: int, latency: float):
+        self.rate = rpm / 60.0
+        self.latency = latency
+        self.levels = defaultdict(lambda: max(1.0, self.rate))
+        self.updated = {}
+        self.served = 0
+        self.throttled = 0
+        body = {
+            "id": "chatcmpl-benchmark",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4.1-nano",
+            "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": RESPONSE_CONTENT}, "finish_reason": "stop"}
+            ],
+            "usage": {"prompt_tokens": 900, "completion_tokens": 150, "total_tokens": 1050},
+        }
+        self.payload = json.dumps(body).encode()
+
+    def _admit(self, key: str) -> bool:
+        now = time.monotonic()
+        elapsed = now - self.updated.get(key, now)
+        self.updated[key] = now
+        self.levels[key] = min(max(1.0, self.rate), self.levels[key] + elapsed * self.rate)
+        if self.levels[key] < 1.0:
+            return False
+        self.levels[key] -= 1.0
+        return True
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        key = request.headers.get("authorization", "")
+        if not self._admit(key):
+            self.throttled += 1
+            error = {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}}
+            return httpx.Response(429, json=error, headers={"retry-after-ms": "200"})
+        await asyncio.sleep(self.latency)
+        self.served += 1
+        return httpx.Response(200, content=self.payload, headers={"content-type": "application/json"})
+
+
+async def run(backend: str, keys: int, rpm: int, duration: float, concurrency: int, latency: float) -> dict:
+    """Send calls for `duration` seconds through a pool of `keys` keys."""
+    server = QuotaServer(rpm, latency)
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(server.handler))
+    endpoints = [LLMEndpoint(name=f"key-{i}", api_key=f"sk-bench-{i}", rpm=rpm) for i in range(1, keys + 1)]
+    router = EndpointRouter(endpoints, backend=backend, model="gpt-4.1-nano")
+    for endpoint in router.endpoints:
+        endpoint.backend.http_client = http_client
+
+    agent = AbsorbAgent(api_key="sk-benchmark", router=router)
+    messages = build_messages()
+    deadline = time.perf_counter() + duration
+    completed = 0
+    failed = 0
+
+    async def worker() -> None:
+        nonlocal completed, failed
+        while time.perf_counter() < deadline:
+            try:
+                await agent._complete(messages)
+            except Exception:
+                failed += 1
+                continue
+            # Calls still queued at the deadline drain afterwards and are not counted
+            if time.perf_counter() <= deadline:
+                completed += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {
+        "completed": completed,
+        "failed": failed,
+        "throttled": server.throttled,
+        "rps": completed / duration,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--rpm", type=int, default=600, help="Quota per key (requests per minute)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per configuration")
+    parser.add_argument("--concurrency", type=int, default=64, help="Calls in flight")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated server latency (s)")
+    parser.add_argument("--backend", default="openai", choices=BACKENDS)
+    args = parser.parse_args()
+
+    settings.llm_retry_backoff = 0.05
+
+    print(f"Per-key quota: {args.rpm} RPM ({args.rpm / 60:.1f}/s)")
+    print(f"{'keys':>5} {'completed':>10} {'req/s':>8} {'ideal':>8} {'429s':>6} {'failed':>7}")
+    for keys in args.keys:
+        r = asyncio.run(run(args.backend, keys, args.rpm, args.duration, args.concurrency, args.latency))
+        ideal = keys * args.rpm / 60
+        print(
+            f"{keys:>5} {r['completed']:>10} {r['rps']:>8.1f} {ideal:>8.1f} "
+            f"{r['throttled']:>6} {r['failed']:>7}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+Multi-user load test of the Gradio app against the offline ``fake`` LLM backend.
+
+Simulated users submit aspirations back to back, either straight through
+the app's event handler (``process_aspirasi_async`` on one event loop,
+behind a semaphore of GRADIO_CONCURRENCY_LIMIT, like Gradio's queue), or
+over HTTP through ``gradio_client`` against the app launched in-process
+(``--http``). For each concurrency level it reports throughput, p50/p95/p99
+end-to-end and time-to-first-update latency, errors, and the peak RSS and
+thread count sampled during the level.
+
+Scenarios are named user ramps so runs are repeatable and comparable:
+
+    smoke   1, 5 users x 2 requests
+    ramp    1, 10, 25, 50, 100 users x 3 requests
+    spike   200 users x 1 request
+    soak    50 users x 20 requests
+
+Usage:
+    python benchmarks/load_test.py [--scenario ramp] [--latency 0.8] [--http]
+    python benchmarks/load_test.py --users 1 20 80 --requests 2
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import settings
+from src.config.examples import (
+    ASPIRATION_1, ASPIRATION_2, ASPIRATION_3, ASPIRATION_4, ASPIRATION_5, ASPIRATION_6, ASPIRATION_7,
+)
+
+SCENARIOS: Dict[str, Tuple[List[int], int]] = {
+    "smoke": ([1, 5], 2),
+    "ramp": ([1, 10, 25, 50, 100], 3),
+    "spike": ([200], 1),
+    "soak": ([50], 20),
+}
+REQUESTS = [
+    (ASPIRATION_1, "Pendidikan", "Jawa Barat"),
+    (ASPIRATION_2, "Kesehatan", "Jawa Timur"),
+    (ASPIRATION_3, "Infrastruktur", "DKI Jakarta"),
+    (ASPIRATION_4, "Lingkungan", "Kalimantan Timur"),
+    (ASPIRATION_5, "Infrastruktur", "Jawa Timur"),
+    (ASPIRATION_6, "Kelautan", "Sulawesi Selatan"),
+    (ASPIRATION_7, "Lingkungan", "Riau"),
+]
+AUTO_KOMISI = "Auto (Sesuai Kategori)"
+
+
+def rss_mb() -> float:
+    """Current resident set size (Linux), else the process peak."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+class Sampler:
+    """Background thread sampling RSS and thread count."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak_rss = 0.0
+        self.peak_threads = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak_rss = max(self.peak_rss, rss_mb())
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "Sampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class Level:
+    """Latencies and errors of one concurrency level."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.first_updates: List[float] = []
+        self.errors = 0
+
+    def observe(self, start: float, first: float, failed: bool) -> None:
+        self.latencies.append(time.perf_counter() - start)
+        self.first_updates.append(first - start)
+        self.errors += failed
+
+
+def request_args(user: int, i: int, args: argparse.Namespace) -> list:
+    content, category, source = REQUESTS[(user + i) % len(REQUESTS)]
+    # A per-request suffix keeps prompts (and so fake answers) distinct
+    content = f"{content}\n\n(Pengirim #{user}-{i})"
+    return [content, category, AUTO_KOMISI, source, "Sedang", args.members, args.sample_size, "sk-load-test"]
+
+
+async def run_handler_level(users: int, args: argparse.Namespace) -> Level:
+    """N users calling the Gradio event handler on one event loop."""
+    from src.ui.app import process_aspirasi_async
+
+    level = Level()
+    queue_slots = asyncio.Semaphore(settings.gradio_concurrency_limit)
+
+    async def user(uid: int) -> None:
+        for i in range(args.requests):
+            start = time.perf_counter()
+            first = None
+            async with queue_slots:
+                async for out in process_aspirasi_async(*request_args(uid, i, args), [], None):
+                    first = first or time.perf_counter()
+            messages = out[0]
+            level.observe(start, first, "❌" in messages[-1]["content"])
+
+    await asyncio.gather(*(user(uid) for uid in range(users)))
+    return level
+
+
+def run_http_level(users: int, args: argparse.Namespace, url: str) -> Level:
+    """N users calling the launched app over HTTP, one client thread each."""
+    from gradio_client import Client
+
+    level = Level()
+    lock = threading.Lock()
+
+    def user(uid: int) -> None:
+        client = Client(url, verbose=False)
+        for i in range(args.requests):
+            start = time.perf_counter()
+            job = client.submit(*request_args(uid, i, args), [], api_name="/process_aspirasi")
+            first = None
+            failed = False
+            try:
+                for out in job:
+                    first = first or time.perf_counter()
+                messages = job.outputs()[-1][0]
+                failed = "❌" in messages[-1]["content"]
+            except Exception:
+                failed = True
+            with lock:
+                level.observe(start, first or time.perf_counter(), failed)
+
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        list(pool.map(user, range(users)))
+    return level
+
+
+def percentile(values: List[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def launch_app() -> str:
+    """Launch the app in this process and return its URL."""
+    from src.ui.app import create_app
+
+    app = create_app()
+    app.queue(
+        default_concurrency_limit=settings.gradio_concurrency_limit,
+        max_size=settings.gradio_max_queue_size,
+    )
+    app.launch(server_name="127.0.0.1", prevent_thread_lock=True, quiet=True)
+    return app.local_url
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=SCENARIOS, default="ramp")
+    parser.add_argument("--users", type=int, nargs="+", help="Concurrency levels (overrides the scenario)")
+    parser.add_argument("--requests", type=int, help="Requests per user (overrides the scenario)")
+    parser.add_argument("--latency", type=float, default=0.8, help="Median fake LLM latency in seconds")
+    parser.add_argument("--members", type=int, default=100, help="Simulated DPR members per simulator")
+    parser.add_argument("--sample-size", type=int, default=20, help="Members processing each aspiration")
+    parser.add_argument("--http", action="store_true", help="Drive the launched app over HTTP (gradio_client)")
+    parser.add_argument("--store", action="store_true", help="Keep saving results to RESULT_STORE_PATH")
+    args = parser.parse_args()
+
+    levels, requests = SCENARIOS[args.scenario]
+    levels = args.users or levels
+    args.requests = args.requests or requests
+
+    settings.llm_backend = "fake"
+    settings.fake_llm_latency = args.latency
+    settings.gradio_max_queue_size = max(settings.gradio_max_queue_size, max(levels) * 2)
+    if not args.store:
+        settings.result_store_path = ""
+
+    run_level: Callable[[int], Level]
+    if args.http:
+        url = launch_app()
+        run_level = lambda users: run_http_level(users, args, url)  # noqa: E731
+    else:
+        run_level = lambda users: asyncio.run(run_handler_level(users, args))  # noqa: E731
+
+    mode = "http" if args.http else "handler"
+    print(
+        f"{mode} mode · fake LLM {args.latency:.2f} s median · concurrency limit "
+        f"{settings.gradio_concurrency_limit} · {args.requests} requests per user"
+    )
+    print(
+        f"{'users':>6} {'req/s':>7} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'first p95':>10} "
+        f"{'errors':>7} {'peak MB':>8} {'threads':>8}"
+    )
+    # Imports, simulator pool and (in HTTP mode) client handshake are not part of any level
+    run_level(1)
+    for users in levels:
+        start = time.perf_counter()
+        with Sampler() as sampler:
+            level = run_level(users)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{users:>6} {len(level.latencies) / elapsed:>7.2f} {percentile(level.latencies, 50):>7.2f} "
+            f"{percentile(level.latencies, 95):>7.2f} {percentile(level.latencies, 99):>7.2f} "
+            f"{percentile(level.first_updates, 95):>10.2f} {level.errors:>7} "
+            f"{sampler.peak_rss:>8.0f} {sampler.peak_threads:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Throughput and memory of the Parquet exporter against pandas flattening.
+
+Builds synthetic PipelineResults (``--results`` aspirations x ``--members``
+member responses), then measures:
+
+* pandas: ``model_dump`` every result and flatten the responses with
+  ``pd.json_normalize`` (the by-hand approach), peak traced memory;
+* export: stream the same results through ``ParquetExporter``, peak traced
+  memory and rows per second;
+* read: memory-mapped read of three columns of the response table, and a
+  group-by on the dictionary-encoded faction column.
+
+Needs pyarrow.
+
+Usage:
+    python benchmarks/parquet_export.py [--results 2000] [--members 50]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.export import ParquetExporter, read_table
+from src.core.komisi_data import CATEGORY_TO_KOMISI
+from src.models import AbsorpsiResponse, Aspirasi, KompilasiResponse, PipelineResult, TindakLanjutResponse
+
+SENTIMENTS = ["Positif", "Negatif", "Kritis", "Netral"]
+RELEVANSI = ["Tinggi", "Sedang", "Rendah"]
+
+
+def make_results(count: int, members: int) -> list:
+    categories = list(CATEGORY_TO_KOMISI)
+    start = datetime(2025, 1, 1)
+    results = []
+    for i in range(count):
+        aspirasi = Aspirasi(
+            id=i + 1,
+            source="Jawa Timur",
+            category=categories[i % len(categories)],
+            content=f"Aspirasi sintetis nomor {i} tentang layanan publik di daerah kami",
+            priority="Sedang",
+            timestamp=start,
+        )
+        responses = [
+            AbsorpsiResponse(
+                member_id=m + 1,
+                aspirasi_id=i + 1,
+                relevansi=RELEVANSI[(i + m) % 3],
+                alasan_relevansi="Masuk lingkup komisi dan dapil anggota",
+                poin_kunci=["anggaran", "pengawasan"],
+                rekomendasi_awal="Rapat dengar pendapat dengan kementerian terkait",
+                sentiment=SENTIMENTS[(i * m) % 4],
+                quote="Kami akan memanggil kementerian terkait untuk memastikan hal ini ditangani.",
+                cost_usd=0.0004,
+            )
+            for m in range(members)
+        ]
+        results.append(
+            PipelineResult(
+                aspirasi=aspirasi,
+                tanggapan_anggota=responses,
+                kompilasi=KompilasiResponse(status="terkumpul", jumlah_anggota=members, ringkasan="Ringkasan"),
+                tindak_lanjut=TindakLanjutResponse(langkah_tindak_lanjut=["RDP", "Kunjungan kerja"]),
+                timestamp=start + timedelta(days=i % 30),
+                total_cost_usd=0.02,
+            )
+        )
+    return results
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return value, elapsed, peak / 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=2000)
+    parser.add_argument("--members", type=int, default=50)
+    args = parser.parse_args()
+
+    results = make_results(args.results, args.members)
+    rows = args.results * args.members
+    print(f"{args.results} results x {args.members} members = {rows} response rows")
+
+    def flatten_pandas():
+        import pandas as pd
+
+        dumped = [r.model_dump() for r in results]
+        return pd.json_normalize(dumped, record_path="tanggapan_anggota", meta=[["aspirasi", "category"]])
+
+    frame, elapsed, peak = measure(flatten_pandas)
+    print(f"pandas json_normalize: {elapsed:6.2f} s  peak {peak:7.1f} MB  ({len(frame)} rows)")
+    del frame
+
+    with tempfile.TemporaryDirectory() as root:
+
+        def export():
+            with ParquetExporter(root) as exporter:
+                exporter.write_all(results)
+            return exporter
+
+        exporter, elapsed, peak = measure(export)
+        print(
+            f"parquet export:        {elapsed:6.2f} s  peak {peak:7.1f} MB  "
+            f"({rows / elapsed:,.0f} response rows/s)"
+        )
+        size = sum(p.stat().st_size for p in Path(root).rglob("*.parquet")) / 1e6
+        print(f"files on disk:         {size:6.1f} MB")
+
+        start = time.perf_counter()
+        table = read_table(root, "tanggapan", columns=["fraksi", "sentiment", "cost_usd"])
+        grouped = table.group_by(["fraksi", "sentiment"]).aggregate([("cost_usd", "sum")])
+        print(
+            f"mmap read + group-by:  {time.perf_counter() - start:6.2f} s  "
+            f"({table.num_rows} rows, {grouped.num_rows} groups)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
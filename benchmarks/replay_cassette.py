@@ -0,0 +1,102 @@
+"""
+Replay the traffic of a recorded cassette through the router and parsers.
+
+Every call in the cassette is re-issued at its recorded start offset
+(divided by ``--speedup``), through an ``EndpointRouter`` with the given
+endpoint count and per-key budgets, and answered from the cassette after
+its recorded latency (times ``--latency-scale``). This reproduces a real
+traffic shape offline, so a scheduler or parser change can be compared
+against the same calls: the report shows throughput, queueing delay,
+cassette misses, and whether each replayed response parsed and matched
+the recorded content exactly.
+
+Record a cassette with ``python main.py run ... --record calls.jsonl.gz``
+(or CASSETTE_MODE=record in the UI).
+
+Usage:
+    python benchmarks/replay_cassette.py calls.jsonl.gz [--speedup 10] [--keys 1] [--rpm 0]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import settings
+from src.core.agents import AbsorbAgent
+from src.core.cassette import Cassette, read_entries
+from src.core.routing import EndpointRouter
+from src.models import LLMEndpoint
+
+
+async def run(args: argparse.Namespace) -> dict:
+    entries = list(read_entries(args.cassette))
+    cassette = Cassette(args.cassette, "replay", latency_scale=args.latency_scale)
+    endpoints = [
+        LLMEndpoint(name=f"key-{i}", api_key=f"sk-replay-{i}", rpm=args.rpm, tpm=args.tpm)
+        for i in range(1, args.keys + 1)
+    ]
+    router = EndpointRouter(endpoints, backend="cassette", model=settings.openai_model)
+    # The agent only routes and parses; its stage label comes from each entry
+    agent = AbsorbAgent(api_key="sk-replay", router=router, cassette=cassette)
+
+    waits, matched, parsed, failed = [], 0, 0, 0
+    start = time.perf_counter()
+
+    async def replay(entry: dict) -> None:
+        nonlocal matched, parsed, failed
+        await asyncio.sleep(max(0.0, entry["offset_s"] / args.speedup - (time.perf_counter() - start)))
+        issued = time.perf_counter()
+        agent.stage = entry["stage"]
+        try:
+            content, _ = await agent._complete(entry["messages"], model=entry["model"])
+        except Exception:
+            failed += 1
+            return
+        waits.append((time.perf_counter() - issued) * 1000)
+        matched += content == entry["content"]
+        try:
+            agent._parse_json(content)
+            parsed += 1
+        except ValueError:
+            pass
+
+    await asyncio.gather(*(replay(e) for e in entries))
+    elapsed = time.perf_counter() - start
+    return {
+        "calls": len(entries),
+        "elapsed": elapsed,
+        "rps": len(entries) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(waits) if waits else 0.0,
+        "p95_ms": statistics.quantiles(waits, n=20)[-1] if len(waits) >= 2 else 0.0,
+        "matched": matched,
+        "parsed": parsed,
+        "failed": failed,
+        "misses": cassette.misses,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cassette", help="Recorded cassette (.jsonl.gz)")
+    parser.add_argument("--speedup", type=float, default=1.0, help="Divide recorded start offsets by this")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier of recorded latency")
+    parser.add_argument("--keys", type=int, default=1, help="Endpoints (API keys) in the router")
+    parser.add_argument("--rpm", type=int, default=0, help="RPM budget per key (0 = unlimited)")
+    parser.add_argument("--tpm", type=int, default=0, help="TPM budget per key (0 = unlimited)")
+    args = parser.parse_args()
+
+    r = asyncio.run(run(args))
+    print(f"calls:     {r['calls']} in {r['elapsed']:.2f} s ({r['rps']:.1f} calls/s)")
+    print(f"latency:   p50 {r['p50_ms']:.1f} ms  p95 {r['p95_ms']:.1f} ms (routing + replayed latency)")
+    print(f"outputs:   {r['matched']} identical, {r['parsed']} parsed as JSON")
+    print(f"failures:  {r['failed']} ({r['misses']} cassette misses)")
+    return 0 if not r["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Per-response CPU and allocation of the absorb hot path.
+
+Two steps run for every member response of every aspiration:
+
+construction  building the ``AbsorpsiResponse`` from the parsed LLM output:
+              ``validated`` (what the agent does), ``construct``
+              (``model_construct``, skipping validation) and ``slots`` (a
+              ``__slots__`` dataclass, as a lower bound)
+aggregation   turning the responses of one aspiration into analytics:
+              ``rows`` (``ResponseRow`` tuples counted with ``Counter``, what
+              ``aggregate_responses`` does) and ``frame`` (the same rows
+              loaded into a categorical pandas frame and grouped)
+
+Each path is timed (best of ``--repeat``) and its traced allocation per
+response measured with tracemalloc, for ``--responses`` objects or for
+aspirations of ``--sample-size`` responses.
+
+Usage:
+    python benchmarks/response_construction.py [--responses 20000] [--sample-size 20]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.analytics import ResponseRow, aggregate_responses, response_rows
+from src.core.member_factory import DPRMemberFactory
+from src.models import AbsorpsiResponse
+
+
+@dataclass(slots=True)
+class SlotsResponse:
+    member_id: int
+    aspirasi_id: int
+    relevansi: str
+    alasan_relevansi: str
+    poin_kunci: List[str] = field(default_factory=list)
+    rekomendasi_awal: str = ""
+    sentiment: str = "Netral"
+    quote: str = ""
+    tier: str = "full"
+    triage_cost_usd: float = 0.0
+    error: Optional[str] = None
+    cost_usd: float = 0.0
+
+
+PARSED = {
+    "relevansi": "Tinggi",
+    "alasan_relevansi": "Aspirasi masuk lingkup komisi dan berasal dari dapil anggota.",
+    "sentiment": "Kritis",
+    "quote": "Kami akan memanggil kementerian terkait untuk rapat dengar pendapat secepatnya.",
+    "poin_kunci": ["jalan rusak", "anggaran daerah", "keselamatan warga"],
+    "rekomendasi_awal": "Rapat dengar pendapat dengan kementerian terkait.",
+}
+
+
+def validated(i: int):
+    r = PARSED
+    return AbsorpsiResponse(
+        member_id=i,
+        aspirasi_id=1,
+        relevansi=r.get("relevansi", "rendah"),
+        alasan_relevansi=r.get("alasan_relevansi", ""),
+        sentiment=r.get("sentiment", "Netral"),
+        quote=r.get("quote", ""),
+        poin_kunci=r.get("poin_kunci", []),
+        rekomendasi_awal=r.get("rekomendasi_awal", ""),
+        cost_usd=0.00012,
+    )
+
+
+def construct(i: int):
+    r = PARSED
+    return AbsorpsiResponse.model_construct(
+        member_id=i,
+        aspirasi_id=1,
+        relevansi=r.get("relevansi", "rendah"),
+        alasan_relevansi=r.get("alasan_relevansi", ""),
+        sentiment=r.get("sentiment", "Netral"),
+        quote=r.get("quote", ""),
+        poin_kunci=list(r.get("poin_kunci", [])),
+        rekomendasi_awal=r.get("rekomendasi_awal", ""),
+        cost_usd=0.00012,
+    )
+
+
+def slots(i: int):
+    r = PARSED
+    return SlotsResponse(
+        member_id=i,
+        aspirasi_id=1,
+        relevansi=r.get("relevansi", "rendah"),
+        alasan_relevansi=r.get("alasan_relevansi", ""),
+        sentiment=r.get("sentiment", "Netral"),
+        quote=r.get("quote", ""),
+        poin_kunci=list(r.get("poin_kunci", [])),
+        rekomendasi_awal=r.get("rekomendasi_awal", ""),
+        cost_usd=0.00012,
+    )
+
+
+def frame_aggregate(responses, members) -> dict:
+    """The pandas alternative: one categorical frame, grouped per count."""
+    import pandas as pd
+
+    frame = pd.DataFrame.from_records(
+        response_rows(responses, {m.id: m for m in members}), columns=ResponseRow._fields
+    )
+    for col in ("fraksi", "komisi", "provinsi", "relevansi", "sentiment"):
+        frame[col] = frame[col].astype("category")
+    ok = frame[frame["ok"]]
+    stance = ok[ok["sentiment"] != ""]
+    return {
+        "relevansi": ok["relevansi"].value_counts().to_dict(),
+        "sentiment": stance["sentiment"].value_counts().to_dict(),
+        "fraksi_x_sentiment": stance.groupby(["fraksi", "sentiment"], observed=True).size().to_dict(),
+        "komisi_x_relevansi": ok.groupby(["komisi", "relevansi"], observed=True).size().to_dict(),
+        "provinsi_x_relevansi": ok.groupby(["provinsi", "relevansi"], observed=True).size().to_dict(),
+        "biaya_per_fraksi": frame.groupby("fraksi", observed=True)["cost_usd"].sum().to_dict(),
+    }
+
+
+def measure_construction(build: Callable[[int], object], count: int, repeat: int) -> Tuple[float, float]:
+    """Best-of-``repeat`` microseconds per object, and bytes allocated per object kept alive."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(count):
+            build(i)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build(i) for i in range(count)]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return best / count * 1e6, allocated / count
+
+
+def measure_aggregation(aggregate: Callable, batches: List[list], members: list, repeat: int) -> Tuple[float, float]:
+    """Best-of-``repeat`` microseconds per response, and peak bytes per response of one aspiration."""
+    count = sum(len(batch) for batch in batches)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for batch in batches:
+            aggregate(batch, members)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    aggregate(batches[0], members)
+    peak = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return best / count * 1e6, peak / len(batches[0])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--responses", type=int, default=20000, help="Responses per measurement")
+    parser.add_argument("--sample-size", type=int, default=20, help="Responses per aspiration when aggregating")
+    parser.add_argument("--members", type=int, default=580)
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repeats (best is kept)")
+    args = parser.parse_args()
+
+    members = DPRMemberFactory.create_members(args.members)
+    responses = [
+        validated(i % args.members + 1).model_copy(update={"aspirasi_id": i // args.sample_size})
+        for i in range(args.responses)
+    ]
+    batches = [responses[i : i + args.sample_size] for i in range(0, len(responses), args.sample_size)]
+    # pandas import is not part of the measurement
+    frame_aggregate(batches[0], members)
+
+    results = {
+        ("construction", "validated"): measure_construction(validated, args.responses, args.repeat),
+        ("construction", "construct"): measure_construction(construct, args.responses, args.repeat),
+        ("construction", "slots"): measure_construction(slots, args.responses, args.repeat),
+        ("aggregation", "rows"): measure_aggregation(aggregate_responses, batches, members, args.repeat),
+        ("aggregation", "frame"): measure_aggregation(frame_aggregate, batches, members, args.repeat),
+    }
+
+    print(f"{args.responses} responses, {args.sample_size} per aspiration")
+    print(f"{'step':<13} {'path':<10} {'us/resp':>9} {'bytes/resp':>11}")
+    for (step, path), (us, size) in results.items():
+        print(f"{step:<13} {path:<10} {us:>9.2f} {size:>11.0f}")
+
+    rows_us, rows_size = results[("aggregation", "rows")]
+    frame_us, frame_size = results[("aggregation", "frame")]
+    print(
+        f"rows vs frame: {frame_us - rows_us:.1f} us and {frame_size - rows_size:.0f} bytes "
+        f"saved per response ({frame_us / rows_us:.0f}x faster)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
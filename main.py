@@ -1,17 +1,14 @@
 """DPR AI Simulator - Main entry point."""
 
-from src.ui import launch_app
+import sys
+
+from src.cli import main as cli_main
 
 
 def main():
-    """Launch the DPR AI Simulator application."""
-    print("🏛️ Starting DPR AI Simulator...")
-    print("=" * 50)
-    print("Simulasi AI untuk Menyerap, Menghimpun, dan")
-    print("Menindaklanjuti Aspirasi Rakyat Indonesia")
-    print("=" * 50)
-    launch_app()
+    """Launch the DPR AI Simulator application (or a CLI command, see --help)."""
+    return cli_main()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
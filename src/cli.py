@@ -0,0 +1,502 @@
+"""Command-line interface for DPR AI Simulator."""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from .config import settings
+
+
+def _write_output(text: str, path: str) -> None:
+    """Write text to a file, or to stdout when path is '-'."""
+    if path == "-":
+        print(text)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def _read_content(args: argparse.Namespace) -> Optional[str]:
+    """Aspiration text from --content or --content-file."""
+    if args.content_file:
+        with open(args.content_file, encoding="utf-8") as f:
+            return f.read()
+    return args.content
+
+
+def cmd_ui(args: argparse.Namespace) -> int:
+    """Launch the Gradio web application."""
+    from .ui import launch_app
+
+    print("🏛️ Starting DPR AI Simulator...")
+    print("=" * 50)
+    print("Simulasi AI untuk Menyerap, Menghimpun, dan")
+    print("Menindaklanjuti Aspirasi Rakyat Indonesia")
+    print("=" * 50)
+    launch_app()
+    return 0
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    """Process one aspiration headlessly and print the result."""
+    from .core import DPRSimulator
+    from .core.metrics import metrics, start_metrics_server
+    from .models import Aspirasi
+
+    if args.record and args.replay:
+        print("❌ Error: pass either --record or --replay, not both", file=sys.stderr)
+        return 2
+    if args.record or args.replay:
+        settings.cassette_mode = "record" if args.record else "replay"
+        settings.cassette_path = args.record or args.replay
+    if args.replay_latency_scale is not None:
+        settings.cassette_latency_scale = args.replay_latency_scale
+
+    api_key = args.api_key or settings.openai_api_key
+    if not api_key and (settings.cassette_mode == "replay" or (args.backend or settings.llm_backend) == "fake"):
+        # Replayed and fake calls never reach the API
+        api_key = "offline"
+    if not api_key:
+        print("❌ Error: set OPENAI_API_KEY or pass --api-key", file=sys.stderr)
+        return 2
+
+    content = _read_content(args)
+    if not content:
+        print("❌ Error: pass --content or --content-file", file=sys.stderr)
+        return 2
+
+    metrics_port = args.metrics_port if args.metrics_port is not None else settings.metrics_port
+    if metrics_port:
+        start_metrics_server(metrics_port, settings.metrics_host)
+    if args.profile:
+        settings.profile_mode = args.profile
+    if args.profile_dir:
+        settings.profile_dir = args.profile_dir
+
+    if args.triage_model:
+        settings.absorb_triage_model = args.triage_model
+
+    simulator = DPRSimulator(
+        api_key=api_key,
+        model=args.model,
+        backend=args.backend,
+        absorb_mode=args.absorb_mode,
+        relevance_prescoring=args.prescore,
+        result_store_path=args.result_store,
+    )
+    simulator.create_members(args.members)
+    aspirasi = Aspirasi(
+        id=1,
+        source=args.source,
+        category=args.category,
+        content=content,
+        priority=args.priority,
+        timestamp=datetime.now(),
+    )
+
+    progress = None if args.quiet else (lambda msg: print(msg, file=sys.stderr))
+    result = asyncio.run(
+        simulator.process_aspirasi(
+            aspirasi,
+            sample_size=args.sample_size,
+            komisi_filter=args.komisi,
+            progress_callback=progress,
+        )
+    )
+
+    if args.json:
+        print(result.model_dump_json(indent=2))
+    else:
+        print(result.summary())
+
+    if args.metrics_json:
+        _write_output(metrics.to_json(), args.metrics_json)
+    if args.trace_otlp:
+        _write_output(json.dumps(result.trace.to_otlp(), indent=2), args.trace_otlp)
+    if settings.profile_mode:
+        print(f"🔬 Profil ditulis ke {Path(settings.profile_dir) / result.trace.trace_id}", file=sys.stderr)
+    return 0
+
+
+def cmd_sweep(args: argparse.Namespace) -> int:
+    """Run one aspiration across sample sizes and commission filters and report compile stability."""
+    from .core import DPRSimulator
+    from .models import Aspirasi
+
+    api_key = args.api_key or settings.openai_api_key
+    if not api_key and (args.backend or settings.llm_backend) == "fake":
+        api_key = "offline"
+    if not api_key:
+        print("❌ Error: set OPENAI_API_KEY or pass --api-key", file=sys.stderr)
+        return 2
+
+    content = _read_content(args)
+    if not content:
+        print("❌ Error: pass --content or --content-file", file=sys.stderr)
+        return 2
+
+    simulator = DPRSimulator(
+        api_key=api_key,
+        model=args.model,
+        backend=args.backend,
+        absorb_mode=args.absorb_mode,
+        relevance_prescoring=args.prescore,
+        result_store_path="",
+    )
+    simulator.create_members(args.members)
+    aspirasi = Aspirasi(
+        id=1,
+        source=args.source,
+        category=args.category,
+        content=content,
+        priority=args.priority,
+        timestamp=datetime.now(),
+    )
+    komisi_filters = [None if k.lower() == "auto" else k for k in args.komisi]
+
+    progress = None if args.quiet else (lambda msg: print(msg, file=sys.stderr))
+    result = asyncio.run(
+        simulator.sweep_aspirasi(
+            aspirasi,
+            sample_sizes=args.sample_sizes,
+            komisi_filters=komisi_filters,
+            stability_threshold=args.threshold,
+            progress_callback=progress,
+        )
+    )
+
+    if args.json:
+        print(result.model_dump_json(indent=2))
+        return 0
+
+    print(f"{'komisi':<14} {'sampel':>6} {'anggota':>7} {'status':<14} {'tema':>5} {'relevansi':>9} {'stabil':>6} {'biaya USD':>10}")
+    for p in result.titik:
+        print(
+            f"{p.komisi_filter or 'auto':<14} {p.sample_size:>6} {p.anggota:>7} {p.kompilasi.status:<14} "
+            f"{p.kemiripan_tema:>5.2f} {p.kemiripan_relevansi:>9.2f} {'ya' if p.stabil else '-':>6} {p.biaya_usd:>10.6f}"
+        )
+    print(
+        f"\nPanggilan absorb: {result.panggilan_absorb} ({result.panggilan_triase} triase) · "
+        f"biaya sweep ${result.total_cost_usd:.6f} "
+        f"(per titik terpisah: ${result.biaya_naif_usd:.6f})"
+    )
+    for komisi_filter in komisi_filters:
+        stable = result.sample_size_stabil(komisi_filter)
+        label = komisi_filter or "auto"
+        print(f"Sampel stabil ({label}): {stable if stable is not None else 'tidak ada'}")
+    return 0
+
+
+def cmd_classify(args: argparse.Namespace) -> int:
+    """Predict the category and commission of an aspiration offline."""
+    import time
+
+    from .core.classifier import classify_aspirasi, get_classifier
+
+    content = _read_content(args)
+    if not content:
+        print("❌ Error: pass --content or --content-file", file=sys.stderr)
+        return 2
+
+    get_classifier()
+    start = time.perf_counter()
+    prediction = classify_aspirasi(content)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        flags = {"confident": prediction.confident, "routes_komisi": prediction.routes_komisi}
+        print(json.dumps({**prediction._asdict(), **flags, "ms": elapsed_ms}))
+    else:
+        marker = "" if prediction.confident else " (tidak yakin)"
+        print(f"Kategori: {prediction.category}{marker}")
+        print(f"Komisi: {prediction.komisi}{'' if prediction.routes_komisi else ' (tidak yakin)'}")
+        print(f"Skor: {prediction.score:.3f} / {prediction.komisi_score:.3f} · {elapsed_ms:.2f} ms")
+    return 0
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    """A date/datetime in ISO format, or an age like '30d', '12h' or '45m' before now."""
+    if not value:
+        return None
+    units = {"d": 86400, "h": 3600, "m": 60}
+    if value[-1] in units and value[:-1].isdigit():
+        return datetime.fromtimestamp(datetime.now().timestamp() - int(value[:-1]) * units[value[-1]])
+    return datetime.fromisoformat(value)
+
+
+def _add_store_filters(parser: argparse.ArgumentParser) -> None:
+    """Result store location and column filters shared by history and export."""
+    parser.add_argument("--category", default=None, help="Aspiration category")
+    parser.add_argument("--komisi", default=None, help="Primary commission, e.g. 'Komisi IX'")
+    parser.add_argument("--source", default=None, help="Source province/region")
+    parser.add_argument("--priority", default=None, choices=["Tinggi", "Sedang", "Rendah"])
+    parser.add_argument("--since", default=None, help="Start date (YYYY-MM-DD) or age such as 30d or 12h")
+    parser.add_argument("--until", default=None, help="End date (YYYY-MM-DD) or age such as 7d")
+    parser.add_argument("--db", default=None, help="Result store file (defaults to RESULT_STORE_PATH)")
+
+
+def _open_store(args: argparse.Namespace):
+    """Open the result store named by --db, or None (with an error printed) if it doesn't exist."""
+    from .core.store import ResultStore
+
+    if not (args.db or settings.result_store_path):
+        print("❌ Error: no result store configured; pass --db or set RESULT_STORE_PATH", file=sys.stderr)
+        return None
+    path = Path(args.db or settings.result_store_path)
+    if not path.exists():
+        print(f"❌ Error: result store {path} does not exist yet", file=sys.stderr)
+        return None
+    return ResultStore(path)
+
+
+def cmd_history(args: argparse.Namespace) -> int:
+    """List or show pipeline results saved in the result store."""
+    store = _open_store(args)
+    if store is None:
+        return 2
+
+    try:
+        if args.show is not None:
+            result = store.load(args.show)
+            if result is None:
+                print(f"❌ Error: no stored result with id {args.show}", file=sys.stderr)
+                return 1
+            print(result.model_dump_json(indent=2) if args.json else result.summary())
+            return 0
+
+        try:
+            since, until = _parse_time(args.since), _parse_time(args.until)
+        except ValueError as e:
+            print(f"❌ Error: {e}", file=sys.stderr)
+            return 2
+        records = store.query(
+            category=args.category,
+            komisi=args.komisi,
+            source=args.source,
+            priority=args.priority,
+            since=since,
+            until=until,
+            order_by="cost_usd" if args.sort == "cost" else "timestamp",
+            limit=args.limit,
+        )
+    finally:
+        store.close()
+
+    if args.json:
+        print(json.dumps([r.model_dump(mode="json") for r in records], indent=2))
+        return 0
+    if not records:
+        print("Tidak ada hasil yang cocok.")
+        return 0
+    print(f"{'ID':>6}  {'Waktu':<16}  {'Kategori':<14}  {'Komisi':<12}  {'Sumber':<16}  {'Biaya':>9}  Aspirasi")
+    for r in records:
+        print(
+            f"{r.id:>6}  {r.timestamp:%Y-%m-%d %H:%M}  {r.category[:14]:<14}  {r.komisi[:12]:<12}  "
+            f"{r.source[:16]:<16}  ${r.cost_usd:>8.4f}  {r.content_preview[:50]}"
+        )
+    return 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """Stream stored results into partitioned Parquet files."""
+    import time
+
+    try:
+        since, until = _parse_time(args.since), _parse_time(args.until)
+    except ValueError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 2
+    try:
+        from .core.export import ParquetExporter
+
+        exporter = ParquetExporter(args.out)
+    except ImportError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 2
+    store = _open_store(args)
+    if store is None:
+        return 2
+
+    start = time.perf_counter()
+    try:
+        with exporter:
+            count = exporter.write_all(
+                store.iter_results(
+                    category=args.category,
+                    komisi=args.komisi,
+                    source=args.source,
+                    priority=args.priority,
+                    since=since,
+                    until=until,
+                )
+            )
+    finally:
+        store.close()
+
+    rows = ", ".join(f"{table}: {n}" for table, n in exporter.rows_written.items())
+    print(f"📦 {count} hasil diekspor ke {exporter.root} ({rows}) dalam {time.perf_counter() - start:.1f} s")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all commands.
+
+    Defaults that come from settings are resolved in the command, so
+    building the parser (e.g. for --help) doesn't load the settings.
+    """
+    parser = argparse.ArgumentParser(
+        prog="dpr-simulator",
+        description="DPR AI Simulator - simulasi AI proses aspirasi DPR RI",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    ui = subparsers.add_parser("ui", help="Launch the Gradio web app (default)")
+    ui.set_defaults(func=cmd_ui)
+
+    run = subparsers.add_parser("run", help="Process one aspiration without the UI")
+    run.add_argument("--content", help="Aspiration text")
+    run.add_argument("--content-file", help="Read the aspiration text from a file")
+    run.add_argument(
+        "--category",
+        default="Pendidikan",
+        help="Aspiration category; 'auto' (or any unknown category) predicts it from the text",
+    )
+    run.add_argument("--source", default="Jawa Barat", help="Source province/region")
+    run.add_argument("--priority", default="Sedang", choices=["Tinggi", "Sedang", "Rendah"])
+    run.add_argument("--komisi", default=None, help="Explicit commission filter, e.g. 'Komisi X'")
+    run.add_argument("--members", type=int, default=None, help="Simulated DPR members (defaults to DEFAULT_MEMBER_COUNT)")
+    run.add_argument("--sample-size", type=int, default=20, help="Members processing the aspiration")
+    run.add_argument("--api-key", default=None, help="OpenAI API key, or several comma-separated keys to rotate (defaults to OPENAI_API_KEY)")
+    run.add_argument("--model", default=None, help="OpenAI model (defaults to OPENAI_MODEL)")
+    run.add_argument(
+        "--backend",
+        choices=["langchain", "openai", "fake"],
+        default=None,
+        help="LLM client backend (defaults to LLM_BACKEND)",
+    )
+    run.add_argument(
+        "--absorb-mode",
+        choices=["single", "cascade"],
+        default=None,
+        help="Absorb in one call per member, or triage relevance first (defaults to ABSORB_MODE)",
+    )
+    run.add_argument(
+        "--triage-model",
+        default=None,
+        help="Model for cascade triage calls (defaults to ABSORB_TRIAGE_MODEL, then --model)",
+    )
+    run.add_argument(
+        "--prescore",
+        action="store_true",
+        default=None,
+        help="Score relevance with local rules first; certainly irrelevant members skip the LLM "
+        "(defaults to RELEVANCE_PRESCORING)",
+    )
+    run.add_argument(
+        "--result-store",
+        metavar="PATH",
+        default=None,
+        help="SQLite file the result is saved to (defaults to RESULT_STORE_PATH; not saved when neither is set)",
+    )
+    run.add_argument("--record", metavar="PATH", help="Record every LLM call to this cassette (.jsonl.gz)")
+    run.add_argument("--replay", metavar="PATH", help="Answer LLM calls from this cassette instead of the API")
+    run.add_argument(
+        "--replay-latency-scale",
+        type=float,
+        default=None,
+        help="Multiplier of recorded latency when replaying, 0 for none (defaults to CASSETTE_LATENCY_SCALE)",
+    )
+    run.add_argument("--json", action="store_true", help="Print the full PipelineResult as JSON")
+    run.add_argument("--quiet", action="store_true", help="Do not print progress messages")
+    run.add_argument(
+        "--metrics-json",
+        metavar="PATH",
+        help="Write a JSON metrics snapshot after the run ('-' for stdout)",
+    )
+    run.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on this port during the run (defaults to METRICS_PORT, 0 disables)",
+    )
+    run.add_argument(
+        "--trace-otlp",
+        metavar="PATH",
+        help="Write the run's span tree as OTLP/JSON ('-' for stdout)",
+    )
+    run.add_argument(
+        "--profile",
+        choices=["sampling", "deterministic"],
+        default=None,
+        help="Write per-stage CPU profiles and tracemalloc section statistics (defaults to PROFILE_MODE)",
+    )
+    run.add_argument(
+        "--profile-dir",
+        default=None,
+        help="Directory for profiles, one subdirectory per run (defaults to PROFILE_DIR)",
+    )
+    run.set_defaults(func=cmd_run)
+
+    sweep = subparsers.add_parser(
+        "sweep", help="Run one aspiration across sample sizes and commission filters (shared absorb calls)"
+    )
+    sweep.add_argument("--content", help="Aspiration text")
+    sweep.add_argument("--content-file", help="Read the aspiration text from a file")
+    sweep.add_argument("--category", default="Pendidikan", help="Aspiration category; 'auto' predicts it")
+    sweep.add_argument("--source", default="Jawa Barat", help="Source province/region")
+    sweep.add_argument("--priority", default="Sedang", choices=["Tinggi", "Sedang", "Rendah"])
+    sweep.add_argument(
+        "--sample-sizes", type=int, nargs="+", default=[5, 10, 20, 50], help="Sample sizes of the grid"
+    )
+    sweep.add_argument(
+        "--komisi",
+        nargs="+",
+        default=["auto"],
+        help="Commission filters of the grid, 'auto' for by category (e.g. auto 'Komisi X')",
+    )
+    sweep.add_argument(
+        "--threshold", type=float, default=0.7, help="Theme and relevance similarity of a stable point"
+    )
+    sweep.add_argument("--members", type=int, default=None, help="Simulated DPR members (defaults to DEFAULT_MEMBER_COUNT)")
+    sweep.add_argument("--api-key", default=None, help="OpenAI API key (defaults to OPENAI_API_KEY)")
+    sweep.add_argument("--model", default=None, help="OpenAI model (defaults to OPENAI_MODEL)")
+    sweep.add_argument("--backend", choices=["langchain", "openai", "fake"], default=None, help="LLM client backend")
+    sweep.add_argument("--absorb-mode", choices=["single", "cascade"], default=None, help="Absorb mode")
+    sweep.add_argument("--prescore", action="store_true", default=None, help="Score relevance with local rules first")
+    sweep.add_argument("--json", action="store_true", help="Print the full SweepResult as JSON")
+    sweep.add_argument("--quiet", action="store_true", help="Do not print progress messages")
+    sweep.set_defaults(func=cmd_sweep)
+
+    classify = subparsers.add_parser("classify", help="Predict category and commission of an aspiration offline")
+    classify.add_argument("--content", help="Aspiration text")
+    classify.add_argument("--content-file", help="Read the aspiration text from a file")
+    classify.add_argument("--json", action="store_true", help="Print the prediction as JSON")
+    classify.set_defaults(func=cmd_classify)
+
+    history = subparsers.add_parser("history", help="Query results saved in the result store")
+    _add_store_filters(history)
+    history.add_argument("--sort", choices=["timestamp", "cost"], default="timestamp", help="Sort column (descending)")
+    history.add_argument("--limit", type=int, default=20, help="Maximum results listed")
+    history.add_argument("--show", type=int, metavar="ID", help="Print the full stored result with this id")
+    history.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    history.set_defaults(func=cmd_history)
+
+    export = subparsers.add_parser("export", help="Export stored results to partitioned Parquet (needs pyarrow)")
+    _add_store_filters(export)
+    export.add_argument("--out", default=None, help="Export directory (defaults to EXPORT_DIR)")
+    export.set_defaults(func=cmd_export)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point: dispatch to a command, launching the UI by default."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, "func", None):
+        return cmd_ui(args)
+    return args.func(args)
@@ -1,5 +1,40 @@
 """Configuration module for DPR AI Simulator."""
 
-from .settings import settings
+from typing import Any
+
+
+class _LazySettings:
+    """
+    Proxy for the application settings.
+
+    ``pydantic_settings`` and the environment are only loaded on first
+    attribute access, so importing modules that hold a reference to
+    ``settings`` stays cheap (e.g. ``main.py --help``).
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def _load() -> Any:
+        global _instance
+        if _instance is None:
+            # Not the ``settings`` alias module: importing that would rebind the proxy
+            from .app_settings import get_settings
+
+            _instance = get_settings()
+        return _instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._load(), name, value)
+
+    def __repr__(self) -> str:
+        return repr(self._load())
+
+
+_instance = None
+settings = _LazySettings()
 
 __all__ = ["settings"]
@@ -0,0 +1,172 @@
+"""
+Application settings and configuration.
+
+Nothing is read from the environment at import time; ``get_settings``
+builds the instance on first use. Most code goes through the lazy
+``src.config.settings`` proxy instead.
+"""
+
+from pydantic_settings import BaseSettings
+from pydantic import Field
+from functools import lru_cache
+from typing import List
+
+from ..models.endpoint import LLMEndpoint
+
+
+class Settings(BaseSettings):
+    """Application settings loaded from environment variables."""
+
+    # OpenAI Configuration
+    openai_api_key: str = Field(default="", description="OpenAI API Key")
+    openai_model: str = Field(default="gpt-4.1-nano", description="OpenAI model to use")
+
+    # Cost Configuration (per 1k tokens)
+    prompt_cost_per_1k: float = Field(default=0.0001, description="Cost per 1k prompt tokens")
+    completion_cost_per_1k: float = Field(default=0.0004, description="Cost per 1k completion tokens")
+
+    # Simulation Configuration
+    default_member_count: int = Field(default=50, description="Default number of DPR members to simulate")
+    batch_size: int = Field(default=10, description="Batch size for processing members")
+    rate_limit_delay: float = Field(default=1.0, description="Delay between batches in seconds")
+    absorb_mode: str = Field(
+        default="single",
+        description="Absorb stage: 'single' (one full call per member) or 'cascade' (triage call first)",
+    )
+    absorb_triage_model: str = Field(
+        default="", description="Model for cascade relevance triage (empty: the simulator's model)"
+    )
+    absorb_full_model: str = Field(
+        default="", description="Model for full absorb calls (empty: the simulator's model)"
+    )
+    absorb_escalate_relevance: List[str] = Field(
+        default_factory=lambda: ["Tinggi", "Sedang"],
+        description="Triage relevance levels that get the full absorb call in cascade mode",
+    )
+    relevance_prescoring: bool = Field(
+        default=False,
+        description="Score member relevance with local rules first; certainly irrelevant members skip the LLM",
+    )
+    dedup_enabled: bool = Field(
+        default=False, description="Reuse results of near-duplicate aspirations (in flight or recent)"
+    )
+    dedup_threshold: float = Field(
+        default=0.8, description="Minimum estimated Jaccard similarity of a near-duplicate aspiration"
+    )
+    dedup_freshness_seconds: float = Field(
+        default=900.0, description="How long a completed result is reused for near-duplicates"
+    )
+    dedup_num_perm: int = Field(default=64, description="MinHash permutations per aspiration fingerprint")
+    dedup_max_entries: int = Field(default=1000, description="Maximum aspirations in the duplicate index")
+    absorb_group_size: int = Field(
+        default=1,
+        description="Aspirations per member absorb call in bulk runs (1: one call per aspiration)",
+    )
+    absorb_group_window: int = Field(
+        default=32, description="Aspirations read and grouped together in a grouped bulk run"
+    )
+    absorb_memo_enabled: bool = Field(
+        default=True,
+        description="Reuse absorb responses of members already asked about the same aspiration",
+    )
+    absorb_memo_max_entries: int = Field(default=20000, description="Maximum memoized absorb responses")
+    classifier_min_score: float = Field(
+        default=0.05,
+        description="Minimum classifier score to route an aspiration of unknown category automatically",
+    )
+    result_store_path: str = Field(
+        default="",
+        description=(
+            "SQLite file every pipeline result is saved to, aspiration text included "
+            "(empty: disabled; e.g. data/results.sqlite3)"
+        ),
+    )
+    result_store_batch_size: int = Field(
+        default=64, description="Maximum results written to the result store per transaction"
+    )
+    result_store_compression_level: int = Field(
+        default=3, description="Compression level of stored result payloads (zstd, or zlib when unavailable)"
+    )
+    export_dir: str = Field(default="exports", description="Directory for Parquet exports of results")
+    export_batch_rows: int = Field(
+        default=8192, description="Rows buffered per Parquet partition before a row group is written"
+    )
+    cassette_mode: str = Field(
+        default="", description="Record LLM calls to, or replay them from, a cassette: 'record'/'replay' (empty: off)"
+    )
+    cassette_path: str = Field(default="cassettes/calls.jsonl.gz", description="Cassette file for record/replay")
+    cassette_latency_scale: float = Field(
+        default=1.0, description="Multiplier of recorded latency when replaying (0 = answer immediately)"
+    )
+    llm_backend: str = Field(
+        default="langchain", description="LLM client backend: 'langchain', 'openai' (raw async client) or 'fake' (offline)"
+    )
+    fake_llm_latency: float = Field(
+        default=0.8, description="Median simulated call latency of the 'fake' backend in seconds"
+    )
+    fake_llm_latency_sigma: float = Field(
+        default=0.5, description="Log-normal spread of the 'fake' backend's latency (0 = constant)"
+    )
+    llm_endpoints: List[LLMEndpoint] = Field(
+        default_factory=list,
+        description="Pool of OpenAI-compatible endpoints as a JSON list (empty: single OpenAI endpoint)",
+    )
+    llm_key_rpm: int = Field(
+        default=0, description="Requests-per-minute budget per API key in a key pool (0 = unlimited)"
+    )
+    llm_key_tpm: int = Field(
+        default=0, description="Tokens-per-minute budget per API key in a key pool (0 = unlimited)"
+    )
+    llm_key_cooldown_seconds: float = Field(
+        default=20.0, description="Cooldown of a throttled key when the API sends no Retry-After"
+    )
+    llm_completion_token_estimate: int = Field(
+        default=300, description="Completion tokens reserved per call against TPM budgets"
+    )
+    llm_endpoint_failure_threshold: int = Field(
+        default=3, description="Consecutive failures before an endpoint is ejected"
+    )
+    llm_endpoint_ejection_seconds: float = Field(
+        default=30.0, description="How long an ejected endpoint stays out of rotation"
+    )
+    llm_health_check_interval: float = Field(
+        default=10.0, description="Seconds between health probes of ejected endpoints"
+    )
+    llm_max_retries: int = Field(default=2, description="Retries for transient LLM API errors")
+    llm_retry_backoff: float = Field(
+        default=0.5, description="Initial retry backoff in seconds (doubles per attempt)"
+    )
+
+    # Observability Configuration
+    metrics_port: int = Field(default=0, description="Port for the Prometheus metrics endpoint (0 disables it)")
+    metrics_host: str = Field(default="127.0.0.1", description="Host for the metrics endpoint")
+    profile_mode: str = Field(
+        default="", description="Profile pipeline runs: 'sampling' or 'deterministic' (empty disables)"
+    )
+    profile_dir: str = Field(default="profiles", description="Directory for per-run profiles")
+    profile_interval: float = Field(default=0.005, description="Sampling profiler interval in seconds")
+    profile_memory_snapshots: int = Field(
+        default=1, description="tracemalloc snapshot pairs dumped per profiled section"
+    )
+
+    # UI Configuration
+    gradio_server_name: str = Field(default="127.0.0.1", description="Gradio server host")
+    gradio_server_port: int = Field(default=7860, description="Gradio server port")
+    gradio_share: bool = Field(default=False, description="Share Gradio app publicly")
+    gradio_concurrency_limit: int = Field(
+        default=10, description="Maximum concurrent pipeline runs per Gradio event"
+    )
+    gradio_max_queue_size: int = Field(default=64, description="Maximum queued Gradio requests")
+    simulator_pool_size: int = Field(
+        default=32, description="Maximum cached simulators (per API key and member count)"
+    )
+
+    model_config = {
+        "extra": "ignore",
+    }
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Get cached settings instance (the environment is read on the first call)."""
+    return Settings()
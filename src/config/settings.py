@@ -1,40 +1,34 @@
-"""Application settings and configuration."""
+"""
+Former location of the settings classes, kept for existing imports.
 
-from pydantic_settings import BaseSettings
-from pydantic import Field
-from functools import lru_cache
+``from src.config.settings import Settings, get_settings`` keeps working.
+Importing this module rebinds the ``src.config.settings`` attribute from
+the lazy proxy to the module, so other attributes are read from and
+written to the settings instance, as through the proxy.
+"""
 
+from types import ModuleType
+from typing import Any
+import sys
 
-class Settings(BaseSettings):
-    """Application settings loaded from environment variables."""
+from .app_settings import Settings, get_settings
 
-    # OpenAI Configuration
-    openai_api_key: str = Field(default="", description="OpenAI API Key")
-    openai_model: str = Field(default="gpt-4.1-nano", description="OpenAI model to use")
+__all__ = ["Settings", "get_settings"]
 
-    # Cost Configuration (per 1k tokens)
-    prompt_cost_per_1k: float = Field(default=0.0001, description="Cost per 1k prompt tokens")
-    completion_cost_per_1k: float = Field(default=0.0004, description="Cost per 1k completion tokens")
 
-    # Simulation Configuration
-    default_member_count: int = Field(default=50, description="Default number of DPR members to simulate")
-    batch_size: int = Field(default=10, description="Batch size for processing members")
-    rate_limit_delay: float = Field(default=1.0, description="Delay between batches in seconds")
+class _SettingsModule(ModuleType):
+    """Module that forwards unknown attributes to the settings instance."""
 
-    # UI Configuration
-    gradio_server_name: str = Field(default="127.0.0.1", description="Gradio server host")
-    gradio_server_port: int = Field(default=7860, description="Gradio server port")
-    gradio_share: bool = Field(default=False, description="Share Gradio app publicly")
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(get_settings(), name)
 
-    model_config = {
-        "extra": "ignore",
-    }
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name.startswith("__") or name in self.__dict__:
+            super().__setattr__(name, value)
+        else:
+            setattr(get_settings(), name, value)
 
 
-@lru_cache
-def get_settings() -> Settings:
-    """Get cached settings instance."""
-    return Settings()
-
-
-settings = get_settings()
+sys.modules[__name__].__class__ = _SettingsModule
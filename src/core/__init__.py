@@ -1,6 +1,19 @@
 """Core module for DPR AI Simulator."""
 
-from .simulator import DPRSimulator
-from .member_factory import DPRMemberFactory
+from typing import Any
 
 __all__ = ["DPRSimulator", "DPRMemberFactory"]
+
+
+def __getattr__(name: str) -> Any:
+    # Imported on first use so lightweight submodules (metrics, tracing, ...)
+    # don't pull in the simulator and its LLM clients
+    if name == "DPRSimulator":
+        from .simulator import DPRSimulator
+
+        return DPRSimulator
+    if name == "DPRMemberFactory":
+        from .member_factory import DPRMemberFactory
+
+        return DPRMemberFactory
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,23 +1,77 @@
 """Absorb (Menyerap) agent for processing aspirations."""
 
-import json
-from typing import Dict, Any
-
-from langchain_core.messages import HumanMessage, SystemMessage
+import asyncio
+from typing import Dict, Any, List, Optional
 
 from .base import BaseAgent
+from ..metrics import metrics
+from ..profiling import profile_section
+from ...config import settings
 from ...models import DPRMember, Aspirasi, AbsorpsiResponse
 
 
 from ..faction_data import get_faction_persona
 
+
+ABSORB_MODES = ("single", "cascade")
+# Bump when the absorb prompts or the parsing of their answers change,
+# so memoized responses of the old prompts are not reused
+PROMPT_VERSION = 1
+
+
 class AbsorbAgent(BaseAgent):
     """
     Agent for Step 1: Menyerap (Absorb)
     
     AI agent absorbs and understands the aspiration from a DPR member's perspective.
+
+    In ``cascade`` mode a short triage call (optionally on a smaller model)
+    rates relevance first; only members rated at one of the escalation
+    levels get the full persona/quote call.
     """
 
+    stage = "absorb"
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        triage_model: Optional[str] = None,
+        full_model: Optional[str] = None,
+        escalate_relevance: Optional[List[str]] = None,
+        **kwargs,
+    ):
+        """
+        Initialize the absorb agent.
+
+        Args:
+            mode: "single" or "cascade" (defaults to settings)
+            triage_model: Model for triage calls (defaults to settings, then the agent's model)
+            full_model: Model for full calls (defaults to settings, then the agent's model)
+            escalate_relevance: Triage levels that get the full call (defaults to settings)
+            **kwargs: Passed to BaseAgent
+        """
+        super().__init__(**kwargs)
+        self.mode = mode or settings.absorb_mode
+        if self.mode not in ABSORB_MODES:
+            raise ValueError(f"Unknown absorb mode {self.mode!r}, expected one of {ABSORB_MODES}")
+        self.triage_model = triage_model or settings.absorb_triage_model or None
+        self.full_model = full_model or settings.absorb_full_model or None
+        levels = escalate_relevance if escalate_relevance is not None else settings.absorb_escalate_relevance
+        self.escalate_relevance = {level.strip().capitalize() for level in levels}
+
+    @property
+    def prompt_version(self) -> str:
+        """Identifies what this agent's answers depend on besides member and aspiration."""
+        return ":".join(
+            [
+                str(PROMPT_VERSION),
+                self.mode,
+                self.full_model or self.model_name,
+                self.triage_model or self.model_name,
+                ",".join(sorted(self.escalate_relevance)),
+            ]
+        )
+
     def get_system_prompt(self) -> str:
         return """Anda adalah seorang anggota DPR RI yang bertugas menyerap dan menganalisis aspirasi rakyat.
 
@@ -69,60 +123,168 @@ Berikan respons dalam format JSON:
     "rekomendasi_awal": "saran tindak lanjut"
 }}"""
 
+    def get_group_system_prompt(self) -> str:
+        return (
+            self.get_system_prompt()
+            + "\nAnda akan menerima beberapa aspirasi sekaligus; nilai dan tanggapi setiap aspirasi secara terpisah."
+        )
+
+    def _build_group_prompt(self, member: DPRMember, aspirations: List[Aspirasi]) -> str:
+        ideologi = get_faction_persona(member.faction)
+        items = "\n\n".join(
+            f"### Aspirasi {number}\n{aspirasi.to_prompt_context()}"
+            for number, aspirasi in enumerate(aspirations, 1)
+        )
+
+        return f"""Anda adalah anggota DPR RI dengan profil:
+{member.to_prompt_context()}
+Ideologi/Gaya Politik Fraksi ({member.faction}): {ideologi}
+
+Ada {len(aspirations)} aspirasi rakyat yang masuk:
+
+{items}
+
+Panduan Penilaian Relevansi (untuk setiap aspirasi):
+1. **CEK KOMISI**: Apakah topik aspirasi masuk lingkup Komisi Anda? Jika YA -> Relevansi TINGGI.
+2. **CEK DAPIL**: Apakah lokasi aspirasi di Dapil Anda? Jika YA -> Relevansi TINGGI.
+3. Jika TIDAK keduanya -> Relevansi RENDAH.
+4. **PENTING**: JANGAN memberi relevansi Rendah hanya karena aspirasi bukan dari Dapil Anda, JIKA aspirasi tersebut masuk dalam wewenang Komisi Anda.
+
+Untuk setiap aspirasi, tentukan relevansi, buat **QUOTE (Tanggapan Lisan)** dengan gaya bicara politisi fraksi Anda ({member.faction}) yang terdengar natural, dan tentukan **SENTIMENT** (Positif/Negatif/Netral/Kritis).
+
+Berikan respons dalam format JSON, satu entri per aspirasi dengan nomornya:
+{{
+    "tanggapan": [
+        {{
+            "nomor": <nomor aspirasi>,
+            "relevansi": "Tinggi/Sedang/Rendah",
+            "alasan_relevansi": "penjelasan singkat teknis (untuk internal)",
+            "sentiment": "Positif/Negatif/Netral/Kritis",
+            "quote": "Tanggapan lisan Anda di sini...",
+            "poin_kunci": ["poin1", "poin2", ...],
+            "rekomendasi_awal": "saran tindak lanjut"
+        }},
+        ...
+    ]
+}}"""
+
+    def get_triage_system_prompt(self) -> str:
+        return """Anda adalah staf DPR RI yang menyaring aspirasi rakyat untuk anggota DPR.
+Nilai relevansi aspirasi bagi anggota: TINGGI jika topiknya masuk lingkup Komisi anggota atau berasal dari Dapil anggota, SEDANG jika berkaitan tidak langsung, RENDAH jika tidak keduanya.
+Selalu berikan respons dalam format JSON yang valid."""
+
+    def _build_triage_prompt(self, member: DPRMember, aspirasi: Aspirasi) -> str:
+        return f"""Anggota DPR:
+Komisi: {member.komisi}
+Daerah Pemilihan: {member.dapil}, {member.province}
+Keahlian: {', '.join(member.expertise)}
+
+Aspirasi:
+{aspirasi.to_prompt_context()}
+
+Berikan respons dalam format JSON:
+{{"relevansi": "Tinggi/Sedang/Rendah", "alasan_relevansi": "satu kalimat"}}"""
+
+    def estimate_full_cost(self, member: DPRMember, aspirasi: Aspirasi) -> float:
+        """Estimated cost of a full absorb call, from the prompt length and the completion estimate."""
+        prompt_chars = len(self.get_system_prompt()) + len(self._build_user_prompt(member, aspirasi))
+        return self._calculate_cost(prompt_chars // 4, settings.llm_completion_token_estimate)
+
     async def invoke(
-        self, member: DPRMember, aspirasi: Aspirasi
+        self, member: DPRMember, aspirasi: Aspirasi, prior_relevance: Optional[str] = None
     ) -> AbsorpsiResponse:
         """
         Process an aspiration from a specific DPR member's perspective.
 
+        In cascade mode, members the triage rates below the escalation levels
+        get the triage result (``tier="triage"``) instead of a full response.
+        A failed triage escalates, so errors never hide a relevant member.
+
         Args:
             member: The DPR member processing the aspiration
             aspirasi: The public aspiration to process
+            prior_relevance: Relevance already known to warrant the full call
+                (e.g. from rule-based pre-scoring); skips the cascade triage
 
         Returns:
             AbsorpsiResponse with the member's analysis
         """
-        messages = [
-            SystemMessage(content=self.get_system_prompt()),
-            HumanMessage(content=self._build_user_prompt(member, aspirasi)),
-        ]
+        if self.mode == "single":
+            return await self._invoke_full(member, aspirasi)
+        if prior_relevance is not None:
+            return await self._invoke_full(member, aspirasi, tier="full")
+
+        triage = await self._triage(member, aspirasi)
+        if triage.error is None and triage.relevansi not in self.escalate_relevance:
+            metrics.absorb_cascade.inc(decision="skipped")
+            return triage
+
+        metrics.absorb_cascade.inc(decision="escalated")
+        response = await self._invoke_full(member, aspirasi, tier="full")
+        response.cost_usd += triage.cost_usd
+        response.triage_cost_usd = triage.cost_usd
+        return response
+
+    async def _triage(self, member: DPRMember, aspirasi: Aspirasi) -> AbsorpsiResponse:
+        """Rate the member's relevance with the short triage prompt."""
+        with profile_section("prompt_build"):
+            messages = [
+                {"role": "system", "content": self.get_triage_system_prompt()},
+                {"role": "user", "content": self._build_triage_prompt(member, aspirasi)},
+            ]
 
         cost = 0.0
         try:
-            response = await self.llm.ainvoke(messages)
-
-            # Calculate cost from token usage
-            if hasattr(response, "response_metadata"):
-                usage = response.response_metadata.get("token_usage", {})
-                cost = self._calculate_cost(
-                    usage.get("prompt_tokens", 0),
-                    usage.get("completion_tokens", 0),
-                )
-
-            # Parse JSON response
-            content = response.content
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.startswith("```"):
-                content = content[3:]
-            if content.endswith("```"):
-                content = content[:-3]
-            content = content.strip()
+            content, cost = await self._complete(
+                messages, model=self.triage_model, call_stage="triage", member_id=member.id, tier="triage"
+            )
+            with profile_section("parse"):
+                result = self._parse_json(content)
+                relevansi = str(result.get("relevansi", "")).strip().capitalize()
+                if relevansi not in ("Tinggi", "Sedang", "Rendah"):
+                    raise ValueError(f"Unexpected triage relevance {relevansi!r}")
 
-            result = json.loads(content)
+                return AbsorpsiResponse(
+                    member_id=member.id,
+                    aspirasi_id=aspirasi.id,
+                    relevansi=relevansi,
+                    alasan_relevansi=result.get("alasan_relevansi", ""),
+                    tier="triage",
+                    cost_usd=cost,
+                    triage_cost_usd=cost,
+                )
 
+        except Exception as e:
             return AbsorpsiResponse(
                 member_id=member.id,
                 aspirasi_id=aspirasi.id,
-                relevansi=result.get("relevansi", "rendah"),
-                alasan_relevansi=result.get("alasan_relevansi", ""),
-                sentiment=result.get("sentiment", "Netral"),
-                quote=result.get("quote", ""),
-                poin_kunci=result.get("poin_kunci", []),
-                rekomendasi_awal=result.get("rekomendasi_awal", ""),
+                relevansi="rendah",
+                alasan_relevansi="",
+                tier="triage",
+                error=str(e),
                 cost_usd=cost,
+                triage_cost_usd=cost,
             )
 
+    async def _invoke_full(
+        self, member: DPRMember, aspirasi: Aspirasi, **span_attributes: Any
+    ) -> AbsorpsiResponse:
+        """Run the full persona/quote call for one member."""
+        with profile_section("prompt_build"):
+            messages = [
+                {"role": "system", "content": self.get_system_prompt()},
+                {"role": "user", "content": self._build_user_prompt(member, aspirasi)},
+            ]
+
+        cost = 0.0
+        try:
+            content, cost = await self._complete(
+                messages, model=self.full_model, member_id=member.id, **span_attributes
+            )
+            with profile_section("parse"):
+                result = self._parse_json(content)
+                return self._full_response(member, aspirasi, result, cost)
+
         except Exception as e:
             return AbsorpsiResponse(
                 member_id=member.id,
@@ -136,3 +298,101 @@ Berikan respons dalam format JSON:
                 error=str(e),
                 cost_usd=cost,
             )
+
+    @staticmethod
+    def _full_response(
+        member: DPRMember, aspirasi: Aspirasi, result: Dict[str, Any], cost: float, **fields: Any
+    ) -> AbsorpsiResponse:
+        """Response built from the parsed answer of a full call."""
+        return AbsorpsiResponse(
+            member_id=member.id,
+            aspirasi_id=aspirasi.id,
+            relevansi=result.get("relevansi", "rendah"),
+            alasan_relevansi=result.get("alasan_relevansi", ""),
+            sentiment=result.get("sentiment", "Netral"),
+            quote=result.get("quote", ""),
+            poin_kunci=result.get("poin_kunci", []),
+            rekomendasi_awal=result.get("rekomendasi_awal", ""),
+            cost_usd=cost,
+            **fields,
+        )
+
+    async def invoke_group(self, member: DPRMember, aspirations: List[Aspirasi]) -> List[AbsorpsiResponse]:
+        """
+        Absorb several aspirations for one member in a single call.
+
+        The member profile, faction persona and instructions are sent once
+        for the whole group. Items are numbered by their position in the
+        group, so aspirations sharing an ID still get their own answers.
+        Each item of the answer is validated on its own (matching number,
+        known relevance level, well-formed fields); aspirations
+        whose item is missing or invalid, or all of them if the call fails,
+        fall back to a single full call. The group call's cost is split
+        evenly over the group.
+
+        Args:
+            member: The DPR member processing the aspirations
+            aspirations: The aspirations, at most a few per call
+
+        Returns:
+            One AbsorpsiResponse per aspiration, in the given order
+        """
+        if len(aspirations) == 1:
+            return [await self._invoke_full(member, aspirations[0])]
+
+        with profile_section("prompt_build"):
+            messages = [
+                {"role": "system", "content": self.get_group_system_prompt()},
+                {"role": "user", "content": self._build_group_prompt(member, aspirations)},
+            ]
+
+        cost = 0.0
+        items: Dict[int, Dict[str, Any]] = {}
+        try:
+            content, cost = await self._complete(
+                messages,
+                model=self.full_model,
+                call_stage="absorb_group",
+                member_id=member.id,
+                tier="group",
+                group_size=len(aspirations),
+            )
+            with profile_section("parse"):
+                result = self._parse_json(content)
+                for item in result.get("tanggapan", []):
+                    if isinstance(item, dict) and str(item.get("nomor", "")).strip().isdigit():
+                        items.setdefault(int(str(item["nomor"]).strip()), item)
+        except Exception:
+            metrics.absorb_group_items.inc(len(aspirations), outcome="call_failed")
+
+        share = cost / len(aspirations)
+        responses: List[Optional[AbsorpsiResponse]] = []
+        for number, aspirasi in enumerate(aspirations, 1):
+            item = items.get(number)
+            response = None
+            if item is not None:
+                try:
+                    relevansi = str(item.get("relevansi", "")).strip().capitalize()
+                    if relevansi not in ("Tinggi", "Sedang", "Rendah"):
+                        raise ValueError(f"Unexpected relevance {relevansi!r}")
+                    response = self._full_response(
+                        member, aspirasi, {**item, "relevansi": relevansi}, share, ukuran_grup=len(aspirations)
+                    )
+                    metrics.absorb_group_items.inc(outcome="ok")
+                except ValueError:
+                    # Pydantic's ValidationError is a ValueError too
+                    metrics.absorb_group_items.inc(outcome="invalid")
+            elif items:
+                metrics.absorb_group_items.inc(outcome="missing")
+            responses.append(response)
+
+        missing = [i for i, r in enumerate(responses) if r is None]
+        retried = await asyncio.gather(
+            *(self._invoke_full(member, aspirations[i], group_position=i) for i in missing)
+        )
+        for i, response in zip(missing, retried):
+            # The item's share of the group call was paid for too
+            response.cost_usd += share
+            responses[i] = response
+        return responses
+
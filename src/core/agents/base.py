@@ -1,23 +1,37 @@
 """Base agent class for DPR AI Simulator."""
 
+import asyncio
+import json
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_core.prompts import ChatPromptTemplate
+from typing import Any, Dict, List, Optional, Tuple
 
 from ...config import settings
+from ..backends import Completion, retryable_errors
+from ..cassette import Cassette, get_cassette
+from ..metrics import metrics
+from ..routing import EndpointRouter, estimate_tokens
+from ..tracing import span
+
+
+# Chat messages are plain {"role": ..., "content": ...} dicts
+Message = Dict[str, str]
 
 
 class BaseAgent(ABC):
     """Abstract base class for DPR AI Simulator agents."""
 
+    # Label used for metrics; subclasses override
+    stage = "agent"
+
     def __init__(
         self,
         model: str | None = None,
         api_key: str | None = None,
         temperature: float = 0.7,
+        backend: str | None = None,
+        router: Optional[EndpointRouter] = None,
+        cassette: Optional[Cassette] = None,
     ):
         """
         Initialize the base agent.
@@ -26,17 +40,19 @@ class BaseAgent(ABC):
             model: OpenAI model name (defaults to settings)
             api_key: OpenAI API key (defaults to settings)
             temperature: Model temperature for response generation
+            backend: LLM backend name, "langchain" or "openai" (defaults to settings)
+            router: Endpoint router shared with other agents; when omitted one
+                is built from settings with this agent's model, key and temperature
+            cassette: Cassette recording or replaying this agent's calls
+                (defaults to the one configured in settings, if any)
         """
         self.model_name = model or settings.openai_model
         self.api_key = api_key or settings.openai_api_key
         self.temperature = temperature
-
-        self.llm = ChatOpenAI(
-            model=self.model_name,
-            api_key=self.api_key,
-            temperature=self.temperature,
+        self.router = router or EndpointRouter.from_settings(
+            self.api_key, self.model_name, backend, self.temperature
         )
-        self.json_parser = JsonOutputParser()
+        self.cassette = cassette if cassette is not None else get_cassette()
 
     def _calculate_cost(self, prompt_tokens: int, completion_tokens: int) -> float:
         """Calculate the cost based on token usage."""
@@ -45,6 +61,135 @@ class BaseAgent(ABC):
             + (completion_tokens / 1000) * settings.completion_cost_per_1k
         )
 
+    def _record_usage(self, usage: Dict[str, Any]) -> float:
+        """Record token counters for one call and return its cost."""
+        prompt_tokens = usage.get("prompt_tokens", 0) or 0
+        completion_tokens = usage.get("completion_tokens", 0) or 0
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0) or 0
+
+        cost = self._calculate_cost(prompt_tokens, completion_tokens)
+        metrics.llm_tokens.inc(prompt_tokens, agent=self.stage, kind="prompt")
+        metrics.llm_tokens.inc(completion_tokens, agent=self.stage, kind="completion")
+        metrics.llm_tokens.inc(cached_tokens, agent=self.stage, kind="cached")
+        metrics.llm_cost.inc(cost, agent=self.stage)
+        return cost
+
+    async def _complete(
+        self,
+        messages: List[Message],
+        model: Optional[str] = None,
+        call_stage: Optional[str] = None,
+        **span_attributes: Any,
+    ) -> Tuple[str, float]:
+        """
+        Call the LLM with retries, recording latency, tokens, errors and a trace span.
+
+        The span covers routing, retries and backoff; the time spent waiting
+        for an endpoint (RPM/TPM budgets, cooldowns) is its ``router_wait_ms``.
+
+        Args:
+            messages: Chat messages to send, as role/content dicts
+            model: Model for this call, overriding the endpoint's model
+            call_stage: Kind of request passed to the backend (defaults to the
+                agent's stage), e.g. "triage"
+            **span_attributes: Extra attributes for the call's trace span (e.g. member_id)
+
+        Returns:
+            Tuple of (response content, cost in USD)
+        """
+        with span(
+            f"llm.{self.stage}",
+            kind="llm_call",
+            agent=self.stage,
+            **span_attributes,
+        ) as call_span:
+            attempt = 0
+            reserved_tokens = estimate_tokens(messages)
+            while True:
+                # Each attempt is routed separately, so retries can move to a healthier endpoint or key
+                acquire_start = time.perf_counter()
+                endpoint = await self.router.acquire(reserved_tokens)
+                # Budget and cooldown waits are kept apart from the call itself
+                call_span.router_wait_ms += (time.perf_counter() - acquire_start) * 1000
+                replaying = self.cassette is not None and self.cassette.replaying
+                call_span.attributes.update(
+                    endpoint=endpoint.name,
+                    model=model or endpoint.backend.model,
+                    backend="cassette" if replaying else endpoint.backend.name,
+                )
+                metrics.llm_inflight.inc(agent=self.stage)
+                start = time.perf_counter()
+                succeeded = False
+                error: Optional[BaseException] = None
+                usage: Dict[str, Any] = {}
+                try:
+                    completion = await self._call_backend(
+                        endpoint.backend, messages, model, start, call_stage or self.stage
+                    )
+                    succeeded = True
+                except retryable_errors() as e:
+                    error = e
+                    if attempt >= settings.llm_max_retries:
+                        metrics.llm_errors.inc(agent=self.stage, cause=type(e).__name__)
+                        metrics.llm_calls.inc(agent=self.stage, outcome="error")
+                        raise
+                    metrics.llm_retries.inc(agent=self.stage, cause=type(e).__name__)
+                    attempt += 1
+                    call_span.retries = attempt
+                except Exception as e:
+                    error = e
+                    metrics.llm_errors.inc(agent=self.stage, cause=type(e).__name__)
+                    metrics.llm_calls.inc(agent=self.stage, outcome="error")
+                    raise
+                except asyncio.CancelledError:
+                    # The run was abandoned; the call is not retried and not counted as an error
+                    metrics.llm_calls.inc(agent=self.stage, outcome="cancelled")
+                    raise
+                else:
+                    metrics.llm_calls.inc(agent=self.stage, outcome="ok")
+                    usage = completion.usage
+                    call_span.prompt_tokens = usage.get("prompt_tokens", 0) or 0
+                    call_span.completion_tokens = usage.get("completion_tokens", 0) or 0
+                    call_span.ttfb_ms = completion.ttfb_ms
+                    call_span.cost_usd = self._record_usage(usage)
+                    return completion.content, call_span.cost_usd
+                finally:
+                    tokens = (usage.get("prompt_tokens", 0) or 0) + (usage.get("completion_tokens", 0) or 0)
+                    self.router.release(endpoint, succeeded, error, tokens, reserved_tokens)
+                    metrics.llm_inflight.dec(agent=self.stage)
+                    metrics.llm_latency.observe(time.perf_counter() - start, agent=self.stage)
+
+                await asyncio.sleep(settings.llm_retry_backoff * (2 ** (attempt - 1)))
+
+    async def _call_backend(
+        self, backend: Any, messages: List[Message], model: Optional[str], start: float, stage: str
+    ) -> Completion:
+        """One backend call, recorded to or replayed from the cassette if there is one."""
+        if self.cassette is None:
+            return await backend.complete(messages, model, stage)
+        model = model or backend.model
+        if self.cassette.replaying:
+            return await self.cassette.replay(model, messages)
+        completion = await backend.complete(messages, model, stage)
+        self.cassette.record(self.stage, model, messages, completion, start, time.perf_counter() - start)
+        return completion
+
+    def _parse_json(self, content: str) -> Dict[str, Any]:
+        """Parse a JSON object from model output, tolerating markdown fences."""
+        if content.startswith("```json"):
+            content = content[7:]
+        if content.startswith("```"):
+            content = content[3:]
+        if content.endswith("```"):
+            content = content[:-3]
+        content = content.strip()
+
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            metrics.llm_errors.inc(agent=self.stage, cause="JSONDecodeError")
+            raise
+
     @abstractmethod
     def get_system_prompt(self) -> str:
         """Return the system prompt for this agent."""
@@ -3,9 +3,8 @@
 import json
 from typing import List
 
-from langchain_core.messages import HumanMessage, SystemMessage
-
 from .base import BaseAgent
+from ..profiling import profile_section
 from ...models import Aspirasi, AbsorpsiResponse, KompilasiResponse
 
 
@@ -16,6 +15,8 @@ class CompileAgent(BaseAgent):
     Compiles and aggregates responses from multiple DPR members.
     """
 
+    stage = "compile"
+
     def __init__(self, **kwargs):
         super().__init__(temperature=0.7, **kwargs)
 
@@ -90,45 +91,28 @@ Berikan respons dalam format JSON:
                 cost_usd=0.0,
             )
 
-        messages = [
-            SystemMessage(content=self.get_system_prompt()),
-            HumanMessage(content=self._build_user_prompt(aspirasi, relevant_responses)),
-        ]
+        with profile_section("prompt_build"):
+            messages = [
+                {"role": "system", "content": self.get_system_prompt()},
+                {"role": "user", "content": self._build_user_prompt(aspirasi, relevant_responses)},
+            ]
 
         cost = 0.0
         try:
-            response = await self.llm.ainvoke(messages)
-
-            # Calculate cost
-            if hasattr(response, "response_metadata"):
-                usage = response.response_metadata.get("token_usage", {})
-                cost = self._calculate_cost(
-                    usage.get("prompt_tokens", 0),
-                    usage.get("completion_tokens", 0),
+            content, cost = await self._complete(messages)
+            with profile_section("parse"):
+                result = self._parse_json(content)
+
+                return KompilasiResponse(
+                    status="terkumpul",
+                    jumlah_anggota=len(relevant_responses),
+                    ringkasan=result.get("ringkasan", ""),
+                    tema_utama=result.get("tema_utama", []),
+                    fraksi_terlibat=result.get("fraksi_terlibat", []),
+                    rekomendasi_tindak_lanjut=result.get("rekomendasi_tindak_lanjut", ""),
+                    cost_usd=cost,
                 )
 
-            # Parse JSON response
-            content = response.content
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.startswith("```"):
-                content = content[3:]
-            if content.endswith("```"):
-                content = content[:-3]
-            content = content.strip()
-
-            result = json.loads(content)
-
-            return KompilasiResponse(
-                status="terkumpul",
-                jumlah_anggota=len(relevant_responses),
-                ringkasan=result.get("ringkasan", ""),
-                tema_utama=result.get("tema_utama", []),
-                fraksi_terlibat=result.get("fraksi_terlibat", []),
-                rekomendasi_tindak_lanjut=result.get("rekomendasi_tindak_lanjut", ""),
-                cost_usd=cost,
-            )
-
         except Exception as e:
             return KompilasiResponse(
                 status="error",
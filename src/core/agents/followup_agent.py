@@ -2,9 +2,8 @@
 
 import json
 
-from langchain_core.messages import HumanMessage, SystemMessage
-
 from .base import BaseAgent
+from ..profiling import profile_section
 from ...models import Aspirasi, KompilasiResponse, TindakLanjutResponse
 
 
@@ -15,6 +14,8 @@ class FollowUpAgent(BaseAgent):
     Determines concrete follow-up actions based on compiled responses.
     """
 
+    stage = "followup"
+
     def __init__(self, **kwargs):
         super().__init__(temperature=0.7, **kwargs)
 
@@ -107,47 +108,30 @@ Berikan respons dalam format JSON:
                 cost_usd=0.0,
             )
 
-        messages = [
-            SystemMessage(content=self.get_system_prompt()),
-            HumanMessage(content=self._build_user_prompt(aspirasi, kompilasi)),
-        ]
+        with profile_section("prompt_build"):
+            messages = [
+                {"role": "system", "content": self.get_system_prompt()},
+                {"role": "user", "content": self._build_user_prompt(aspirasi, kompilasi)},
+            ]
 
         cost = 0.0
         try:
-            response = await self.llm.ainvoke(messages)
-
-            # Calculate cost
-            if hasattr(response, "response_metadata"):
-                usage = response.response_metadata.get("token_usage", {})
-                cost = self._calculate_cost(
-                    usage.get("prompt_tokens", 0),
-                    usage.get("completion_tokens", 0),
+            content, cost = await self._complete(messages)
+            with profile_section("parse"):
+                result = self._parse_json(content)
+
+                return TindakLanjutResponse(
+                    langkah_tindak_lanjut=result.get("langkah_tindak_lanjut", []),
+                    komisi_penanggung_jawab=result.get("komisi_penanggung_jawab", ""),
+                    timeline=result.get("timeline", ""),
+                    indikator_keberhasilan=result.get("indikator_keberhasilan", []),
+                    mekanisme=result.get("mekanisme", ""),
+                    estimasi_anggaran=result.get("estimasi_anggaran", ""),
+                    rincian_anggaran=result.get("rincian_anggaran", []),
+                    sumber_dana=result.get("sumber_dana", ""),
+                    cost_usd=cost,
                 )
 
-            # Parse JSON response
-            content = response.content
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.startswith("```"):
-                content = content[3:]
-            if content.endswith("```"):
-                content = content[:-3]
-            content = content.strip()
-
-            result = json.loads(content)
-
-            return TindakLanjutResponse(
-                langkah_tindak_lanjut=result.get("langkah_tindak_lanjut", []),
-                komisi_penanggung_jawab=result.get("komisi_penanggung_jawab", ""),
-                timeline=result.get("timeline", ""),
-                indikator_keberhasilan=result.get("indikator_keberhasilan", []),
-                mekanisme=result.get("mekanisme", ""),
-                estimasi_anggaran=result.get("estimasi_anggaran", ""),
-                rincian_anggaran=result.get("rincian_anggaran", []),
-                sumber_dana=result.get("sumber_dana", ""),
-                cost_usd=cost,
-            )
-
         except Exception as e:
             return TindakLanjutResponse(
                 langkah_tindak_lanjut=[],
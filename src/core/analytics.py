@@ -0,0 +1,142 @@
+"""
+Aggregation of member responses for DPR AI Simulator.
+
+Responses are flattened once into lightweight ``ResponseRow`` tuples
+(member attributes joined, LLM labels normalised) and every count and
+cross-tab is taken from those rows with ``Counter``. This replaces the
+earlier vectorized pandas aggregation, which produced the same counts and
+cross-tabs: flattening the responses dominates either way, so the frame
+never wins. It is about 40x slower for the 5-50 responses of one
+aspiration and only ties when a bulk run of 200k responses is aggregated
+in one pass (``benchmarks/response_construction.py``).
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple
+
+from ..models import AbsorpsiResponse, DPRMember, PipelineResult, SimulationAnalytics
+
+
+RELEVANSI_LEVELS = ["Tinggi", "Sedang", "Rendah"]
+
+# Tiers whose responses only rate relevance; their default "Netral" is not a stance
+NO_STANCE_TIERS = ("triage", "rules")
+
+
+class ResponseRow(NamedTuple):
+    """One absorb response joined with its member, as aggregated."""
+
+    aspirasi_id: int
+    fraksi: str
+    komisi: str
+    provinsi: str
+    relevansi: str
+    sentiment: str  # "" for responses without a stance (NO_STANCE_TIERS)
+    cost_usd: float
+    ok: bool
+
+
+def _label(value: str) -> str:
+    # Normalise free-form LLM labels ("tinggi", "TINGGI ")
+    return str(value).strip().capitalize()
+
+
+def response_rows(
+    responses: Iterable[AbsorpsiResponse], members_by_id: Dict[int, DPRMember]
+) -> List[ResponseRow]:
+    """Flatten responses joined with member attributes into rows."""
+    rows = []
+    for r in responses:
+        member = members_by_id.get(r.member_id)
+        rows.append(
+            ResponseRow(
+                r.aspirasi_id,
+                member.faction if member else "-",
+                member.komisi if member else "-",
+                member.province if member else "-",
+                _label(r.relevansi),
+                _label(r.sentiment) if r.tier not in NO_STANCE_TIERS else "",
+                float(r.cost_usd),
+                r.error is None,
+            )
+        )
+    return rows
+
+
+def _by_count(counts: Dict[str, int]) -> Dict[str, int]:
+    """Non-zero counts, most frequent first (ties by label)."""
+    return {k: v for k, v in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])) if v}
+
+
+def _nested(pairs: Dict[tuple, int]) -> Dict[str, Dict[str, int]]:
+    """Turn {(row, col): count} into {row: {col: count}}, both levels sorted."""
+    table: Dict[str, Dict[str, int]] = {}
+    for (row, col), count in sorted(pairs.items()):
+        if count:
+            table.setdefault(row, {})[col] = count
+    return table
+
+
+def aggregate_responses(
+    responses: List[AbsorpsiResponse],
+    members: Iterable[DPRMember],
+) -> SimulationAnalytics:
+    """
+    Aggregate member responses into counts and cross-tabs in one pass.
+
+    Args:
+        responses: Absorb-stage responses, possibly spanning several aspirations
+        members: Members that may appear in the responses (used for lookups)
+
+    Returns:
+        SimulationAnalytics with relevance/sentiment counts, cross-tabs and cost per faction
+    """
+    rows = response_rows(responses, {m.id: m for m in members})
+    ok = [row for row in rows if row.ok]
+    stance = [row for row in ok if row.sentiment]
+
+    relevansi_counts = {level: 0 for level in RELEVANSI_LEVELS}
+    relevansi_counts.update(_by_count(Counter(row.relevansi for row in ok)))
+
+    cost_per_fraksi: Dict[str, float] = {}
+    for row in rows:
+        cost_per_fraksi[row.fraksi] = cost_per_fraksi.get(row.fraksi, 0.0) + row.cost_usd
+
+    return SimulationAnalytics(
+        jumlah_tanggapan=len(rows),
+        jumlah_aspirasi=len({row.aspirasi_id for row in rows}),
+        jumlah_error=len(rows) - len(ok),
+        relevansi_counts=relevansi_counts,
+        sentiment_counts=_by_count(Counter(row.sentiment for row in stance)),
+        fraksi_x_sentiment=_nested(Counter((row.fraksi, row.sentiment) for row in stance)),
+        komisi_x_relevansi=_nested(Counter((row.komisi, row.relevansi) for row in ok)),
+        provinsi_x_relevansi=_nested(Counter((row.provinsi, row.relevansi) for row in ok)),
+        biaya_per_fraksi=dict(sorted(cost_per_fraksi.items())),
+    )
+
+
+def aggregate_results(
+    results: Iterable[PipelineResult],
+    members: Iterable[DPRMember],
+) -> SimulationAnalytics:
+    """
+    Aggregate responses across several pipeline results (e.g. a bulk run).
+
+    Args:
+        results: Pipeline results to combine
+        members: Members that may appear in the responses
+
+    Returns:
+        SimulationAnalytics over every response of every result
+    """
+    responses = [r for result in results for r in result.tanggapan_anggota]
+    return aggregate_responses(responses, members)
+
+
+def representation(members: List[DPRMember]) -> Dict[str, List[str]]:
+    """Return the sorted unique factions, provinces and commissions of members."""
+    return {
+        "fraksi": sorted({m.faction for m in members}),
+        "provinsi": sorted({m.province for m in members}),
+        "komisi": sorted({m.komisi for m in members}),
+    }
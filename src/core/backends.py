@@ -0,0 +1,285 @@
+"""
+LLM backends used by the agents.
+
+Agents send plain role/content message dicts and get back a ``Completion``.
+Interchangeable backends implement that contract (``settings.llm_backend``):
+
+- ``langchain``: LangChain's ``ChatOpenAI`` (the original path)
+- ``openai``: the raw async OpenAI client, reading the JSON body directly;
+  skips LangChain's message, callback and metadata wrappers on the hot path
+  and reports time to first byte
+- ``fake``: no network; synthetic stage-shaped JSON after a simulated
+  latency, for load tests and demos without an API key
+
+The real backends raise the OpenAI SDK exceptions, so retry handling is shared.
+"""
+
+import asyncio
+import json
+import random
+import re
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ..config import settings
+
+
+BACKENDS = ("langchain", "openai", "fake")
+
+
+@lru_cache(maxsize=None)
+def retryable_errors() -> Tuple[type, ...]:
+    """Transient API failures worth retrying (imports openai on first use)."""
+    import openai
+
+    return (
+        openai.RateLimitError,
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.InternalServerError,
+    )
+
+
+def is_rate_limited(error: Optional[BaseException]) -> bool:
+    """Whether an error is an HTTP 429 from the API."""
+    return error is not None and isinstance(error, retryable_errors()[0])
+
+
+class Completion(NamedTuple):
+    """Result of one chat completion call."""
+
+    content: str
+    usage: Dict[str, Any]
+    ttfb_ms: Optional[float] = None
+
+
+class LLMBackend(ABC):
+    """Chat completion client for one model and API key."""
+
+    name = "backend"
+
+    def __init__(
+        self,
+        model: str,
+        api_key: str,
+        temperature: float = 0.7,
+        http_client: Any = None,
+        base_url: Optional[str] = None,
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            model: OpenAI model name
+            api_key: OpenAI API key
+            temperature: Sampling temperature
+            http_client: Optional ``httpx.AsyncClient`` (e.g. a mock transport in benchmarks)
+            base_url: Base URL of an OpenAI-compatible API (None for api.openai.com)
+        """
+        self.model = model
+        self.api_key = api_key
+        self.temperature = temperature
+        self.http_client = http_client
+        self.base_url = base_url
+        self._client = None
+
+    @property
+    def client(self) -> Any:
+        """Underlying client, created (and its library imported) on first use."""
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    @abstractmethod
+    def _create_client(self) -> Any:
+        """Create the underlying client."""
+
+    @abstractmethod
+    async def complete(
+        self, messages: List[Dict[str, str]], model: Optional[str] = None, stage: Optional[str] = None
+    ) -> Completion:
+        """
+        Send one chat completion request (no retries), optionally to another model.
+
+        ``stage`` names the kind of request (absorb, triage, absorb_group,
+        compile, followup); API backends ignore it.
+        """
+
+    @abstractmethod
+    async def probe(self) -> None:
+        """Cheap health check; raises if the endpoint is unreachable."""
+
+
+class LangChainBackend(LLMBackend):
+    """Backend built on LangChain's ``ChatOpenAI``."""
+
+    name = "langchain"
+
+    def _create_client(self) -> Any:
+        from langchain_openai import ChatOpenAI
+
+        # Retries are handled by the agent so they can be counted by cause
+        return ChatOpenAI(
+            model=self.model,
+            api_key=self.api_key,
+            temperature=self.temperature,
+            max_retries=0,
+            base_url=self.base_url,
+            http_async_client=self.http_client,
+        )
+
+    async def complete(
+        self, messages: List[Dict[str, str]], model: Optional[str] = None, stage: Optional[str] = None
+    ) -> Completion:
+        # ChatOpenAI merges call kwargs into the request payload
+        response = await self.client.ainvoke(messages, **({"model": model} if model else {}))
+        usage = getattr(response, "response_metadata", {}).get("token_usage", {})
+        return Completion(response.content, usage)
+
+    async def probe(self) -> None:
+        await self.client.root_async_client.models.list()
+
+
+class OpenAIBackend(LLMBackend):
+    """Lean backend on the raw ``AsyncOpenAI`` client."""
+
+    name = "openai"
+
+    def _create_client(self) -> Any:
+        import openai
+
+        return openai.AsyncOpenAI(
+            api_key=self.api_key,
+            max_retries=0,
+            base_url=self.base_url,
+            http_client=self.http_client,
+        )
+
+    async def complete(
+        self, messages: List[Dict[str, str]], model: Optional[str] = None, stage: Optional[str] = None
+    ) -> Completion:
+        start = time.perf_counter()
+        # The streaming-response wrapper returns once headers arrive and lets us
+        # decode the body ourselves instead of building SDK response objects
+        async with self.client.chat.completions.with_streaming_response.create(
+            model=model or self.model,
+            messages=messages,
+            temperature=self.temperature,
+        ) as response:
+            ttfb_ms = (time.perf_counter() - start) * 1000
+            data = json.loads(await response.read())
+        return Completion(
+            data["choices"][0]["message"]["content"] or "",
+            data.get("usage") or {},
+            ttfb_ms,
+        )
+
+    async def probe(self) -> None:
+        await self.client.models.list()
+
+
+class FakeBackend(LLMBackend):
+    """Offline backend answering with synthetic JSON for the calling stage."""
+
+    name = "fake"
+
+    RELEVANSI = ("Tinggi", "Sedang", "Rendah")
+    SENTIMENTS = ("Positif", "Negatif", "Kritis", "Netral")
+
+    STAGES = ("absorb", "triage", "absorb_group", "compile", "followup")
+
+    def _create_client(self) -> Any:
+        return None
+
+    def _body(self, stage: str, rng: random.Random) -> Dict[str, Any]:
+        if stage == "compile":
+            return {
+                "ringkasan": "Para anggota sepakat aspirasi ini perlu segera ditindaklanjuti.",
+                "tema_utama": ["anggaran", "pengawasan", "pelayanan publik"],
+                "fraksi_terlibat": ["PDI-P", "Golkar", "Gerindra"],
+                "rekomendasi_tindak_lanjut": "Rapat dengar pendapat dengan kementerian terkait",
+            }
+        if stage == "followup":
+            return {
+                "langkah_tindak_lanjut": ["Rapat dengar pendapat", "Kunjungan kerja ke daerah"],
+                "komisi_penanggung_jawab": "Komisi terkait",
+                "timeline": "3 bulan",
+                "indikator_keberhasilan": ["Anggaran dialokasikan", "Layanan pulih"],
+                "mekanisme": "RDP",
+                "estimasi_anggaran": "Rp 10.000.000.000",
+                "rincian_anggaran": ["Perbaikan: Rp 8.000.000.000", "Pengawasan: Rp 2.000.000.000"],
+                "sumber_dana": "APBN",
+            }
+        relevansi = rng.choice(self.RELEVANSI)
+        body = {"relevansi": relevansi, "alasan_relevansi": f"Relevansi {relevansi.lower()} bagi anggota"}
+        if stage == "absorb":
+            body.update(
+                poin_kunci=["anggaran", "pengawasan"],
+                rekomendasi_awal="Meminta penjelasan kementerian terkait",
+                sentiment=rng.choice(self.SENTIMENTS),
+                quote="Kami akan memperjuangkan aspirasi ini dalam rapat komisi.",
+            )
+        return body
+
+    async def complete(
+        self, messages: List[Dict[str, str]], model: Optional[str] = None, stage: Optional[str] = None
+    ) -> Completion:
+        # Seeded by the request, so the same prompt always gets the same answer
+        rng = random.Random(json.dumps(messages, sort_keys=True))
+        latency = settings.fake_llm_latency * rng.lognormvariate(0, settings.fake_llm_latency_sigma)
+        start = time.perf_counter()
+        await asyncio.sleep(latency)
+        # The answer's shape follows the calling agent's stage, never the prompt wording
+        stage = stage or "absorb"
+        if stage not in self.STAGES:
+            raise ValueError(f"Unknown fake backend stage {stage!r}, expected one of {self.STAGES}")
+        if stage == "absorb_group":
+            numbers = re.findall(r"^### Aspirasi (\d+)$", messages[-1]["content"], re.MULTILINE)
+            body = {"tanggapan": [{"nomor": int(n), **self._body("absorb", rng)} for n in numbers]}
+        else:
+            body = self._body(stage, rng)
+        content = json.dumps(body, ensure_ascii=False)
+        prompt_chars = sum(len(m.get("content", "")) for m in messages)
+        usage = {"prompt_tokens": prompt_chars // 4, "completion_tokens": len(content) // 4}
+        return Completion(content, usage, (time.perf_counter() - start) * 1000)
+
+    async def probe(self) -> None:
+        return None
+
+
+def create_backend(
+    name: str,
+    model: str,
+    api_key: str,
+    temperature: float = 0.7,
+    http_client: Any = None,
+    base_url: Optional[str] = None,
+) -> LLMBackend:
+    """
+    Create a backend by name.
+
+    Args:
+        name: One of BACKENDS, or "cassette" to answer from the replaying cassette
+        model: OpenAI model name
+        api_key: OpenAI API key
+        temperature: Sampling temperature
+        http_client: Optional ``httpx.AsyncClient`` shared by the backend
+        base_url: Base URL of an OpenAI-compatible API (None for api.openai.com)
+
+    Returns:
+        The LLMBackend instance
+    """
+    if name == "langchain":
+        return LangChainBackend(model, api_key, temperature, http_client, base_url)
+    if name == "openai":
+        return OpenAIBackend(model, api_key, temperature, http_client, base_url)
+    if name == "fake":
+        return FakeBackend(model, api_key, temperature, http_client, base_url)
+    if name == "cassette":
+        # Answers from the replaying cassette set in settings
+        from .cassette import CassetteBackend
+
+        return CassetteBackend(model, api_key, temperature, http_client, base_url)
+    raise ValueError(f"Unknown LLM backend {name!r}, expected one of {BACKENDS}")
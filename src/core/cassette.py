@@ -0,0 +1,215 @@
+"""
+Record/replay cassettes of LLM calls.
+
+In record mode every completed call made by an agent is appended to a
+cassette: the request messages and model, the response content, token
+usage, time to first byte, call latency and the call's start offset from
+the beginning of the recording session. Cassettes are gzip-compressed JSON
+Lines; every session appends its own gzip member.
+
+In replay mode calls are answered from the cassette instead of the API,
+after sleeping the recorded latency times ``latency_scale`` (0 answers
+immediately). Routers built from settings then use ``CassetteBackend``, so
+no live API client is created, and replayed call spans are labelled with
+the ``cassette`` backend. Calls still go through the endpoint router, so a replay
+exercises the scheduler, parsers and pipeline exactly as the recorded
+traffic did, without API keys or cost. Requests are matched by a hash of
+model and messages; identical requests are served in recorded order.
+"""
+
+import asyncio
+import atexit
+import gzip
+import hashlib
+import json
+import threading
+import time
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from ..config import settings
+from .backends import Completion, LLMBackend
+
+
+CASSETTE_MODES = ("record", "replay")
+FORMAT_VERSION = 1
+
+
+class CassetteMissError(LookupError):
+    """A replayed request has no recorded response."""
+
+
+def request_key(model: str, messages: List[Dict[str, str]]) -> str:
+    """Stable hash identifying a request by model and messages."""
+    payload = json.dumps([model, messages], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def read_entries(path: str | Path) -> Iterator[Dict[str, Any]]:
+    """Yield the recorded calls of a cassette (a truncated tail is ignored)."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                entry = json.loads(line)
+                if "key" in entry:
+                    yield entry
+        except (EOFError, zlib.error, json.JSONDecodeError):
+            # Recording was interrupted mid-write
+            return
+
+
+class Cassette:
+    """One cassette file, either recording or replaying."""
+
+    def __init__(self, path: str | Path, mode: str, latency_scale: float | None = None):
+        """
+        Open a cassette.
+
+        Args:
+            path: Cassette file (``.jsonl.gz``)
+            mode: "record" (append calls) or "replay" (serve calls)
+            latency_scale: Multiplier of recorded latency when replaying (defaults to settings)
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}, expected one of {CASSETTE_MODES}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_scale = settings.cassette_latency_scale if latency_scale is None else latency_scale
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._file = None
+        self._entries: Dict[str, Deque[Dict[str, Any]]] = {}
+
+        if mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = gzip.open(self.path, "at", encoding="utf-8")
+            self._write({"version": FORMAT_VERSION, "created": time.time()})
+        else:
+            for entry in read_entries(self.path):
+                self._entries.setdefault(entry["key"], deque()).append(entry)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def record(
+        self,
+        stage: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        completion: Completion,
+        started: float,
+        latency_s: float,
+    ) -> None:
+        """
+        Append one completed call.
+
+        Args:
+            stage: Agent stage that made the call
+            model: Model the call used
+            messages: Request messages
+            completion: The backend's completion
+            started: ``time.perf_counter()`` when the call started
+            latency_s: Call duration in seconds
+        """
+        self._write(
+            {
+                "key": request_key(model, messages),
+                "stage": stage,
+                "model": model,
+                "offset_s": round(started - self._started, 4),
+                "latency_ms": round(latency_s * 1000, 2),
+                "ttfb_ms": completion.ttfb_ms,
+                "usage": completion.usage,
+                "messages": messages,
+                "content": completion.content,
+            }
+        )
+        self.recorded += 1
+
+    async def replay(self, model: str, messages: List[Dict[str, str]]) -> Completion:
+        """
+        Serve a call from the cassette after its (scaled) recorded latency.
+
+        Raises:
+            CassetteMissError: If the request was never recorded
+        """
+        entries = self._entries.get(request_key(model, messages))
+        if not entries:
+            self.misses += 1
+            raise CassetteMissError(f"No recorded response for this {model} request in {self.path}")
+        self.hits += 1
+        # The last recording of a request keeps answering repeats of it
+        entry = entries.popleft() if len(entries) > 1 else entries[0]
+        if self.latency_scale > 0:
+            await asyncio.sleep(entry["latency_ms"] / 1000 * self.latency_scale)
+        return Completion(entry["content"], entry.get("usage") or {}, entry.get("ttfb_ms"))
+
+    def close(self) -> None:
+        """Finish the gzip stream of a recording."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class CassetteBackend(LLMBackend):
+    """
+    Backend of a replay: every call is answered from the cassette, and no
+    API client is ever created.
+    """
+
+    name = "cassette"
+
+    def __init__(self, *args: Any, cassette: Optional[Cassette] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.cassette = cassette
+
+    def _create_client(self) -> Cassette:
+        cassette = self.cassette or get_cassette()
+        if cassette is None or not cassette.replaying:
+            raise RuntimeError("The cassette backend needs a cassette in replay mode (CASSETTE_MODE=replay)")
+        return cassette
+
+    async def complete(
+        self, messages: List[Dict[str, str]], model: Optional[str] = None, stage: Optional[str] = None
+    ) -> Completion:
+        return await self.client.replay(model or self.model, messages)
+
+    async def probe(self) -> None:
+        """A cassette is always reachable."""
+
+
+_active: Dict[tuple, Cassette] = {}
+_active_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """The cassette configured in settings (``cassette_mode``/``cassette_path``), or None."""
+    if not settings.cassette_mode:
+        return None
+    key = (settings.cassette_mode, str(Path(settings.cassette_path).resolve()))
+    with _active_lock:
+        cassette = _active.get(key)
+        if cassette is None:
+            cassette = _active[key] = Cassette(settings.cassette_path, settings.cassette_mode)
+        return cassette
+
+
+@atexit.register
+def _close_cassettes() -> None:
+    for cassette in list(_active.values()):
+        cassette.close()
@@ -0,0 +1,149 @@
+"""
+Offline aspiration classifier for category and commission routing.
+
+A TF-IDF nearest-centroid model over word unigrams and bigrams. Each
+category's profile is built from ``CATEGORY_KEYWORDS`` plus the scope
+(``ruang_lingkup``) and partner institutions (``mitra_kerja``) of the
+commissions it maps to; each commission's profile from its own scope,
+partners and the keywords of its categories. Predicting is a sparse dot
+product against 16 + 13 profiles: a few milliseconds on the CPU for a long
+aspiration, with no training data or LLM call.
+"""
+
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple
+
+from ..config import settings
+from .komisi_data import CATEGORY_KEYWORDS, CATEGORY_TO_KOMISI, KOMISI_INFO
+
+
+# Category value (UI/CLI) asking for the category to be detected from the text
+AUTO_CATEGORY = "Auto (Deteksi Otomatis)"
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "yang dan di ke dari untuk pada dengan ini itu dalam tidak ada akan juga atau oleh karena "
+    "kami kita saya mereka sudah belum masih sangat agar bagi para serta sebagai tersebut "
+    "bapak ibu mohon tolong harap kepada dpr ri pemerintah masyarakat warga".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word unigrams and bigrams, without stopwords."""
+    words = []
+    for word in _WORD.findall(text.lower()):
+        # "-nya" is the one clitic common enough to matter ("sekolahnya" -> "sekolah")
+        if len(word) > 6 and word.endswith("nya"):
+            word = word[:-3]
+        if word not in _STOPWORDS and len(word) > 1:
+            words.append(word)
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class AspirasiPrediction(NamedTuple):
+    """Predicted routing of one aspiration."""
+
+    category: str
+    komisi: str
+    score: float
+    komisi_score: float
+
+    @property
+    def confident(self) -> bool:
+        return self.score >= settings.classifier_min_score
+
+    @property
+    def routes_komisi(self) -> bool:
+        """Whether the commission is certain enough to route the aspiration to it alone."""
+        return self.confident and self.komisi_score >= settings.classifier_min_score
+
+
+class AspirasiClassifier:
+    """TF-IDF nearest-centroid classifier over category and commission profiles."""
+
+    def __init__(self):
+        self.category_profiles = self._fit(self._category_documents())
+        self.komisi_profiles = self._fit(self._komisi_documents())
+
+    @staticmethod
+    def _category_documents() -> Dict[str, List[str]]:
+        documents = {}
+        for category, komisi_list in CATEGORY_TO_KOMISI.items():
+            terms = [category] * 3 + CATEGORY_KEYWORDS.get(category, [])
+            # Scope and partners of the primary commission count fully, others once
+            for rank, komisi in enumerate(komisi_list):
+                info = KOMISI_INFO.get(komisi, {})
+                weight = 2 if rank == 0 else 1
+                terms += info.get("ruang_lingkup", []) * weight + info.get("mitra_kerja", [])
+            documents[category] = terms
+        return documents
+
+    @staticmethod
+    def _komisi_documents() -> Dict[str, List[str]]:
+        documents = {
+            komisi: list(info.get("ruang_lingkup", [])) * 2 + list(info.get("mitra_kerja", []))
+            for komisi, info in KOMISI_INFO.items()
+        }
+        for category, komisi_list in CATEGORY_TO_KOMISI.items():
+            for komisi in komisi_list:
+                documents[komisi] += [category] + CATEGORY_KEYWORDS.get(category, [])
+        return documents
+
+    @staticmethod
+    def _fit(documents: Dict[str, Iterable[str]]) -> Dict[str, Dict[str, float]]:
+        """Unit-length TF-IDF profiles (sublinear term frequency) per label."""
+        counts = {
+            label: Counter(t for phrase in terms for t in tokenize(phrase)) for label, terms in documents.items()
+        }
+        df = Counter(term for c in counts.values() for term in c)
+        n = len(counts)
+        idf = {term: math.log((1 + n) / (1 + freq)) + 1 for term, freq in df.items()}
+
+        profiles = {}
+        for label, c in counts.items():
+            vector = {term: (1 + math.log(tf)) * idf[term] for term, tf in c.items()}
+            norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+            profiles[label] = {term: v / norm for term, v in vector.items()}
+        return profiles
+
+    @staticmethod
+    def _scores(profiles: Dict[str, Dict[str, float]], terms: Counter) -> Dict[str, float]:
+        norm = math.sqrt(sum((1 + math.log(tf)) ** 2 for tf in terms.values())) or 1.0
+        return {
+            label: sum((1 + math.log(tf)) * profile.get(term, 0.0) for term, tf in terms.items()) / norm
+            for label, profile in profiles.items()
+        }
+
+    def predict(self, text: str) -> AspirasiPrediction:
+        """
+        Predict the category and responsible commission of an aspiration.
+
+        Args:
+            text: Aspiration content
+
+        Returns:
+            AspirasiPrediction with the best category, the best commission among
+            those the category maps to, and their cosine scores
+        """
+        terms = Counter(tokenize(text))
+        category_scores = self._scores(self.category_profiles, terms)
+        category = max(category_scores, key=category_scores.get)
+
+        komisi_scores = self._scores(self.komisi_profiles, terms)
+        candidates = CATEGORY_TO_KOMISI.get(category) or list(komisi_scores)
+        komisi = max(candidates, key=lambda k: komisi_scores.get(k, 0.0))
+        return AspirasiPrediction(category, komisi, category_scores[category], komisi_scores.get(komisi, 0.0))
+
+
+@lru_cache(maxsize=1)
+def get_classifier() -> AspirasiClassifier:
+    """Shared classifier instance, built on first use."""
+    return AspirasiClassifier()
+
+
+def classify_aspirasi(text: str) -> AspirasiPrediction:
+    """Predict category and commission of an aspiration text with the shared classifier."""
+    return get_classifier().predict(text)
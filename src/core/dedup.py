@@ -0,0 +1,222 @@
+"""
+Near-duplicate detection of incoming aspirations.
+
+Aspirations are fingerprinted with MinHash signatures over character
+shingles of their normalized content. Signatures are bucketed with
+locality-sensitive hashing (bands of ``ROWS_PER_BAND`` rows), so a lookup
+only compares candidates that share a band, and a candidate counts as a
+duplicate when its estimated Jaccard similarity reaches the threshold.
+Buckets are also keyed by the run parameters (category, source, sample
+size, commission filter), so only runs that would produce the same kind of
+result match.
+
+Each entry is either in flight (its pipeline is still running; duplicates
+wait for it) or completed (its result is reused until the freshness window
+ends).
+"""
+
+import asyncio
+import random
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from ..config import settings
+from ..models import PipelineResult
+
+
+ROWS_PER_BAND = 4
+_MASK = (1 << 32) - 1
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip punctuation so wording noise doesn't change shingles."""
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+def shingles(text: str, size: int = 5) -> List[int]:
+    """CRC32 hashes of the character ``size``-grams of the normalized text."""
+    text = normalize(text)
+    if len(text) <= size:
+        return [zlib.crc32(text.encode())]
+    return list({zlib.crc32(text[i : i + size].encode()) for i in range(len(text) - size + 1)})
+
+
+class MinHasher:
+    """MinHash signatures with ``num_perm`` multiply-add hash permutations."""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = [rng.randrange(1, _MASK) | 1 for _ in range(num_perm)]
+        self._b = [rng.randrange(0, _MASK) for _ in range(num_perm)]
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """MinHash signature of a text."""
+        import numpy as np
+
+        hashes = np.array(shingles(text, self.shingle_size), dtype=np.uint64)
+        a = np.array(self._a, dtype=np.uint64)[:, None]
+        b = np.array(self._b, dtype=np.uint64)[:, None]
+        # 32-bit operands keep a * h + b inside uint64
+        permuted = (a * hashes + b) & np.uint64(_MASK)
+        return tuple(int(v) for v in permuted.min(axis=1))
+
+    @staticmethod
+    def similarity(sig1: Tuple[int, ...], sig2: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(1 for x, y in zip(sig1, sig2) if x == y) / len(sig1)
+
+
+class DuplicateEntry:
+    """One indexed aspiration and its (possibly pending) pipeline result."""
+
+    __slots__ = ("aspirasi_id", "signature", "key", "bucket_keys", "updated", "future", "result", "done")
+
+    def __init__(self, aspirasi_id: int, signature: Tuple[int, ...], key: Hashable):
+        self.aspirasi_id = aspirasi_id
+        self.signature = signature
+        self.key = key
+        self.bucket_keys: List[Hashable] = []
+        self.updated = time.monotonic()
+        self.future: Optional[asyncio.Future] = asyncio.get_running_loop().create_future()
+        self.result: Optional[PipelineResult] = None
+        self.done = False
+
+    @property
+    def in_flight(self) -> bool:
+        return not self.done
+
+    def complete(self, result: Optional[PipelineResult]) -> None:
+        """Store the result (None when the run failed) and wake attached duplicates."""
+        self.result = result
+        self.done = True
+        self.updated = time.monotonic()
+        if self.future is not None and not self.future.done():
+            # Failures resolve to None so waiters fall back to their own run
+            self.future.set_result(result)
+        self.future = None
+
+    async def wait(self) -> Optional[PipelineResult]:
+        """The entry's result, waiting for an in-flight run on the same event loop."""
+        if self.done:
+            return self.result
+        future = self.future
+        if future is None or future.get_loop() is not asyncio.get_running_loop():
+            return None
+        return await asyncio.shield(future)
+
+
+class DuplicateIndex:
+    """LSH index of recent and in-flight aspirations."""
+
+    def __init__(
+        self,
+        threshold: float | None = None,
+        freshness_seconds: float | None = None,
+        num_perm: int | None = None,
+        max_entries: int | None = None,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity of a duplicate (defaults to settings)
+            freshness_seconds: How long a completed result is reused (defaults to settings)
+            num_perm: MinHash permutations, a multiple of ROWS_PER_BAND (defaults to settings)
+            max_entries: Maximum indexed aspirations (defaults to settings)
+        """
+        self.threshold = threshold or settings.dedup_threshold
+        self.freshness_seconds = (
+            settings.dedup_freshness_seconds if freshness_seconds is None else freshness_seconds
+        )
+        self.max_entries = max_entries or settings.dedup_max_entries
+        self.hasher = MinHasher(num_perm or settings.dedup_num_perm)
+        self.bands = self.hasher.num_perm // ROWS_PER_BAND
+
+        self._entries: "OrderedDict[int, DuplicateEntry]" = OrderedDict()
+        self._buckets: Dict[Hashable, List[DuplicateEntry]] = {}
+
+    def signature(self, content: str) -> Tuple[int, ...]:
+        """MinHash signature of an aspiration's content."""
+        return self.hasher.signature(content)
+
+    def _bucket_keys(self, signature: Tuple[int, ...], key: Hashable) -> List[Hashable]:
+        return [
+            (key, band, signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND])
+            for band in range(self.bands)
+        ]
+
+    def _expired(self, entry: DuplicateEntry, now: float) -> bool:
+        return not entry.in_flight and now - entry.updated > self.freshness_seconds
+
+    def find(self, signature: Tuple[int, ...], key: Hashable) -> Optional[Tuple[DuplicateEntry, float]]:
+        """
+        Find the most similar fresh or in-flight duplicate.
+
+        Args:
+            signature: MinHash signature of the new aspiration
+            key: Run parameters the duplicate must share
+
+        Returns:
+            (entry, estimated similarity), or None
+        """
+        now = time.monotonic()
+        best: Optional[Tuple[DuplicateEntry, float]] = None
+        seen = set()
+        for bucket_key in self._bucket_keys(signature, key):
+            for entry in self._buckets.get(bucket_key, ()):
+                if id(entry) in seen or self._expired(entry, now):
+                    continue
+                seen.add(id(entry))
+                similarity = MinHasher.similarity(signature, entry.signature)
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (entry, similarity)
+        return best
+
+    def add(self, aspirasi_id: int, signature: Tuple[int, ...], key: Hashable) -> DuplicateEntry:
+        """Index an aspiration whose pipeline is starting; complete the entry when it ends."""
+        self._prune()
+        entry = DuplicateEntry(aspirasi_id, signature, key)
+        entry.bucket_keys = self._bucket_keys(signature, key)
+        for bucket_key in entry.bucket_keys:
+            self._buckets.setdefault(bucket_key, []).append(entry)
+        self._entries[id(entry)] = entry
+        return entry
+
+    def remove(self, entry: DuplicateEntry) -> None:
+        """Drop an entry from the index."""
+        if self._entries.pop(id(entry), None) is None:
+            return
+        for bucket_key in entry.bucket_keys:
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                continue
+            bucket.remove(entry)
+            if not bucket:
+                del self._buckets[bucket_key]
+
+    def _prune(self) -> None:
+        """Drop expired entries, then the oldest completed ones beyond max_entries."""
+        now = time.monotonic()
+        for entry in [e for e in self._entries.values() if self._expired(e, now)]:
+            self.remove(entry)
+        overflow = len(self._entries) - self.max_entries + 1
+        if overflow > 0:
+            for entry in [e for e in self._entries.values() if not e.in_flight][:overflow]:
+                self.remove(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry and bucket counts (for logs and debugging)."""
+        return {
+            "entries": len(self._entries),
+            "in_flight": sum(1 for e in self._entries.values() if e.in_flight),
+            "buckets": len(self._buckets),
+        }
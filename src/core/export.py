@@ -0,0 +1,297 @@
+"""
+Columnar Parquet export of pipeline results for analytics.
+
+Results are flattened into three tables, each a Hive-partitioned Parquet
+dataset under the export root::
+
+    <root>/tanggapan/tanggal=2025-01-31/kategori=Kesehatan/part-<session>.parquet
+    <root>/kompilasi/...
+    <root>/tindak_lanjut/...
+
+``tanggapan`` has one row per member response (joined with the member's
+faction, commission and province), ``kompilasi`` one row per aspiration
+and ``tindak_lanjut`` its follow-up plan. Low-cardinality labels (faction,
+commission, relevance, sentiment, ...) are dictionary-encoded columns.
+
+The exporter streams: rows are buffered per partition and written as a
+row group once ``batch_rows`` accumulate, so memory stays bounded however
+many results pass through. Files are read back memory-mapped with
+``read_table`` or scanned batch by batch with ``open_dataset``.
+
+Requires ``pyarrow`` (the ``export`` extra: ``pip install -e ".[export]"``),
+imported on first use.
+"""
+
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+from ..config import settings
+from ..models import AbsorpsiResponse, DPRMember, PipelineResult
+from .member_factory import DPRMemberFactory
+
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+TABLES = ("tanggapan", "kompilasi", "tindak_lanjut")
+
+# Column kinds: int, float, str, label (dictionary-encoded), list, time, opt_int
+_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    "tanggapan": [
+        ("run_id", "str"),
+        ("aspirasi_id", "int"),
+        ("timestamp", "time"),
+        ("member_id", "int"),
+        ("fraksi", "label"),
+        ("komisi", "label"),
+        ("provinsi", "label"),
+        ("relevansi", "label"),
+        ("sentiment", "label"),
+        ("tier", "label"),
+        ("alasan_relevansi", "str"),
+        ("poin_kunci", "list"),
+        ("rekomendasi_awal", "str"),
+        ("quote", "str"),
+        ("cost_usd", "float"),
+        ("triage_cost_usd", "float"),
+        ("error", "str"),
+    ],
+    "kompilasi": [
+        ("run_id", "str"),
+        ("aspirasi_id", "int"),
+        ("timestamp", "time"),
+        ("source", "label"),
+        ("priority", "label"),
+        ("komisi_utama", "label"),
+        ("status", "label"),
+        ("jumlah_anggota", "int"),
+        ("ringkasan", "str"),
+        ("tema_utama", "list"),
+        ("fraksi_terlibat", "list"),
+        ("rekomendasi_tindak_lanjut", "str"),
+        ("cost_usd", "float"),
+        ("total_cost_usd", "float"),
+        ("duplikat_dari", "opt_int"),
+        ("error", "str"),
+    ],
+    "tindak_lanjut": [
+        ("run_id", "str"),
+        ("aspirasi_id", "int"),
+        ("timestamp", "time"),
+        ("komisi_penanggung_jawab", "label"),
+        ("mekanisme", "label"),
+        ("timeline", "str"),
+        ("langkah_tindak_lanjut", "list"),
+        ("indikator_keberhasilan", "list"),
+        ("estimasi_anggaran", "str"),
+        ("rincian_anggaran", "list"),
+        ("sumber_dana", "str"),
+        ("cost_usd", "float"),
+        ("error", "str"),
+    ],
+}
+
+_RESPONSE_FIELDS = [name for name, _ in _COLUMNS["tanggapan"] if name in AbsorpsiResponse.model_fields]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError('Parquet export requires pyarrow: pip install -e ".[export]"') from e
+    return pyarrow
+
+
+def schema(table: str) -> "pa.Schema":
+    """Arrow schema of an export table (without the partition columns)."""
+    pa = _pyarrow()
+    types = {
+        "int": pa.int64(),
+        "opt_int": pa.int64(),
+        "float": pa.float64(),
+        "str": pa.string(),
+        "label": pa.dictionary(pa.int32(), pa.string()),
+        "list": pa.list_(pa.string()),
+        "time": pa.timestamp("us"),
+    }
+    return pa.schema(
+        [pa.field(name, types[kind], nullable=kind in ("str", "opt_int")) for name, kind in _COLUMNS[table]]
+    )
+
+
+def _partitioning():
+    pa = _pyarrow()
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(pa.schema([("tanggal", pa.string()), ("kategori", pa.string())]), flavor="hive")
+
+
+class ParquetExporter:
+    """Streams PipelineResults into partitioned Parquet datasets."""
+
+    def __init__(
+        self,
+        root: str | Path | None = None,
+        members_by_id: Optional[Dict[int, DPRMember]] = None,
+        batch_rows: int | None = None,
+    ):
+        """
+        Initialize the exporter.
+
+        Args:
+            root: Export directory (defaults to settings)
+            members_by_id: Members for joining response rows; members not in
+                it are rebuilt from the deterministic member factory
+            batch_rows: Rows buffered per partition before a row group is
+                written (defaults to settings)
+        """
+        self.pa = _pyarrow()
+        self.root = Path(root or settings.export_dir)
+        self.members_by_id: Dict[int, DPRMember] = dict(members_by_id or {})
+        self.batch_rows = batch_rows or settings.export_batch_rows
+        self.session = uuid.uuid4().hex[:12]
+        self.schemas = {table: schema(table) for table in TABLES}
+        self.rows_written = {table: 0 for table in TABLES}
+
+        self._buffers: Dict[Tuple[str, str, str], Dict[str, list]] = {}
+        self._writers: Dict[Tuple[str, str, str], Any] = {}
+
+    def __enter__(self) -> "ParquetExporter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _member(self, member_id: int) -> Optional[DPRMember]:
+        if member_id not in self.members_by_id and member_id > 0:
+            # Factory members are deterministic by id, so stored results can be joined later
+            for member in DPRMemberFactory.create_members(max(member_id, settings.default_member_count)):
+                self.members_by_id.setdefault(member.id, member)
+        return self.members_by_id.get(member_id)
+
+    def write(self, result: PipelineResult) -> None:
+        """Add one result's rows to the export."""
+        aspirasi = result.aspirasi
+        partition = (result.timestamp.strftime("%Y-%m-%d"), aspirasi.category)
+        common = {"run_id": result.trace.trace_id, "aspirasi_id": aspirasi.id, "timestamp": result.timestamp}
+
+        for r in result.tanggapan_anggota:
+            member = self._member(r.member_id)
+            self._append("tanggapan", partition, {
+                **common,
+                **{name: getattr(r, name) for name in _RESPONSE_FIELDS},
+                "fraksi": member.faction if member else "-",
+                "komisi": member.komisi if member else "-",
+                "provinsi": member.province if member else "-",
+            })
+
+        kompilasi = result.kompilasi
+        self._append("kompilasi", partition, {
+            **common,
+            **kompilasi.model_dump(exclude={"cost_usd", "error"}),
+            "source": aspirasi.source,
+            "priority": aspirasi.priority,
+            "komisi_utama": result.simulation_details.komisi_utama,
+            "cost_usd": kompilasi.cost_usd,
+            "total_cost_usd": result.total_cost_usd,
+            "duplikat_dari": result.duplikat_dari,
+            "error": kompilasi.error,
+        })
+        self._append("tindak_lanjut", partition, {**common, **result.tindak_lanjut.model_dump()})
+
+    def write_all(self, results: Iterable[PipelineResult]) -> int:
+        """Export every result of an iterable; returns how many were written."""
+        count = 0
+        for result in results:
+            self.write(result)
+            count += 1
+        return count
+
+    def _append(self, table: str, partition: Tuple[str, str], row: Dict[str, Any]) -> None:
+        key = (table, *partition)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = {name: [] for name, _ in _COLUMNS[table]}
+        for name, column in buffer.items():
+            column.append(row.get(name))
+        if len(buffer["aspirasi_id"]) >= self.batch_rows:
+            self._flush_partition(key)
+
+    def _flush_partition(self, key: Tuple[str, str, str]) -> None:
+        buffer = self._buffers.pop(key, None)
+        if not buffer or not buffer["aspirasi_id"]:
+            return
+        table, tanggal, kategori = key
+        batch = self.pa.Table.from_pydict(buffer, schema=self.schemas[table])
+
+        writer = self._writers.get(key)
+        if writer is None:
+            directory = self.root / table / f"tanggal={tanggal}" / f"kategori={quote(kategori, safe='')}"
+            directory.mkdir(parents=True, exist_ok=True)
+            writer = self._writers[key] = self.pa.parquet.ParquetWriter(
+                directory / f"part-{self.session}.parquet",
+                self.schemas[table],
+                compression="zstd",
+                use_dictionary=True,
+            )
+        writer.write_table(batch)
+        self.rows_written[table] += batch.num_rows
+
+    def flush(self) -> None:
+        """Write every buffered row as row groups (files stay open)."""
+        for key in list(self._buffers):
+            self._flush_partition(key)
+
+    def close(self) -> None:
+        """Flush buffers and finalize every Parquet file."""
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+
+def open_dataset(root: str | Path, table: str):
+    """
+    Lazily scanned ``pyarrow.dataset.Dataset`` of an export table.
+
+    Use ``dataset.to_batches(columns=..., filter=...)`` to stream rows
+    without loading the whole table.
+    """
+    _pyarrow()
+    import pyarrow.dataset as ds
+
+    return ds.dataset(Path(root) / table, format="parquet", partitioning=_partitioning())
+
+
+def read_table(
+    root: str | Path,
+    table: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[Tuple[str, str, Any]]] = None,
+) -> "pa.Table":
+    """
+    Read an export table memory-mapped, with column projection and partition pruning.
+
+    Args:
+        root: Export directory
+        table: One of TABLES
+        columns: Columns to read (all when omitted)
+        filters: Row filters such as ``[("kategori", "=", "Kesehatan")]``
+
+    Returns:
+        pyarrow Table (partition columns ``tanggal`` and ``kategori`` included)
+    """
+    pa = _pyarrow()
+    result = pa.parquet.read_table(
+        Path(root) / table,
+        columns=columns,
+        filters=filters,
+        memory_map=True,
+        partitioning=_partitioning(),
+    )
+    # Each row group has its own dictionary; group-bys need one per column
+    return result.unify_dictionaries()
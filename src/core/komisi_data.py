@@ -237,6 +237,80 @@ CATEGORY_TO_KOMISI: Dict[str, List[str]] = {
 }
 
 
+# Everyday words citizens use for each category, used by the offline
+# aspiration classifier alongside the commissions' scopes and partners
+CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    "Ekonomi": [
+        "ekonomi", "harga", "inflasi", "daya beli", "lapangan kerja", "pengangguran", "usaha",
+        "pedagang", "pasar", "bumn", "koperasi", "umkm", "modal", "kredit", "investasi",
+    ],
+    "Pendidikan": [
+        "pendidikan", "sekolah", "guru", "siswa", "murid", "pelajar", "mahasiswa", "kampus",
+        "universitas", "kuliah", "beasiswa", "kurikulum", "belajar", "ujian", "honorer", "ukt",
+        "pesantren", "perpustakaan", "literasi",
+    ],
+    "Kesehatan": [
+        "kesehatan", "rumah sakit", "puskesmas", "dokter", "perawat", "bidan", "pasien", "obat",
+        "bpjs", "stunting", "gizi", "penyakit", "vaksin", "posyandu", "rawat inap", "klinik",
+    ],
+    "Infrastruktur": [
+        "infrastruktur", "jalan", "jembatan", "banjir", "tanggul", "drainase", "macet",
+        "kemacetan", "transportasi", "angkutan", "terminal", "pelabuhan", "bandara", "kereta",
+        "tol", "irigasi", "air bersih", "perumahan", "rusak", "longsor", "desa",
+    ],
+    "Pertanian": [
+        "pertanian", "petani", "pupuk", "sawah", "panen", "gabah", "beras", "benih", "padi",
+        "jagung", "irigasi", "hama", "bulog", "ternak", "peternak", "perkebunan", "sawit",
+    ],
+    "Kelautan": [
+        "kelautan", "nelayan", "ikan", "perikanan", "laut", "pesisir", "kapal", "illegal fishing",
+        "tambak", "rumput laut", "terumbu karang", "abrasi", "solar nelayan",
+    ],
+    "Energi": [
+        "energi", "listrik", "pln", "pemadaman", "bbm", "bensin", "solar", "gas", "elpiji",
+        "lpg", "tambang", "batubara", "minyak", "migas", "panel surya", "tarif listrik",
+    ],
+    "Hukum": [
+        "hukum", "polisi", "kepolisian", "jaksa", "pengadilan", "hakim", "korupsi", "pungli",
+        "kriminal", "kejahatan", "narkoba", "penipuan", "keadilan", "ham", "pelanggaran",
+        "undang undang", "regulasi", "penjara",
+    ],
+    "Teknologi": [
+        "teknologi", "internet", "sinyal", "digital", "aplikasi", "data pribadi", "siber",
+        "hoaks", "komputer", "inovasi", "riset", "startup", "telekomunikasi", "jaringan",
+    ],
+    "Sosial": [
+        "sosial", "bansos", "bantuan sosial", "kemiskinan", "miskin", "lansia", "disabilitas",
+        "anak terlantar", "perempuan", "kekerasan", "pkh", "agama", "masjid", "haji", "panti",
+    ],
+    "Lingkungan": [
+        "lingkungan", "sampah", "polusi", "pencemaran", "limbah", "hutan", "deforestasi",
+        "kebakaran hutan", "kabut asap", "asap", "sungai", "udara", "iklim", "reboisasi",
+        "tambang ilegal", "emisi",
+    ],
+    "Pertahanan": [
+        "pertahanan", "tni", "militer", "tentara", "perbatasan", "kedaulatan", "alutsista",
+        "keamanan negara", "intelijen", "wilayah perbatasan",
+    ],
+    "Keuangan": [
+        "keuangan", "pajak", "anggaran", "apbn", "bank", "pinjol", "pinjaman online", "utang",
+        "rupiah", "suku bunga", "ojk", "asuransi", "dana desa", "subsidi",
+    ],
+    "Industri": [
+        "industri", "pabrik", "manufaktur", "buruh pabrik", "produksi", "kawasan industri",
+        "ekonomi kreatif", "hilirisasi", "tekstil",
+    ],
+    "Perdagangan": [
+        "perdagangan", "impor", "ekspor", "harga barang", "sembako", "pasar tradisional",
+        "minimarket", "monopoli", "persaingan usaha", "konsumen", "barang",
+    ],
+    "Pariwisata": [
+        "pariwisata", "wisata", "wisatawan", "turis", "destinasi", "hotel", "objek wisata",
+        "budaya", "festival", "kuliner",
+    ],
+}
+
+
 def get_relevant_komisi(category: str) -> List[str]:
     """
     Get the list of relevant Komisi for a given aspiration category.
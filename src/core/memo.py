@@ -0,0 +1,123 @@
+"""
+Member-level memo of absorb responses.
+
+An absorb response depends only on the member's profile, the aspiration's
+prompt context (content, category, source, priority) and the absorb prompt
+and models. Keyed by those, a response can be reused when the same
+aspiration is run again with a larger sample size or another commission
+filter: only members not asked before are called, and earlier answers are
+spliced into the run before the compile stage.
+
+Reused responses cost nothing in the run that reuses them (``cost_usd`` is
+0, ``dari_memo`` is set and ``biaya_asli_usd`` keeps the original cost).
+Concurrent runs asking the same member about the same aspiration share one
+call. Error responses are never kept.
+"""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from ..config import settings
+from ..models import AbsorpsiResponse, Aspirasi, DPRMember
+from .metrics import metrics
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def member_hash(member: DPRMember) -> str:
+    """Hash of a member's full profile."""
+    return _digest(member.model_dump_json())
+
+
+def content_hash(aspirasi: Aspirasi) -> str:
+    """Hash of what the absorb prompts see of an aspiration (not its id or timestamp)."""
+    return _digest(aspirasi.to_prompt_context())
+
+
+class AbsorbMemo:
+    """Bounded LRU of absorb responses, with in-flight calls shared."""
+
+    def __init__(self, max_entries: int | None = None):
+        """
+        Args:
+            max_entries: Maximum memoized responses (defaults to settings)
+        """
+        self.max_entries = max_entries or settings.absorb_memo_max_entries
+        self._responses: "OrderedDict[Hashable, AbsorpsiResponse]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(
+        member: DPRMember, aspirasi: Aspirasi, prompt_version: str, prior_relevance: Optional[str] = None
+    ) -> Tuple[str, str, str, Optional[str]]:
+        """Memo key of one member's absorb call for an aspiration."""
+        return (member_hash(member), content_hash(aspirasi), prompt_version, prior_relevance)
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def _reuse(self, response: AbsorpsiResponse, aspirasi_id: int) -> AbsorpsiResponse:
+        return response.model_copy(
+            update={
+                "aspirasi_id": aspirasi_id,
+                "cost_usd": 0.0,
+                "triage_cost_usd": 0.0,
+                "dari_memo": True,
+                "biaya_asli_usd": response.cost_usd,
+            }
+        )
+
+    def _store(self, key: Hashable, response: AbsorpsiResponse) -> None:
+        self._responses[key] = response
+        self._responses.move_to_end(key)
+        while len(self._responses) > self.max_entries:
+            self._responses.popitem(last=False)
+
+    async def get_or_call(
+        self, key: Hashable, aspirasi_id: int, call: Callable[[], Awaitable[AbsorpsiResponse]]
+    ) -> AbsorpsiResponse:
+        """
+        The memoized response for ``key``, or the result of ``call``.
+
+        Args:
+            key: Memo key (see ``key``)
+            aspirasi_id: Aspiration the returned response is for
+            call: Makes the absorb call on a miss
+
+        Returns:
+            A fresh response, or a reused one (cost 0, ``dari_memo`` set)
+        """
+        response = self._responses.get(key)
+        if response is not None:
+            self._responses.move_to_end(key)
+        else:
+            future = self._in_flight.get(key)
+            if future is not None and future.get_loop() is asyncio.get_running_loop():
+                # Failed or cancelled calls resolve to None; fall back to our own call
+                response = await asyncio.shield(future)
+        if response is not None:
+            self.hits += 1
+            metrics.record_cache("absorb_memo", True)
+            return self._reuse(response, aspirasi_id)
+
+        self.misses += 1
+        metrics.record_cache("absorb_memo", False)
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        response = None
+        try:
+            response = await call()
+            return response
+        finally:
+            kept = response if response is not None and response.error is None else None
+            if kept is not None:
+                self._store(key, kept)
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            future.set_result(kept)
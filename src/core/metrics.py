@@ -0,0 +1,341 @@
+"""
+Lightweight in-process metrics for DPR AI Simulator.
+
+Records stage and LLM-call latency histograms, token and cost counters,
+error/retry counts by cause, in-flight call gauges and cache hit rates.
+Metrics can be exported in Prometheus text format (optionally served from a
+local HTTP endpoint) or as a JSON snapshot for the CLI.
+"""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Optional[Dict[str, str]] = None) -> str:
+    pairs = list(key) + sorted((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, Any] = {}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def to_prometheus(self) -> List[str]:
+        lines = self._header()
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [{"labels": dict(key), "value": value} for key, value in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram (Prometheus semantics)."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["buckets"][i] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the wall-clock duration of the enclosed block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _quantile(self, state: Dict[str, Any], q: float) -> float:
+        """Estimate a quantile from bucket counts (upper bound of the bucket)."""
+        target = q * state["count"]
+        cumulative = 0
+        for bound, count in zip(self.buckets, state["buckets"]):
+            cumulative += count
+            if cumulative >= target and count:
+                return bound
+        return self.buckets[-2] if len(self.buckets) > 1 else 0.0
+
+    def to_prometheus(self) -> List[str]:
+        lines = self._header()
+        for key, state in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, state["buckets"]):
+                cumulative += count
+                le = "+Inf" if math.isinf(bound) else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(key, {'le': le})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(state['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {state['count']}")
+        return lines
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        result = []
+        for key, state in sorted(self._values.items()):
+            count = state["count"]
+            result.append(
+                {
+                    "labels": dict(key),
+                    "count": count,
+                    "sum": state["sum"],
+                    "mean": state["sum"] / count if count else 0.0,
+                    "p50": self._quantile(state, 0.5),
+                    "p95": self._quantile(state, 0.95),
+                    "p99": self._quantile(state, 0.99),
+                }
+            )
+        return result
+
+
+class MetricsRegistry:
+    """Registry of all simulator metrics with Prometheus and JSON export."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+        self.stage_latency = self.histogram(
+            "dpr_stage_latency_seconds", "Latency of pipeline stages in seconds"
+        )
+        self.llm_latency = self.histogram(
+            "dpr_llm_call_latency_seconds", "Latency of individual LLM calls in seconds"
+        )
+        self.llm_calls = self.counter("dpr_llm_calls_total", "LLM calls by agent and outcome")
+        self.llm_tokens = self.counter(
+            "dpr_llm_tokens_total", "LLM tokens by agent and kind (prompt/completion/cached)"
+        )
+        self.llm_cost = self.counter("dpr_llm_cost_usd_total", "LLM cost in USD by agent")
+        self.llm_errors = self.counter("dpr_llm_errors_total", "LLM errors by agent and cause")
+        self.llm_retries = self.counter("dpr_llm_retries_total", "LLM retries by agent and cause")
+        self.llm_inflight = self.gauge("dpr_llm_inflight_calls", "LLM calls currently in flight")
+        self.endpoint_requests = self.counter(
+            "dpr_llm_endpoint_requests_total", "LLM requests by endpoint and outcome"
+        )
+        self.endpoint_outstanding = self.gauge(
+            "dpr_llm_endpoint_outstanding", "LLM requests currently outstanding per endpoint"
+        )
+        self.endpoint_healthy = self.gauge(
+            "dpr_llm_endpoint_healthy", "1 if the endpoint is in rotation, 0 if ejected"
+        )
+        self.endpoint_ejections = self.counter(
+            "dpr_llm_endpoint_ejections_total", "Endpoint ejections after consecutive failures"
+        )
+        self.endpoint_tokens = self.counter(
+            "dpr_llm_endpoint_tokens_total", "LLM tokens used per endpoint (API key)"
+        )
+        self.endpoint_cooldowns = self.counter(
+            "dpr_llm_endpoint_cooldowns_total", "Times an endpoint (API key) was throttled into cooldown"
+        )
+        self.absorb_cascade = self.counter(
+            "dpr_absorb_cascade_total", "Cascade triage decisions (escalated/skipped)"
+        )
+        self.absorb_group_items = self.counter(
+            "dpr_absorb_group_items_total",
+            "Aspirations in grouped absorb calls by outcome (ok/invalid/missing/call_failed)",
+        )
+        self.absorb_prescoring = self.counter(
+            "dpr_absorb_prescoring_total", "Rule-based relevance decisions (templated/known/ambiguous)"
+        )
+        self.store_writes = self.counter(
+            "dpr_result_store_writes_total", "Pipeline results written to the result store by outcome"
+        )
+        self.cache_requests = self.counter(
+            "dpr_cache_requests_total", "Cache lookups by cache and result (hit/miss)"
+        )
+        self.pipeline_runs = self.counter("dpr_pipeline_runs_total", "Completed pipeline runs")
+        self.pipeline_cancelled = self.counter(
+            "dpr_pipeline_cancelled_total", "Pipeline runs cancelled before completing, by stage"
+        )
+        self.pipeline_cancelled_cost = self.counter(
+            "dpr_pipeline_cancelled_cost_usd_total", "Cost of the LLM calls completed by cancelled runs in USD"
+        )
+        self.pipeline_cost = self.gauge(
+            "dpr_last_pipeline_cost_usd", "Total cost of the most recent pipeline run in USD"
+        )
+
+    def _register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(Counter(name, help_text))
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._register(Gauge(name, help_text))
+
+    def histogram(
+        self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets))
+
+    def stage(self, stage: str):
+        """Context manager timing one pipeline stage."""
+        return self.stage_latency.time(stage=stage)
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        """Record one cache lookup."""
+        self.cache_requests.inc(cache=cache, result="hit" if hit else "miss")
+
+    def cache_hit_rates(self) -> Dict[str, float]:
+        """Return hit rate per cache name."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for entry in self.cache_requests.snapshot():
+            labels = entry["labels"]
+            totals.setdefault(labels["cache"], {"hit": 0.0, "miss": 0.0})[labels["result"]] += entry["value"]
+        return {
+            cache: counts["hit"] / (counts["hit"] + counts["miss"])
+            for cache, counts in totals.items()
+            if counts["hit"] + counts["miss"]
+        }
+
+    def reset(self) -> None:
+        """Clear all recorded values."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.to_prometheus())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all metrics as a JSON-serializable dict."""
+        data: Dict[str, Any] = {
+            name: {"type": metric.type_name, "help": metric.help, "values": metric.snapshot()}
+            for name, metric in self._metrics.items()
+        }
+        data["cache_hit_rates"] = self.cache_hit_rates()
+        return data
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent, ensure_ascii=False)
+
+
+metrics = MetricsRegistry()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = metrics
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.rstrip("/") in ("", "/metrics"):
+            body = self.registry.to_prometheus().encode()
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.rstrip("/") == "/metrics.json":
+            body = self.registry.to_json().encode()
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def start_metrics_server(
+    port: int, host: str = "127.0.0.1", registry: MetricsRegistry = metrics
+) -> ThreadingHTTPServer:
+    """
+    Serve /metrics (Prometheus text) and /metrics.json from a daemon thread.
+
+    Args:
+        port: Port to listen on (0 picks a free port)
+        host: Interface to bind
+        registry: Registry to export
+
+    Returns:
+        The running server (call shutdown() to stop it)
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, name="dpr-metrics", daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,304 @@
+"""
+Profiling mode for pipeline runs.
+
+When ``settings.profile_mode`` is set, ``DPRSimulator.process_aspirasi`` wraps
+the run in a ``PipelineProfiler``:
+
+- ``sampling``: a background thread samples the event-loop thread's stack and
+  writes one folded-stack file per stage (``cpu/<stage>.folded``) plus
+  ``cpu/all.folded`` with the stage as root frame. Folded stacks load directly
+  into flamegraph.pl or speedscope.
+- ``deterministic``: a ``cProfile`` profile per stage, written as pstats
+  (``cpu/<stage>.prof``, for snakeviz/flameprof) and a text summary.
+
+In both modes ``tracemalloc`` measures the named sections instrumented with
+``profile_section`` (prompt building, parsing, aggregation and UI table
+building): allocated bytes and peak per call, plus snapshot dumps of the first
+occurrences under ``memory/`` and a ``memory.txt`` report.
+
+Only one run is profiled at a time; runs started while a profiler is active
+are not profiled, though their sections still count toward the active one.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from ..config import settings
+
+
+PROFILE_MODES = ("sampling", "deterministic")
+
+# Leave the profiler's own bookkeeping out of allocation snapshots
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+]
+
+
+class _SectionStats:
+    """Allocation statistics of one instrumented section."""
+
+    __slots__ = ("calls", "allocated", "peak", "diffs")
+
+    def __init__(self):
+        self.calls = 0
+        self.allocated = 0
+        self.peak = 0
+        self.diffs: List[List[tracemalloc.StatisticDiff]] = []
+
+
+class PipelineProfiler:
+    """CPU profiles per stage and allocation statistics per section for one run."""
+
+    def __init__(
+        self,
+        output_dir: str | Path,
+        mode: str = "sampling",
+        interval: float | None = None,
+        memory_snapshots: int | None = None,
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            output_dir: Directory the profiles are written to
+            mode: "sampling" or "deterministic"
+            interval: Sampling interval in seconds (defaults to settings)
+            memory_snapshots: Snapshot pairs dumped per section (defaults to settings)
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}, expected one of {PROFILE_MODES}")
+        self.output_dir = Path(output_dir)
+        self.mode = mode
+        self.interval = interval or settings.profile_interval
+        self.memory_snapshots = (
+            settings.profile_memory_snapshots if memory_snapshots is None else memory_snapshots
+        )
+
+        self.current_stage = "other"
+        self.samples: Dict[str, Counter] = defaultdict(Counter)
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.sections: Dict[str, _SectionStats] = defaultdict(_SectionStats)
+        self.snapshot_files: List[Path] = []
+
+        self._thread_id: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started_tracemalloc = False
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start tracing allocations and, in sampling mode, the sampler thread."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        if self.mode == "sampling":
+            self._thread_id = threading.get_ident()
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name="dpr-profiler", daemon=True)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop the sampler and allocation tracing started by this profiler."""
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # ------------------------------------------------------------------
+    # CPU
+    # ------------------------------------------------------------------
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.samples[self.current_stage][";".join(reversed(stack))] += 1
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Attribute CPU time spent in the enclosed block to a stage."""
+        previous = self.current_stage
+        self.current_stage = name
+        profile = None
+        if self.mode == "deterministic":
+            profile = self.profiles.setdefault(name, cProfile.Profile())
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            self.current_stage = previous
+
+    # ------------------------------------------------------------------
+    # Memory
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Measure allocations of a synchronous block with tracemalloc."""
+        if not tracemalloc.is_tracing():
+            yield
+            return
+
+        stats = self.sections[name]
+        take_snapshot = len(stats.diffs) < self.memory_snapshots
+        before_snapshot = tracemalloc.take_snapshot() if take_snapshot else None
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            stats.calls += 1
+            stats.allocated += max(0, current - before)
+            stats.peak = max(stats.peak, peak - before)
+            if before_snapshot is not None:
+                after_snapshot = tracemalloc.take_snapshot()
+                before_snapshot, after_snapshot = (
+                    snap.filter_traces(_SNAPSHOT_FILTERS) for snap in (before_snapshot, after_snapshot)
+                )
+                stats.diffs.append(after_snapshot.compare_to(before_snapshot, "lineno")[:15])
+                self._dump_snapshots(name, len(stats.diffs), before_snapshot, after_snapshot)
+
+    def _dump_snapshots(
+        self, name: str, index: int, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot
+    ) -> None:
+        directory = self.output_dir / "memory"
+        directory.mkdir(parents=True, exist_ok=True)
+        for label, snapshot in (("before", before), ("after", after)):
+            path = directory / f"{name}-{index}-{label}.tracemalloc"
+            snapshot.dump(str(path))
+            self.snapshot_files.append(path)
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def memory_report(self) -> str:
+        """Per-section allocation summary, largest peak first."""
+        lines = [f"{'section':<16} {'calls':>7} {'alloc/call':>12} {'peak':>12}"]
+        for name, stats in sorted(self.sections.items(), key=lambda kv: kv[1].peak, reverse=True):
+            per_call = stats.allocated / stats.calls if stats.calls else 0
+            lines.append(f"{name:<16} {stats.calls:>7} {per_call / 1024:>10.1f}KB {stats.peak / 1024:>10.1f}KB")
+
+        for name, stats in self.sections.items():
+            for index, diff in enumerate(stats.diffs, 1):
+                lines.append("")
+                lines.append(f"[{name} #{index}] top allocations")
+                lines.extend(f"  {d}" for d in diff)
+        return "\n".join(lines)
+
+    def write(self) -> List[Path]:
+        """
+        Write CPU profiles and the memory report to the output directory.
+
+        Returns:
+            Paths of all written files
+        """
+        cpu_dir = self.output_dir / "cpu"
+        cpu_dir.mkdir(parents=True, exist_ok=True)
+        written: List[Path] = []
+
+        if self.mode == "sampling":
+            combined = []
+            for stage_name, stacks in self.samples.items():
+                lines = [f"{stack} {count}" for stack, count in stacks.most_common()]
+                combined.extend(f"{stage_name};{line}" for line in lines)
+                path = cpu_dir / f"{stage_name}.folded"
+                path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+                written.append(path)
+            path = cpu_dir / "all.folded"
+            path.write_text("\n".join(combined) + "\n", encoding="utf-8")
+            written.append(path)
+        else:
+            for stage_name, profile in self.profiles.items():
+                path = cpu_dir / f"{stage_name}.prof"
+                profile.dump_stats(str(path))
+                written.append(path)
+
+                summary = io.StringIO()
+                pstats.Stats(profile, stream=summary).sort_stats("cumulative").print_stats(40)
+                path = cpu_dir / f"{stage_name}.txt"
+                path.write_text(summary.getvalue(), encoding="utf-8")
+                written.append(path)
+
+        path = self.output_dir / "memory.txt"
+        path.write_text(self.memory_report() + "\n", encoding="utf-8")
+        written.append(path)
+        return written + self.snapshot_files
+
+
+_active: Optional[PipelineProfiler] = None
+# True inside the run that owns the active profiler, so concurrent runs don't claim its stages
+_owner: ContextVar[bool] = ContextVar("dpr_profile_owner", default=False)
+
+
+@contextmanager
+def profile_run(run_id: str) -> Iterator[Optional[PipelineProfiler]]:
+    """
+    Profile the enclosed run when ``settings.profile_mode`` is set.
+
+    Profiles are written to ``<settings.profile_dir>/<run_id>/`` when the run
+    ends. Yields None when profiling is disabled or another run is profiled.
+    """
+    global _active
+    if not settings.profile_mode or _active is not None:
+        yield None
+        return
+
+    profiler = PipelineProfiler(Path(settings.profile_dir) / run_id, settings.profile_mode)
+    _active = profiler
+    token = _owner.set(True)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _owner.reset(token)
+        _active = None
+        profiler.write()
+
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[None]:
+    """Attribute CPU time to a stage of the profiled run (no-op otherwise)."""
+    if _active is None or not _owner.get():
+        yield
+        return
+    with _active.stage(name):
+        yield
+
+
+@contextmanager
+def profile_section(name: str) -> Iterator[None]:
+    """Measure allocations of a section while a run is profiled (no-op otherwise)."""
+    if _active is None:
+        yield
+        return
+    with _active.section(name):
+        yield
@@ -0,0 +1,143 @@
+"""
+Rule-based relevance pre-scoring of members for an aspiration.
+
+The absorb prompt already tells the model how to rate relevance: Tinggi
+when the aspiration falls within the member's commission or comes from
+their electoral region, Rendah when neither applies. Most of those facts
+are known locally (``CATEGORY_TO_KOMISI``, ``KOMISI_INFO``, the member's
+province and expertise), so they can be scored without an LLM call.
+
+With ``settings.relevance_prescoring`` the simulator gives members that are
+certainly irrelevant a templated response instead of calling the agent.
+Members that are certainly relevant still need their persona response, but
+skip the cascade triage; only ambiguous members are left for the model to
+rate.
+
+The default selection only samples the responsible commissions, whose
+members are all certainly relevant. With prescoring, ``select_members``
+fills the rest of the sample from the whole roster by prior, so a sample
+larger than the commissions also counts region and expertise members, and
+members the rules rule out are answered by template at no cost.
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+from ..models import AbsorpsiResponse, Aspirasi, DPRMember
+from .komisi_data import CATEGORY_TO_KOMISI, get_komisi_scope, get_relevant_komisi
+from .member_factory import DPRMemberFactory
+
+
+# Short names of provinces as they appear in aspiration sources
+PROVINCE_ALIASES: Dict[str, str] = {
+    "yogyakarta": "daerah istimewa yogyakarta",
+    "diy": "daerah istimewa yogyakarta",
+    "jakarta": "dki jakarta",
+}
+
+
+def _province_key(name: str) -> str:
+    key = " ".join(name.split()).casefold()
+    return PROVINCE_ALIASES.get(key, key)
+
+
+def same_province(province: str, source: str) -> bool:
+    """Whether an aspiration source names the member's province.
+
+    Names are compared whole, so "Papua" does not match "Papua Barat".
+    """
+    return bool(province) and _province_key(province) == _province_key(source)
+
+
+class RelevancePrior(NamedTuple):
+    """Relevance of one member as scored by the rules."""
+
+    relevansi: str
+    certain: bool
+    alasan: str
+
+
+def score_relevance(
+    member: DPRMember,
+    category: str,
+    source: str,
+    komisi_filter: Optional[str] = None,
+) -> RelevancePrior:
+    """
+    Score a member's relevance for an aspiration from commission, region and expertise.
+
+    Args:
+        member: The DPR member
+        category: Category of the aspiration
+        source: Source region of the aspiration
+        komisi_filter: Optional explicit commission filter
+
+    Returns:
+        The prior; ``certain`` is False when the rules cannot decide
+    """
+    # Unmapped categories resolve to every commission, which decides nothing
+    mapped = bool(komisi_filter) or category in CATEGORY_TO_KOMISI
+    target_komisi = [komisi_filter] if komisi_filter else get_relevant_komisi(category)
+
+    if mapped and member.komisi in target_komisi:
+        scope = ", ".join(get_komisi_scope(member.komisi))
+        return RelevancePrior("Tinggi", True, f"Aspirasi masuk lingkup {member.komisi} ({scope})")
+
+    if same_province(member.province, source):
+        return RelevancePrior("Tinggi", True, f"Aspirasi berasal dari dapil anggota ({member.province})")
+
+    if not mapped:
+        return RelevancePrior("Sedang", False, "Kategori aspirasi tidak terpetakan ke komisi")
+
+    if category in member.expertise:
+        return RelevancePrior("Sedang", False, f"Di luar komisi dan dapil, tetapi sesuai keahlian ({category})")
+
+    return RelevancePrior("Rendah", True, f"Di luar lingkup {member.komisi} dan dapil anggota")
+
+
+# Order in which members outside the target commissions fill a sample
+_FILL_ORDER = {"Tinggi": 0, "Sedang": 1, "Rendah": 2}
+
+
+def select_members(
+    members: List[DPRMember],
+    category: str,
+    source: str,
+    komisi_filter: Optional[str] = None,
+    limit: int = 50,
+) -> List[DPRMember]:
+    """
+    Select members like ``DPRMemberFactory.get_relevant_members``, then fill
+    the sample from the rest of the roster by rule prior.
+
+    Members from the source province come first, then expertise matches,
+    then members the rules rate certainly irrelevant (who get a templated
+    response instead of a call).
+
+    Args:
+        members: List of all DPR members
+        category: Category of the aspiration
+        source: Source region of the aspiration
+        komisi_filter: Optional explicit commission filter
+        limit: Maximum number of members to return
+
+    Returns:
+        Up to ``limit`` members, the relevant ones first
+    """
+    selected = DPRMemberFactory.get_relevant_members(members, category, source, komisi_filter, limit)
+    if len(selected) >= limit:
+        return selected
+    chosen = {m.id for m in selected}
+    rest = [m for m in members if m.id not in chosen]
+    rest.sort(key=lambda m: _FILL_ORDER[score_relevance(m, category, source, komisi_filter).relevansi])
+    return selected + rest[: limit - len(selected)]
+
+
+def templated_response(member: DPRMember, aspirasi: Aspirasi, prior: RelevancePrior) -> AbsorpsiResponse:
+    """Response for a member whose relevance the rules decided, without an LLM call."""
+    return AbsorpsiResponse(
+        member_id=member.id,
+        aspirasi_id=aspirasi.id,
+        relevansi=prior.relevansi,
+        alasan_relevansi=prior.alasan,
+        tier="rules",
+    )
@@ -0,0 +1,378 @@
+"""
+Routing of LLM calls across a pool of OpenAI-compatible endpoints and API keys.
+
+Each call is sent to the healthy endpoint with the fewest outstanding
+requests relative to its weight, respecting per-endpoint concurrency limits
+and requests/tokens-per-minute budgets (callers wait for a free slot or for
+budget to refill when every endpoint is saturated). An API key pool is a
+set of endpoints that differ only in their key, so bulk runs spread over
+every key's quota.
+
+Endpoints that fail ``llm_endpoint_failure_threshold`` times in a row with
+transient errors are ejected for ``llm_endpoint_ejection_seconds``; ejected
+endpoints are probed in the background and put back as soon as a probe
+succeeds. When every endpoint is ejected the router fails open to the one
+whose ejection ends first, so a single-endpoint pool never blocks.
+Throttled endpoints (HTTP 429) are not ejected but cool down for the
+Retry-After period.
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from ..config import settings
+from ..models import LLMEndpoint
+from .backends import LLMBackend, create_backend, is_rate_limited, retryable_errors
+from .metrics import metrics
+
+
+def split_api_keys(api_key: str) -> List[str]:
+    """Split a comma-separated list of API keys."""
+    return [key.strip() for key in api_key.split(",") if key.strip()]
+
+
+def estimate_tokens(messages: List[Dict[str, str]]) -> int:
+    """Rough token estimate of a request (4 characters per prompt token plus the completion)."""
+    prompt_chars = sum(len(m.get("content", "")) for m in messages)
+    return prompt_chars // 4 + settings.llm_completion_token_estimate
+
+
+class _Budget:
+    """
+    Per-minute budget as a continuously refilling bucket.
+
+    The bucket holds at most one second of budget, matching how per-minute
+    API limits are enforced in short intervals. Takes may drive it negative
+    (a large request borrows from the next seconds); it admits new work
+    again once the level is back above ``need``.
+    """
+
+    __slots__ = ("rate", "capacity", "level", "updated")
+
+    def __init__(self, per_minute: int):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float, need: float) -> float:
+        """Seconds until ``need`` units are available (0 if available now)."""
+        self._refill(now)
+        if self.level >= need:
+            return 0.0
+        return (need - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+
+class Endpoint:
+    """Runtime state of one endpoint (or API key) in the pool."""
+
+    def __init__(self, config: LLMEndpoint, backend: LLMBackend):
+        self.config = config
+        self.name = config.name
+        self.backend = backend
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.throttled = 0
+        self.tokens = 0
+        self.request_budget = _Budget(config.rpm) if config.rpm else None
+        self.token_budget = _Budget(config.tpm) if config.tpm else None
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+    @property
+    def has_capacity(self) -> bool:
+        limit = self.config.max_concurrency
+        return not limit or self.outstanding < limit
+
+    def ready_in(self, now: float) -> float:
+        """Seconds until cooldown and rate budgets admit one more call."""
+        wait = max(0.0, self.cooldown_until - now)
+        if self.request_budget is not None:
+            wait = max(wait, self.request_budget.wait_time(now, 1.0))
+        if self.token_budget is not None:
+            # Admit while the token bucket is positive; the reservation may overdraw it
+            wait = max(wait, self.token_budget.wait_time(now, 1.0))
+        return wait
+
+    def load(self) -> float:
+        """Weighted outstanding requests if one more call were sent here."""
+        return (self.outstanding + 1) / self.config.weight
+
+
+class EndpointRouter:
+    """Least-outstanding-requests router with rate budgets and health checks."""
+
+    def __init__(
+        self,
+        endpoints: List[LLMEndpoint],
+        backend: str | None = None,
+        model: str | None = None,
+        api_key: str | None = None,
+        temperature: float = 0.7,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            endpoints: Endpoint configurations (at least one)
+            backend: LLM backend name for every endpoint (defaults to settings)
+            model: Model for endpoints that don't set one (defaults to settings)
+            api_key: API key for endpoints that don't set one (defaults to settings)
+            temperature: Sampling temperature
+        """
+        if not endpoints:
+            raise ValueError("EndpointRouter needs at least one endpoint")
+        backend = backend or settings.llm_backend
+        model = model or settings.openai_model
+        api_key = api_key or settings.openai_api_key
+
+        self.endpoints: List[Endpoint] = []
+        for config in endpoints:
+            client = create_backend(
+                backend,
+                config.model or model,
+                config.api_key or api_key,
+                temperature,
+                base_url=config.base_url,
+            )
+            self.endpoints.append(Endpoint(config, client))
+            metrics.endpoint_healthy.set(1, endpoint=config.name)
+
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_health_check = 0.0
+        self._health_tasks: Set[asyncio.Task] = set()
+
+    @classmethod
+    def from_settings(
+        cls,
+        api_key: str | None = None,
+        model: str | None = None,
+        backend: str | None = None,
+        temperature: float = 0.7,
+    ) -> "EndpointRouter":
+        """
+        Build the router for ``settings.llm_endpoints``.
+
+        Without a configured pool, ``api_key`` (or the settings key) may hold
+        several comma-separated keys: each becomes an endpoint with the
+        ``llm_key_rpm``/``llm_key_tpm`` budgets. A single key gives a single
+        OpenAI endpoint.
+        """
+        if settings.llm_endpoints:
+            endpoints = settings.llm_endpoints
+        else:
+            keys = split_api_keys(api_key or settings.openai_api_key) or [""]
+            budgets = {"rpm": settings.llm_key_rpm, "tpm": settings.llm_key_tpm}
+            if len(keys) == 1:
+                endpoints = [LLMEndpoint(name="openai", api_key=keys[0], **budgets)]
+            else:
+                # Endpoint names never contain the key itself
+                endpoints = [
+                    LLMEndpoint(name=f"key-{i}", api_key=key, **budgets) for i, key in enumerate(keys, 1)
+                ]
+        if settings.cassette_mode == "replay":
+            # Replayed calls never reach an API, so no live backend is built
+            backend = "cassette"
+        return cls(endpoints, backend=backend, model=model, api_key=api_key, temperature=temperature)
+
+    # ------------------------------------------------------------------
+    # Selection
+    # ------------------------------------------------------------------
+
+    def _pick(self) -> Tuple[Optional[Endpoint], Optional[float]]:
+        """Return (endpoint, None), or (None, seconds to wait; None = until a release)."""
+        now = time.monotonic()
+        healthy = [e for e in self.endpoints if e.healthy]
+        if healthy:
+            # Wait for a healthy slot rather than spill over to ejected endpoints
+            candidates = [e for e in healthy if e.has_capacity]
+            if not candidates:
+                return None, None
+            waits = [e.ready_in(now) for e in candidates]
+            ready = [e for e, wait in zip(candidates, waits) if wait == 0.0]
+            if not ready:
+                return None, min(waits)
+            return min(ready, key=lambda e: (e.load(), random.random())), None
+
+        # Fail open: try the endpoint that comes back soonest
+        candidates = [e for e in self.endpoints if e.has_capacity]
+        if not candidates:
+            return None, None
+        return min(candidates, key=lambda e: e.ejected_until), None
+
+    async def acquire(self, tokens: int = 0) -> Endpoint:
+        """
+        Reserve a slot on the best endpoint, waiting while all are saturated.
+
+        Args:
+            tokens: Estimated tokens of the call, reserved against TPM budgets
+
+        Returns:
+            The endpoint to send the call to; pass it back to ``release``
+        """
+        self._maybe_check_health()
+        while True:
+            endpoint, delay = self._pick()
+            if endpoint is not None:
+                endpoint.outstanding += 1
+                endpoint.requests += 1
+                if endpoint.request_budget is not None:
+                    endpoint.request_budget.take(1)
+                if endpoint.token_budget is not None:
+                    endpoint.token_budget.take(tokens)
+                metrics.endpoint_outstanding.inc(endpoint=endpoint.name)
+                return endpoint
+
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                # Budgets refill with time, so wake up when the first one would admit a call
+                await asyncio.wait([waiter], timeout=delay)
+            except asyncio.CancelledError:
+                # Pass on a wake-up this waiter received but can no longer use
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_next()
+                raise
+            finally:
+                if not waiter.done():
+                    waiter.cancel()
+
+    def release(
+        self,
+        endpoint: Endpoint,
+        succeeded: bool,
+        error: Optional[BaseException] = None,
+        tokens: int = 0,
+        reserved_tokens: int = 0,
+    ) -> None:
+        """
+        Release a slot and update the endpoint's health and usage.
+
+        Args:
+            endpoint: Endpoint returned by ``acquire``
+            succeeded: Whether the call succeeded
+            error: The call's exception, if any; rate limiting puts the
+                endpoint in cooldown, other transient API errors count
+                toward ejection
+            tokens: Tokens actually used by the call
+            reserved_tokens: Tokens reserved in ``acquire``
+        """
+        endpoint.outstanding -= 1
+        metrics.endpoint_outstanding.dec(endpoint=endpoint.name)
+        if endpoint.token_budget is not None:
+            # Settle the reservation against actual usage (refunds unused tokens)
+            endpoint.token_budget.take(tokens - reserved_tokens)
+        if tokens:
+            endpoint.tokens += tokens
+            metrics.endpoint_tokens.inc(tokens, endpoint=endpoint.name)
+
+        if succeeded:
+            endpoint.consecutive_failures = 0
+            metrics.endpoint_requests.inc(endpoint=endpoint.name, outcome="ok")
+        elif is_rate_limited(error):
+            endpoint.throttled += 1
+            metrics.endpoint_requests.inc(endpoint=endpoint.name, outcome="throttled")
+            self._cool_down(endpoint, error)
+        elif error is not None and isinstance(error, retryable_errors()):
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            metrics.endpoint_requests.inc(endpoint=endpoint.name, outcome="failure")
+            if endpoint.consecutive_failures >= settings.llm_endpoint_failure_threshold and endpoint.healthy:
+                self._eject(endpoint)
+        else:
+            metrics.endpoint_requests.inc(endpoint=endpoint.name, outcome="error")
+
+        self._wake_next()
+
+    def _wake_next(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    # ------------------------------------------------------------------
+    # Health
+    # ------------------------------------------------------------------
+
+    def _cool_down(self, endpoint: Endpoint, error: BaseException) -> None:
+        seconds = settings.llm_key_cooldown_seconds
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            if headers.get("retry-after-ms"):
+                seconds = float(headers["retry-after-ms"]) / 1000
+            elif headers.get("retry-after"):
+                seconds = float(headers["retry-after"])
+        except ValueError:
+            pass
+        endpoint.cooldown_until = max(endpoint.cooldown_until, time.monotonic() + seconds)
+        metrics.endpoint_cooldowns.inc(endpoint=endpoint.name)
+
+    def _eject(self, endpoint: Endpoint) -> None:
+        endpoint.ejected_until = time.monotonic() + settings.llm_endpoint_ejection_seconds
+        metrics.endpoint_ejections.inc(endpoint=endpoint.name)
+        metrics.endpoint_healthy.set(0, endpoint=endpoint.name)
+
+    def _reinstate(self, endpoint: Endpoint) -> None:
+        endpoint.ejected_until = 0.0
+        endpoint.consecutive_failures = 0
+        metrics.endpoint_healthy.set(1, endpoint=endpoint.name)
+
+    def _maybe_check_health(self) -> None:
+        now = time.monotonic()
+        if now - self._last_health_check < settings.llm_health_check_interval:
+            return
+        self._last_health_check = now
+        for endpoint in self.endpoints:
+            metrics.endpoint_healthy.set(1 if endpoint.healthy else 0, endpoint=endpoint.name)
+        if any(not e.healthy for e in self.endpoints):
+            task = asyncio.get_running_loop().create_task(self.check_health())
+            self._health_tasks.add(task)
+            task.add_done_callback(self._health_tasks.discard)
+
+    async def check_health(self, timeout: float = 5.0) -> None:
+        """Probe ejected endpoints and put back those that respond."""
+        ejected = [e for e in self.endpoints if not e.healthy]
+        results = await asyncio.gather(
+            *(asyncio.wait_for(e.backend.probe(), timeout) for e in ejected),
+            return_exceptions=True,
+        )
+        for endpoint, result in zip(ejected, results):
+            if not isinstance(result, BaseException):
+                self._reinstate(endpoint)
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Current state and usage of every endpoint (for logs and debugging)."""
+        now = time.monotonic()
+        return [
+            {
+                "name": e.name,
+                "model": e.backend.model,
+                "healthy": e.healthy,
+                "ejected_for_s": max(0.0, e.ejected_until - now),
+                "cooldown_for_s": max(0.0, e.cooldown_until - now),
+                "outstanding": e.outstanding,
+                "requests": e.requests,
+                "tokens": e.tokens,
+                "failures": e.failures,
+                "throttled": e.throttled,
+            }
+            for e in self.endpoints
+        ]
@@ -1,7 +1,10 @@
 """Main DPR AI Simulator class orchestrating the pipeline."""
 
 import asyncio
-from typing import List, Optional, Callable
+import time
+from itertools import islice
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Sized, Tuple
 from datetime import datetime
 
 from ..config import settings
@@ -9,15 +12,82 @@ from ..models import (
     DPRMember,
     Aspirasi,
     AbsorpsiResponse,
-    KompilasiResponse,
     TindakLanjutResponse,
     SimulationDetails,
     PipelineResult,
+    PipelineTrace,
+    TraceSpan,
+    SweepPoint,
+    SweepResult,
 )
 from .member_factory import DPRMemberFactory
+from .analytics import aggregate_responses, representation
+from .metrics import metrics
+from .routing import EndpointRouter
+from .tracing import span, start_trace
+from .profiling import profile_run, profile_section, profile_stage
+from .classifier import AspirasiPrediction, classify_aspirasi
+from .dedup import DuplicateIndex
+from .memo import AbsorbMemo
+from .sinks import ListSink, ResultSink
+from .store import get_result_store
+from .relevance_rules import score_relevance, select_members, templated_response
 from .agents import AbsorbAgent, CompileAgent, FollowUpAgent
 
 
+@contextmanager
+def _stage(name: str) -> Iterator[TraceSpan]:
+    """Time a pipeline stage in the metrics registry, the run's trace and its profile."""
+    with metrics.stage(name), span(name, kind="stage") as current, profile_stage(name):
+        yield current
+
+
+def _cancel_pending(tasks: Iterable[asyncio.Future]) -> None:
+    """Cancel the tasks that have not finished yet."""
+    for task in tasks:
+        if not task.done():
+            task.cancel()
+
+
+def _group_call_spans(spans: List[TraceSpan], position: int, parent_id: str) -> List[TraceSpan]:
+    """
+    Copies of a group call's spans for the trace of the aspiration at ``position``.
+
+    The grouped call serves every aspiration of the group, so each trace
+    gets it with an even share of its cost (as the responses are priced);
+    a fallback single call only goes to its own aspiration's trace.
+    """
+    ids = {s.span_id for s in spans}
+    copies = []
+    for s in spans:
+        own = s.attributes.get("group_position")
+        if own is not None and own != position:
+            continue
+        update: Dict[str, object] = {}
+        if s.parent_id not in ids:
+            update["parent_id"] = parent_id
+        if own is None and s.attributes.get("group_size"):
+            update["cost_usd"] = s.cost_usd / s.attributes["group_size"]
+        copies.append(s.model_copy(update=update))
+    return copies
+
+
+def _record_cancelled(trace: PipelineTrace) -> float:
+    """Count a cancelled run by the stage it stopped in; return what its completed calls cost."""
+    stage = next(
+        (
+            s.name
+            for s in trace.spans
+            if s.kind == "stage" and s.error is not None and s.error.startswith("CancelledError")
+        ),
+        "pipeline",
+    )
+    spent = trace.llm_cost_usd()
+    metrics.pipeline_cancelled.inc(stage=stage)
+    metrics.pipeline_cancelled_cost.inc(spent)
+    return spent
+
+
 class DPRSimulator:
     """
     Main simulator class that orchestrates the DPR aspiration processing pipeline.
@@ -32,6 +102,12 @@ class DPRSimulator:
         self,
         api_key: Optional[str] = None,
         model: Optional[str] = None,
+        backend: Optional[str] = None,
+        absorb_mode: Optional[str] = None,
+        relevance_prescoring: Optional[bool] = None,
+        deduplicate: Optional[bool] = None,
+        result_store_path: Optional[str] = None,
+        memoize: Optional[bool] = None,
     ):
         """
         Initialize the DPR AI Simulator.
@@ -39,17 +115,45 @@ class DPRSimulator:
         Args:
             api_key: OpenAI API key (defaults to settings)
             model: OpenAI model name (defaults to settings)
+            backend: LLM backend, "langchain" or "openai" (defaults to settings)
+            absorb_mode: Absorb stage, "single" or "cascade" (defaults to settings)
+            relevance_prescoring: Score relevance with local rules before the
+                agent (defaults to settings)
+            deduplicate: Reuse results of near-duplicate aspirations (defaults to settings)
+            result_store_path: SQLite file results are saved to, "" to disable
+                (defaults to settings)
+            memoize: Reuse absorb responses of members already asked about
+                the same aspiration (defaults to settings)
         """
         self.api_key = api_key or settings.openai_api_key
         self.model = model or settings.openai_model
+        self.backend = backend or settings.llm_backend
+        self.relevance_prescoring = (
+            settings.relevance_prescoring if relevance_prescoring is None else relevance_prescoring
+        )
+
+        deduplicate = settings.dedup_enabled if deduplicate is None else deduplicate
+        self.duplicate_index: Optional[DuplicateIndex] = DuplicateIndex() if deduplicate else None
+
+        memoize = settings.absorb_memo_enabled if memoize is None else memoize
+        self.absorb_memo: Optional[AbsorbMemo] = AbsorbMemo() if memoize else None
+
+        # Results are saved to the store (opened on first save) when a path is set
+        self.result_store_path = settings.result_store_path if result_store_path is None else result_store_path
+
+        # One router for all agents, so endpoint load and health are tracked together
+        self.router = EndpointRouter.from_settings(self.api_key, self.model, self.backend)
 
         # Initialize agents
-        self.absorb_agent = AbsorbAgent(api_key=self.api_key, model=self.model)
-        self.compile_agent = CompileAgent(api_key=self.api_key, model=self.model)
-        self.followup_agent = FollowUpAgent(api_key=self.api_key, model=self.model)
+        self.absorb_agent = AbsorbAgent(
+            mode=absorb_mode, api_key=self.api_key, model=self.model, router=self.router
+        )
+        self.compile_agent = CompileAgent(api_key=self.api_key, model=self.model, router=self.router)
+        self.followup_agent = FollowUpAgent(api_key=self.api_key, model=self.model, router=self.router)
 
         # Initialize members
         self.members: List[DPRMember] = []
+        self.members_by_id: Dict[int, DPRMember] = {}
         self.aspirations: List[Aspirasi] = []
 
     def create_members(self, count: int = None) -> List[DPRMember]:
@@ -64,21 +168,72 @@ class DPRSimulator:
         """
         count = count or settings.default_member_count
         self.members = DPRMemberFactory.create_members(count)
+        self.members_by_id = {m.id: m for m in self.members}
         return self.members
 
     def add_aspirasi(self, aspirasi: Aspirasi) -> None:
         """Add a public aspiration to the system."""
         self.aspirations.append(aspirasi)
 
+    def _select_members(
+        self, aspirasi: Aspirasi, komisi_filter: Optional[str], sample_size: int
+    ) -> List[DPRMember]:
+        """Sample the members of an aspiration, filled beyond its commissions when prescoring."""
+        select = select_members if self.relevance_prescoring else DPRMemberFactory.get_relevant_members
+        return select(self.members, aspirasi.category, aspirasi.source, komisi_filter, sample_size)
+
+    async def _absorb_member(
+        self, member: DPRMember, aspirasi: Aspirasi, komisi_filter: Optional[str] = None
+    ) -> AbsorpsiResponse:
+        """Absorb for one member, answering from the relevance rules when they are certain."""
+        if not self.relevance_prescoring:
+            return await self._invoke_absorb(member, aspirasi)
+
+        prior = score_relevance(member, aspirasi.category, aspirasi.source, komisi_filter)
+        if not prior.certain:
+            metrics.absorb_prescoring.inc(decision="ambiguous")
+            return await self._invoke_absorb(member, aspirasi)
+        if prior.relevansi == "Rendah":
+            metrics.absorb_prescoring.inc(decision="templated")
+            return templated_response(member, aspirasi, prior)
+        metrics.absorb_prescoring.inc(decision="known")
+        return await self._invoke_absorb(member, aspirasi, prior.relevansi)
+
+    async def _invoke_absorb(
+        self, member: DPRMember, aspirasi: Aspirasi, prior_relevance: Optional[str] = None
+    ) -> AbsorpsiResponse:
+        """Call the absorb agent, or reuse the member's memoized answer to the same aspiration."""
+        if self.absorb_memo is None:
+            return await self.absorb_agent.invoke(member, aspirasi, prior_relevance)
+        key = AbsorbMemo.key(member, aspirasi, self.absorb_agent.prompt_version, prior_relevance)
+        return await self.absorb_memo.get_or_call(
+            key, aspirasi.id, lambda: self.absorb_agent.invoke(member, aspirasi, prior_relevance)
+        )
+
     async def _process_absorb_batch(
         self,
         members: List[DPRMember],
         aspirasi: Aspirasi,
-        progress_callback: Optional[Callable[[str], None]] = None,
+        response_callback: Optional[Callable[[AbsorpsiResponse], None]] = None,
+        komisi_filter: Optional[str] = None,
     ) -> List[AbsorpsiResponse]:
-        """Process a batch of members for the absorb stage."""
-        tasks = [self.absorb_agent.invoke(member, aspirasi) for member in members]
-        results = await asyncio.gather(*tasks)
+        """Process a batch of members for the absorb stage.
+
+        Responses are reported to ``response_callback`` as soon as each call
+        completes; the returned list keeps the member order of the batch.
+        """
+        tasks = [
+            asyncio.ensure_future(self._absorb_member(member, aspirasi, komisi_filter))
+            for member in members
+        ]
+        try:
+            if response_callback:
+                for next_done in asyncio.as_completed(tasks):
+                    response_callback(await next_done)
+            results = await asyncio.gather(*tasks)
+        finally:
+            # Cancelling the run aborts the calls still in flight
+            _cancel_pending(tasks)
         return list(results)
 
     async def process_aspirasi(
@@ -87,22 +242,172 @@ class DPRSimulator:
         sample_size: int = None,
         komisi_filter: Optional[str] = None,
         progress_callback: Optional[Callable[[str], None]] = None,
+        response_callback: Optional[Callable[[AbsorpsiResponse], None]] = None,
     ) -> PipelineResult:
         """
         Process a single aspiration through the complete pipeline.
 
+        With deduplication enabled, a near-duplicate of an in-flight or recent
+        aspiration (same category, source, sample size and commission filter)
+        waits for or reuses that run's result instead (``duplikat_dari`` is set).
+
         Args:
             aspirasi: The aspiration to process
             sample_size: Number of members to sample (defaults to settings)
             komisi_filter: Optional specific commission to filter by
             progress_callback: Optional callback for progress updates
+            response_callback: Optional callback invoked with each absorb response as it arrives
 
         Returns:
-            PipelineResult with complete processing results
+            PipelineResult with complete processing results (including its trace)
+        """
+        result = await self._process_deduplicated(
+            aspirasi, sample_size, komisi_filter, progress_callback, response_callback
+        )
+        if self.result_store_path:
+            get_result_store(self.result_store_path).save(result)
+        return result
+
+    async def _process_deduplicated(
+        self,
+        aspirasi: Aspirasi,
+        sample_size: Optional[int],
+        komisi_filter: Optional[str],
+        progress_callback: Optional[Callable[[str], None]],
+        response_callback: Optional[Callable[[AbsorpsiResponse], None]],
+    ) -> PipelineResult:
+        """Run the pipeline, or reuse a near-duplicate's result when deduplication is enabled."""
+        if self.duplicate_index is None:
+            return await self._process_traced(
+                aspirasi, sample_size, komisi_filter, progress_callback, response_callback
+            )
+
+        index = self.duplicate_index
+        key = (aspirasi.category, aspirasi.source, sample_size or settings.default_member_count, komisi_filter)
+        signature = index.signature(aspirasi.content)
+        match = index.find(signature, key)
+        if match is not None:
+            entry, similarity = match
+            if progress_callback and entry.in_flight:
+                progress_callback(f"⏳ Aspirasi mirip #{entry.aspirasi_id} sedang diproses, menunggu hasilnya")
+            original = await entry.wait()
+            metrics.record_cache("aspirasi_dedup", original is not None)
+            if original is not None:
+                return self._reuse_result(original, aspirasi, similarity, progress_callback, response_callback)
+        else:
+            metrics.record_cache("aspirasi_dedup", False)
+
+        entry = index.add(aspirasi.id, signature, key)
+        result = None
+        try:
+            result = await self._process_traced(
+                aspirasi, sample_size, komisi_filter, progress_callback, response_callback
+            )
+            return result
+        finally:
+            entry.complete(result)
+            if result is None:
+                index.remove(entry)
+
+    def _reuse_result(
+        self,
+        original: PipelineResult,
+        aspirasi: Aspirasi,
+        similarity: float,
+        progress_callback: Optional[Callable[[str], None]],
+        response_callback: Optional[Callable[[AbsorpsiResponse], None]],
+    ) -> PipelineResult:
+        """Answer a near-duplicate aspiration with a copy of another aspiration's result.
+
+        The copy is rewritten like a memo hit: its responses are filed under
+        the new aspiration and cost nothing in this run (``dari_memo`` is
+        set, ``biaya_asli_usd`` keeps the original cost), the compile and
+        follow-up costs are zeroed, the analytics are recomputed and it
+        gets a trace of its own with a single ``pipeline`` span marked as
+        a reuse.
+        """
+        if progress_callback:
+            progress_callback(
+                f"♻️ Aspirasi mirip ({similarity:.0%}) dengan aspirasi #{original.aspirasi.id}, "
+                f"hasilnya digunakan ulang tanpa panggilan LLM"
+            )
+        with start_trace() as tracer:
+            with span("pipeline", kind="pipeline", aspirasi_id=aspirasi.id, duplikat_dari=original.aspirasi.id):
+                responses = [
+                    r.model_copy(
+                        update={
+                            "aspirasi_id": aspirasi.id,
+                            "cost_usd": 0.0,
+                            "triage_cost_usd": 0.0,
+                            "dari_memo": True,
+                            "biaya_asli_usd": r.cost_usd + r.biaya_asli_usd,
+                        }
+                    )
+                    for r in original.tanggapan_anggota
+                ]
+                members = [
+                    self.members_by_id[i]
+                    for i in original.simulation_details.relevant_member_ids
+                    if i in self.members_by_id
+                ]
+                details = original.simulation_details.model_copy(update=self._absorb_savings(responses, aspirasi))
+                analytics = aggregate_responses(responses, members)
+        if response_callback:
+            for response in responses:
+                response_callback(response)
+        return original.model_copy(
+            update={
+                "aspirasi": aspirasi,
+                "tanggapan_anggota": responses,
+                "kompilasi": original.kompilasi.model_copy(update={"cost_usd": 0.0}),
+                "tindak_lanjut": original.tindak_lanjut.model_copy(update={"cost_usd": 0.0}),
+                "simulation_details": details,
+                "analytics": analytics,
+                "trace": tracer.to_trace(),
+                "duplikat_dari": original.aspirasi.id,
+                "kemiripan_duplikat": similarity,
+                "timestamp": datetime.now(),
+                "total_cost_usd": 0.0,
+            }
+        )
+
+    async def _process_traced(
+        self,
+        aspirasi: Aspirasi,
+        sample_size: Optional[int],
+        komisi_filter: Optional[str],
+        progress_callback: Optional[Callable[[str], None]],
+        response_callback: Optional[Callable[[AbsorpsiResponse], None]],
+    ) -> PipelineResult:
+        """Run the pipeline for one aspiration inside its trace and profile.
+
+        A cancelled run stops at the stage it is in: outstanding calls are
+        aborted, later stages are skipped and the cost of the calls it
+        completed is counted in the cancellation metrics.
         """
+        with start_trace() as tracer, profile_run(tracer.trace_id):
+            try:
+                with span("pipeline", kind="pipeline", aspirasi_id=aspirasi.id):
+                    result = await self._run_pipeline(
+                        aspirasi, sample_size, komisi_filter, progress_callback, response_callback
+                    )
+            except asyncio.CancelledError:
+                _record_cancelled(tracer.to_trace())
+                raise
+            result.trace = tracer.to_trace()
+        return result
+
+    async def _run_pipeline(
+        self,
+        aspirasi: Aspirasi,
+        sample_size: Optional[int],
+        komisi_filter: Optional[str],
+        progress_callback: Optional[Callable[[str], None]],
+        response_callback: Optional[Callable[[AbsorpsiResponse], None]],
+    ) -> PipelineResult:
+        """Run select, absorb, compile and follow-up stages for one aspiration."""
         sample_size = sample_size or settings.default_member_count
         batch_size = settings.batch_size
-        total_cost = 0.0
 
         def log(msg: str):
             if progress_callback:
@@ -110,38 +415,69 @@ class DPRSimulator:
 
         log(f"🔄 Aspirasi telah diterima, memproses aspirasi sekarang")
 
+        pipeline_start = time.perf_counter()
+        aspirasi, prediction = self._resolve_category(aspirasi, log)
+        komisi_filter = self._routing_filter(komisi_filter, prediction)
+
         # Get relevant members
-        relevant_members = DPRMemberFactory.get_relevant_members(
-            self.members, aspirasi.category, aspirasi.source, komisi_filter, sample_size
-        )
+        with _stage("select"):
+            relevant_members = self._select_members(aspirasi, komisi_filter, sample_size)
         log(f"📋 Ditemukan {len(relevant_members)} anggota relevan")
 
         # Step 1: Menyerap (Absorb)
         log(f"📥 Step 1: Menyerap aspirasi oleh {len(relevant_members)} anggota")
         all_responses: List[AbsorpsiResponse] = []
 
-        for i in range(0, len(relevant_members), batch_size):
-            batch = relevant_members[i : i + batch_size]
-            batch_responses = await self._process_absorb_batch(batch, aspirasi, progress_callback)
-            all_responses.extend(batch_responses)
-            total_cost += sum(r.cost_usd for r in batch_responses)
+        with _stage("absorb"):
+            for i in range(0, len(relevant_members), batch_size):
+                batch = relevant_members[i : i + batch_size]
+                batch_responses = await self._process_absorb_batch(
+                    batch, aspirasi, response_callback, komisi_filter
+                )
+                all_responses.extend(batch_responses)
 
-            # Rate limiting
-            if i + batch_size < len(relevant_members):
-                await asyncio.sleep(settings.rate_limit_delay)
+                # Rate limiting
+                if i + batch_size < len(relevant_members):
+                    await asyncio.sleep(settings.rate_limit_delay)
 
         log(f"✅ Step 1 selesai: {len(all_responses)} tanggapan dikumpulkan")
+        reused = sum(1 for r in all_responses if r.dari_memo)
+        if reused:
+            log(f"♻️ {reused} tanggapan digunakan ulang dari proses aspirasi yang sama sebelumnya")
+
+        return await self._finish_pipeline(
+            aspirasi, prediction, relevant_members, all_responses, sample_size, komisi_filter, log, pipeline_start
+        )
+
+    async def _finish_pipeline(
+        self,
+        aspirasi: Aspirasi,
+        prediction: Optional[AspirasiPrediction],
+        relevant_members: List[DPRMember],
+        all_responses: List[AbsorpsiResponse],
+        sample_size: int,
+        komisi_filter: Optional[str],
+        log: Callable[[str], None],
+        pipeline_start: float,
+        absorb_mode: Optional[str] = None,
+    ) -> PipelineResult:
+        """Run the compile and follow-up stages over the absorb responses and assemble the result."""
+        from .komisi_data import get_primary_komisi
+
+        total_cost = sum(r.cost_usd for r in all_responses)
 
         # Step 2: Menghimpun (Compile)
         log("📊 Step 2: Menghimpun tanggapan anggota")
-        kompilasi = await self.compile_agent.invoke(aspirasi, all_responses)
+        with _stage("compile"):
+            kompilasi = await self.compile_agent.invoke(aspirasi, all_responses)
         total_cost += kompilasi.cost_usd
         log(f"✅ Step 2 selesai: Status {kompilasi.status}")
 
         # Step 3: Menindaklanjuti (Follow-up)
         if kompilasi.status == "terkumpul":
             log("📝 Step 3: Menindaklanjuti dengan rencana aksi")
-            tindak_lanjut = await self.followup_agent.invoke(aspirasi, kompilasi)
+            with _stage("followup"):
+                tindak_lanjut = await self.followup_agent.invoke(aspirasi, kompilasi)
             total_cost += tindak_lanjut.cost_usd
             log("✅ Step 3 selesai")
         else:
@@ -157,45 +493,117 @@ class DPRSimulator:
 
         log(f"💰 Total biaya pemrosesan aspirasi: ${total_cost:.6f}")
 
-        # Calculate simulation details
-        relevansi_tinggi = sum(1 for r in all_responses if r.relevansi.lower() == "tinggi" and r.error is None)
-        relevansi_sedang = sum(1 for r in all_responses if r.relevansi.lower() == "sedang" and r.error is None)
-        relevansi_rendah = sum(1 for r in all_responses if r.relevansi.lower() == "rendah" and r.error is None)
-        
-        # Get unique factions and provinces from relevant members
-        fraksi_set = set(m.faction for m in relevant_members)
-        provinsi_set = set(m.province for m in relevant_members)
-        komisi_set = set(m.komisi for m in relevant_members)
+        # Calculate simulation details in one aggregation pass
+        with _stage("aggregate"), profile_section("aggregate"):
+            analytics = aggregate_responses(all_responses, relevant_members)
+            represented = representation(relevant_members)
 
         # Get primary commission
-        from .komisi_data import get_primary_komisi
-        komisi_utama = komisi_filter if komisi_filter else get_primary_komisi(aspirasi.category)
+        if komisi_filter:
+            komisi_utama = komisi_filter
+        elif prediction is not None and prediction.confident:
+            # Category detected but commission uncertain: routed to all of the category's commissions
+            komisi_utama = prediction.komisi
+        else:
+            komisi_utama = get_primary_komisi(aspirasi.category)
 
         simulation_details = SimulationDetails(
+            absorb_mode=absorb_mode or self.absorb_agent.mode,
+            **self._absorb_savings(all_responses, aspirasi),
             total_anggota_dpr=len(self.members),
             sample_size_requested=sample_size,
             anggota_relevan_terpilih=len(relevant_members),
-            anggota_merespons=len([r for r in all_responses if r.error is None]),
-            anggota_relevansi_tinggi=relevansi_tinggi,
-            anggota_relevansi_sedang=relevansi_sedang,
-            anggota_relevansi_rendah=relevansi_rendah,
-            fraksi_terwakili=sorted(list(fraksi_set)),
-            provinsi_terwakili=sorted(list(provinsi_set)),
-            komisi_terwakili=sorted(list(komisi_set)),
+            anggota_merespons=analytics.jumlah_tanggapan - analytics.jumlah_error,
+            anggota_relevansi_tinggi=analytics.relevansi_counts["Tinggi"],
+            anggota_relevansi_sedang=analytics.relevansi_counts["Sedang"],
+            anggota_relevansi_rendah=analytics.relevansi_counts["Rendah"],
+            fraksi_terwakili=represented["fraksi"],
+            provinsi_terwakili=represented["provinsi"],
+            komisi_terwakili=represented["komisi"],
             komisi_utama=komisi_utama,
+            kategori_otomatis=prediction is not None and prediction.confident,
+            skor_klasifikasi=prediction.score if prediction is not None else 0.0,
             relevant_member_ids=[m.id for m in relevant_members],
         )
 
+        metrics.stage_latency.observe(time.perf_counter() - pipeline_start, stage="pipeline")
+        metrics.pipeline_runs.inc()
+        metrics.pipeline_cost.set(total_cost)
+
         return PipelineResult(
             aspirasi=aspirasi,
             tanggapan_anggota=all_responses,
             kompilasi=kompilasi,
             tindak_lanjut=tindak_lanjut,
             simulation_details=simulation_details,
+            analytics=analytics,
             timestamp=datetime.now(),
             total_cost_usd=total_cost,
         )
 
+    def _resolve_category(
+        self, aspirasi: Aspirasi, log: Callable[[str], None]
+    ) -> Tuple[Aspirasi, Optional[AspirasiPrediction]]:
+        """Predict the category of an aspiration whose category is unknown."""
+        # Unknown categories (e.g. "Auto") would fan out to every commission, so predict one
+        from .komisi_data import CATEGORY_TO_KOMISI
+
+        if aspirasi.category in CATEGORY_TO_KOMISI:
+            return aspirasi, None
+        with _stage("classify"):
+            prediction = classify_aspirasi(aspirasi.content)
+        if prediction.routes_komisi:
+            aspirasi = aspirasi.model_copy(update={"category": prediction.category})
+            log(f"🧭 Kategori terdeteksi: {prediction.category}, diteruskan ke {prediction.komisi}")
+        elif prediction.confident:
+            aspirasi = aspirasi.model_copy(update={"category": prediction.category})
+            log(f"🧭 Kategori terdeteksi: {prediction.category}, diteruskan ke semua komisi terkait")
+        else:
+            log("🧭 Kategori tidak dapat dideteksi, aspirasi diteruskan ke semua komisi")
+        return aspirasi, prediction
+
+    @staticmethod
+    def _routing_filter(komisi_filter: Optional[str], prediction: Optional[AspirasiPrediction]) -> Optional[str]:
+        """The explicit commission filter, else the predicted commission when certain enough."""
+        if komisi_filter or prediction is None or not prediction.routes_komisi:
+            return komisi_filter
+        return prediction.komisi
+
+    def _absorb_savings(self, responses: List[AbsorpsiResponse], aspirasi: Aspirasi) -> Dict[str, float]:
+        """Count triage, full and rule-decided members and estimate the calls saved.
+
+        Each member skipped by the triage or the relevance rules saves one
+        full call, priced at the mean cost of the run's full calls (or
+        estimated from the prompt when none ran). Responses reused from
+        the absorb memo made no call in this run and are only counted.
+        """
+        # Memoized responses made no call in this run
+        reused = sum(1 for r in responses if r.dari_memo)
+        responses = [r for r in responses if not r.dari_memo]
+        full = [r for r in responses if r.tier == "full"]
+        skipped = [r for r in responses if r.tier in ("triage", "rules")]
+        triage_calls = sum(1 for r in responses if r.tier == "triage" or r.triage_cost_usd)
+        triage_cost = sum(r.triage_cost_usd for r in responses)
+
+        savings = 0.0
+        if skipped:
+            full_costs = [r.cost_usd - r.triage_cost_usd for r in full if r.error is None]
+            if full_costs:
+                full_cost = sum(full_costs) / len(full_costs)
+            else:
+                member = self.members_by_id.get(skipped[0].member_id)
+                full_cost = self.absorb_agent.estimate_full_cost(member, aspirasi) if member else 0.0
+            savings = len(skipped) * full_cost - triage_cost
+
+        return {
+            "panggilan_triase": triage_calls,
+            "panggilan_lengkap": len(full),
+            "anggota_dinilai_aturan": sum(1 for r in responses if r.tier == "rules"),
+            "tanggapan_dari_memo": reused,
+            "biaya_triase_usd": triage_cost,
+            "estimasi_penghematan_usd": savings,
+        }
+
     async def process_multiple_aspirasi(
         self,
         aspirasi_list: List[Aspirasi],
@@ -205,6 +613,9 @@ class DPRSimulator:
         """
         Process multiple aspirations sequentially.
 
+        Keeps every result in memory; use ``stream_multiple_aspirasi`` with a
+        sink for large batches.
+
         Args:
             aspirasi_list: List of aspirations to process
             sample_size: Number of members to sample per aspiration
@@ -213,10 +624,375 @@ class DPRSimulator:
         Returns:
             List of PipelineResult for each aspiration
         """
-        results = []
-        for i, aspirasi in enumerate(aspirasi_list, 1):
+        sink = ListSink()
+        await self.stream_multiple_aspirasi(
+            aspirasi_list, sink, sample_size=sample_size, progress_callback=progress_callback
+        )
+        return sink.results
+
+    async def stream_multiple_aspirasi(
+        self,
+        aspirasi_list: Iterable[Aspirasi],
+        sink: ResultSink,
+        sample_size: int = None,
+        komisi_filter: Optional[str] = None,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        concurrency: int = 1,
+        group_size: Optional[int] = None,
+    ) -> int:
+        """
+        Process many aspirations, streaming each result into a sink.
+
+        Results are handed to the sink as they complete (in completion order
+        when ``concurrency`` > 1) and not kept, and aspirations are pulled from
+        the iterable only as slots free up, so memory stays flat for any
+        batch size. The sink is closed when the run ends.
+
+        With ``group_size`` > 1, absorb calls are grouped instead: see
+        ``_stream_grouped``.
+
+        Args:
+            aspirasi_list: Aspirations to process (any iterable, e.g. a generator)
+            sink: Destination of the results
+            sample_size: Number of members to sample per aspiration
+            komisi_filter: Optional specific commission to filter by
+            progress_callback: Optional callback for progress updates
+            concurrency: Aspirations processed at the same time
+            group_size: Aspirations per member absorb call (defaults to settings)
+
+        Returns:
+            Number of results streamed into the sink
+        """
+        group_size = group_size or settings.absorb_group_size
+        if group_size > 1:
+            try:
+                return await self._stream_grouped(
+                    aspirasi_list, sink, sample_size, komisi_filter, progress_callback, group_size
+                )
+            finally:
+                await sink.close()
+
+        total = f"/{len(aspirasi_list)}" if isinstance(aspirasi_list, Sized) else ""
+        in_flight: Set[asyncio.Task] = set()
+        count = 0
+
+        async def drain() -> None:
+            # Hand every finished run to the sink
+            nonlocal count
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                in_flight.discard(task)
+                await sink.put(task.result())
+                count += 1
+
+        try:
+            for i, aspirasi in enumerate(aspirasi_list, 1):
+                if progress_callback:
+                    progress_callback(f"\n{'='*60}\nAspirasi {i}{total}\n{'='*60}")
+                in_flight.add(
+                    asyncio.ensure_future(
+                        self.process_aspirasi(
+                            aspirasi,
+                            sample_size=sample_size,
+                            komisi_filter=komisi_filter,
+                            progress_callback=progress_callback,
+                        )
+                    )
+                )
+                if len(in_flight) >= max(1, concurrency):
+                    await drain()
+            while in_flight:
+                await drain()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await sink.close()
+        return count
+
+    async def sweep_aspirasi(
+        self,
+        aspirasi: Aspirasi,
+        sample_sizes: Sequence[int],
+        komisi_filters: Sequence[Optional[str]] = (None,),
+        stability_threshold: float = 0.7,
+        progress_callback: Optional[Callable[[str], None]] = None,
+    ) -> SweepResult:
+        """
+        Run one aspiration across a grid of sample sizes and commission filters.
+
+        Every grid point selects its members as ``process_aspirasi`` would,
+        but the absorb calls of all points form one deduplicated set: each
+        member is asked once, however many points include it. Every point
+        then gets its own compile call over its members' responses (the
+        follow-up stage is not run). Points are compared with the largest
+        sample size of their filter to report how stable the compile result
+        is against what the point would cost on its own.
+
+        Args:
+            aspirasi: The aspiration to sweep
+            sample_sizes: Sample sizes of the grid
+            komisi_filters: Commission filters of the grid (None: by category)
+            stability_threshold: Theme and relevance similarity of a stable point
+            progress_callback: Optional callback for progress updates
+
+        Returns:
+            SweepResult with one SweepPoint per grid point and the sweep's costs
+        """
+        from .sweep import is_stable, relevance_counts, relevance_similarity, theme_similarity
+
+        def log(msg: str):
             if progress_callback:
-                progress_callback(f"\n{'='*60}\nAspirasi {i}/{len(aspirasi_list)}\n{'='*60}")
-            result = await self.process_aspirasi(aspirasi, sample_size, progress_callback)
-            results.append(result)
-        return results
+                progress_callback(msg)
+
+        aspirasi, prediction = self._resolve_category(aspirasi, log)
+        sizes = sorted(set(sample_sizes))
+        filters = list(dict.fromkeys(self._routing_filter(f, prediction) for f in komisi_filters))
+
+        # Rule pre-scoring depends on the commission filter, so its calls are shared per filter
+        grid: Dict[Tuple[int, Optional[str]], List[DPRMember]] = {}
+        to_absorb: Dict[Optional[str], Dict[int, DPRMember]] = {}
+        with _stage("select"):
+            for komisi_filter in filters:
+                for size in sizes:
+                    members = self._select_members(aspirasi, komisi_filter, size)
+                    grid[(size, komisi_filter)] = members
+                    call_filter = komisi_filter if self.relevance_prescoring else None
+                    to_absorb.setdefault(call_filter, {}).update((m.id, m) for m in members)
+
+        distinct = sum(len(members) for members in to_absorb.values())
+        log(f"📥 Menyerap aspirasi oleh {distinct} anggota untuk {len(grid)} titik grid")
+        absorbed: Dict[Tuple[int, Optional[str]], AbsorpsiResponse] = {}
+        with _stage("absorb"):
+            for call_filter, members_by_id in to_absorb.items():
+                members = list(members_by_id.values())
+                for i in range(0, len(members), settings.batch_size):
+                    batch = members[i : i + settings.batch_size]
+                    responses = await self._process_absorb_batch(batch, aspirasi, komisi_filter=call_filter)
+                    absorbed.update(((m.id, call_filter), r) for m, r in zip(batch, responses))
+                    if i + settings.batch_size < len(members):
+                        await asyncio.sleep(settings.rate_limit_delay)
+
+        def responses_of(key: Tuple[int, Optional[str]]) -> List[AbsorpsiResponse]:
+            call_filter = key[1] if self.relevance_prescoring else None
+            return [absorbed[(m.id, call_filter)] for m in grid[key]]
+
+        log(f"📊 Menghimpun tanggapan untuk {len(grid)} titik grid")
+        with _stage("compile"):
+            compiled = await asyncio.gather(
+                *(self.compile_agent.invoke(aspirasi, responses_of(key)) for key in grid)
+            )
+        kompilasi_by_key = dict(zip(grid, compiled))
+
+        points = []
+        for (size, komisi_filter), members in grid.items():
+            responses = responses_of((size, komisi_filter))
+            kompilasi = kompilasi_by_key[(size, komisi_filter)]
+            reference = kompilasi_by_key[(sizes[-1], komisi_filter)]
+            counts = relevance_counts(responses)
+            tema = theme_similarity(kompilasi.tema_utama, reference.tema_utama)
+            relevansi = relevance_similarity(counts, relevance_counts(responses_of((sizes[-1], komisi_filter))))
+            points.append(
+                SweepPoint(
+                    sample_size=size,
+                    komisi_filter=komisi_filter,
+                    anggota=len(members),
+                    member_ids=[m.id for m in members],
+                    kompilasi=kompilasi,
+                    relevansi_counts=counts,
+                    biaya_absorb_usd=sum(r.cost_usd + r.biaya_asli_usd for r in responses),
+                    biaya_kompilasi_usd=kompilasi.cost_usd,
+                    kemiripan_tema=tema,
+                    kemiripan_relevansi=relevansi,
+                    stabil=is_stable(kompilasi, reference, tema, relevansi, stability_threshold),
+                )
+            )
+
+        absorb_cost = sum(r.cost_usd for r in absorbed.values())
+        compile_cost = sum(k.cost_usd for k in compiled)
+        called = [r for r in absorbed.values() if r.tier != "rules" and not r.dari_memo]
+        # Triage-only answers made one call; escalated ones a triage and a full call
+        triage_calls = sum(1 for r in called if r.tier == "triage" or r.triage_cost_usd > 0)
+        full_calls = sum(1 for r in called if r.tier != "triage")
+        result = SweepResult(
+            aspirasi=aspirasi,
+            titik=points,
+            ambang_stabilitas=stability_threshold,
+            panggilan_absorb=full_calls + triage_calls,
+            panggilan_triase=triage_calls,
+            biaya_absorb_usd=absorb_cost,
+            biaya_kompilasi_usd=compile_cost,
+            total_cost_usd=absorb_cost + compile_cost,
+            biaya_naif_usd=sum(p.biaya_usd for p in points),
+        )
+        log(
+            f"💰 Biaya sweep ${result.total_cost_usd:.6f} "
+            f"(tanpa berbagi panggilan absorb: ${result.biaya_naif_usd:.6f})"
+        )
+        return result
+
+    async def _stream_grouped(
+        self,
+        aspirasi_list: Iterable[Aspirasi],
+        sink: ResultSink,
+        sample_size: Optional[int],
+        komisi_filter: Optional[str],
+        progress_callback: Optional[Callable[[str], None]],
+        group_size: int,
+    ) -> int:
+        """
+        Bulk run where each member absorb call covers up to ``group_size`` aspirations.
+
+        Aspirations are read in windows of ``absorb_group_window``. Within a
+        window they are ordered by priority, so each member's aspirations
+        are grouped with others of the same priority and the groups of
+        urgent aspirations are sent first. Each aspiration goes on to the
+        compile and follow-up stages as soon as all of its members have
+        answered, and its result is streamed into the sink (and saved to
+        the result store). Its trace gets an ``absorb`` stage holding the
+        spans of the group calls that served it. Members the relevance rules rate as certainly
+        irrelevant get templated responses. Grouped calls are always full
+        calls: the cascade triage, the absorb memo and near-duplicate
+        detection are not used.
+
+        Returns:
+            Number of results streamed into the sink
+        """
+        window = max(group_size, settings.absorb_group_window)
+        iterator = iter(aspirasi_list)
+        count = 0
+        while True:
+            chunk = list(islice(iterator, window))
+            if not chunk:
+                return count
+            if progress_callback:
+                progress_callback(
+                    f"\n{'='*60}\nAspirasi {count + 1}-{count + len(chunk)} "
+                    f"(grup {group_size} aspirasi per panggilan)\n{'='*60}"
+                )
+            tasks, group_calls = self._process_group_window(
+                chunk, sample_size, komisi_filter, progress_callback, group_size
+            )
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    result = await next_done
+                    if self.result_store_path:
+                        get_result_store(self.result_store_path).save(result)
+                    await sink.put(result)
+                    count += 1
+            finally:
+                # Group calls are cancelled directly, whether or not a pipeline task awaited them
+                _cancel_pending(group_calls)
+                _cancel_pending(tasks)
+
+    def _process_group_window(
+        self,
+        chunk: List[Aspirasi],
+        sample_size: Optional[int],
+        komisi_filter: Optional[str],
+        progress_callback: Optional[Callable[[str], None]],
+        group_size: int,
+    ) -> Tuple[List[asyncio.Task], List[asyncio.Future]]:
+        """
+        Start the grouped absorb calls of a window.
+
+        Group calls are sent in priority order, ``batch_size`` at a time with
+        ``rate_limit_delay`` between batches, like the absorb batches of a
+        single run.
+
+        Returns:
+            One pipeline task per aspiration, and the dispatcher task with
+            the group-call futures, for the caller to cancel
+        """
+
+        def log(msg: str):
+            if progress_callback:
+                progress_callback(msg)
+
+        start = time.perf_counter()
+        sample_size = sample_size or settings.default_member_count
+        rank = {"Tinggi": 0, "Sedang": 1, "Rendah": 2}
+        chunk = sorted(chunk, key=lambda a: rank.get(a.priority, 1))
+
+        selections = []
+        answers: Dict[Tuple[int, int], AbsorpsiResponse] = {}
+        pending: Dict[int, List[int]] = {}
+        with _stage("select"):
+            for i, aspirasi in enumerate(chunk):
+                aspirasi, prediction = self._resolve_category(aspirasi, log)
+                routing = self._routing_filter(komisi_filter, prediction)
+                members = self._select_members(aspirasi, routing, sample_size)
+                selections.append((aspirasi, prediction, members, routing))
+                for member in members:
+                    if self.relevance_prescoring:
+                        prior = score_relevance(member, aspirasi.category, aspirasi.source, routing)
+                        if prior.certain and prior.relevansi == "Rendah":
+                            metrics.absorb_prescoring.inc(decision="templated")
+                            answers[(member.id, i)] = templated_response(member, aspirasi, prior)
+                            continue
+                    pending.setdefault(member.id, []).append(i)
+
+        # Groups hold aspirations of neighbouring priority; urgent groups are sent first
+        groups = [
+            (member_id, indices[j : j + group_size])
+            for member_id, indices in pending.items()
+            for j in range(0, len(indices), group_size)
+        ]
+        groups.sort(key=lambda group: group[1][0])
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in groups]
+        # Aspiration index -> (member id, position in the group, group call)
+        calls: Dict[int, List[Tuple[int, int, asyncio.Future]]] = {}
+        for (member_id, indices), future in zip(groups, futures):
+            for position, i in enumerate(indices):
+                calls.setdefault(i, []).append((member_id, position, future))
+        log(f"📥 {len(groups)} panggilan menyerap untuk {len(chunk)} aspirasi")
+
+        async def call(g: int) -> None:
+            member_id, indices = groups[g]
+            # Recorded on its own, then copied into the trace of each aspiration it serves
+            with start_trace() as tracer:
+                try:
+                    responses = await self.absorb_agent.invoke_group(
+                        self.members_by_id[member_id], [selections[i][0] for i in indices]
+                    )
+                except Exception as e:
+                    futures[g].set_exception(e)
+                    return
+            futures[g].set_result((responses, tracer.spans))
+
+        async def dispatch() -> None:
+            batch_size = settings.batch_size
+            for first in range(0, len(groups), batch_size):
+                batch = [asyncio.ensure_future(call(g)) for g in range(first, min(first + batch_size, len(groups)))]
+                try:
+                    await asyncio.gather(*batch)
+                finally:
+                    _cancel_pending(batch)
+                if first + batch_size < len(groups):
+                    await asyncio.sleep(settings.rate_limit_delay)
+
+        dispatcher = asyncio.ensure_future(dispatch())
+
+        async def finish(i: int) -> PipelineResult:
+            aspirasi, prediction, members, routing = selections[i]
+            with start_trace() as tracer:
+                try:
+                    with span("pipeline", kind="pipeline", aspirasi_id=aspirasi.id):
+                        with _stage("absorb") as absorb_span:
+                            for member_id, position, future in calls.get(i, []):
+                                # Shielded: the group call is shared with the window's other aspirations
+                                group_responses, spans = await asyncio.shield(future)
+                                answers[(member_id, i)] = group_responses[position]
+                                tracer.spans.extend(_group_call_spans(spans, position, absorb_span.span_id))
+                        responses = [answers[(m.id, i)] for m in members]
+                        result = await self._finish_pipeline(
+                            aspirasi, prediction, members, responses, sample_size, routing, log, start, "group"
+                        )
+                except asyncio.CancelledError:
+                    _record_cancelled(tracer.to_trace())
+                    raise
+                result.trace = tracer.to_trace()
+            return result
+
+        return [asyncio.ensure_future(finish(i)) for i in range(len(chunk))], [dispatcher, *futures]
+
@@ -0,0 +1,122 @@
+"""
+Result sinks for bulk runs.
+
+``DPRSimulator.stream_multiple_aspirasi`` hands each PipelineResult to a
+sink as soon as it completes and keeps no reference to it, so memory stays
+flat however many aspirations a run covers. Sinks decide what survives:
+
+- ``CallbackSink``: call a function (sync or async) per result
+- ``QueueSink``: put results on an ``asyncio.Queue`` (bounded queues apply
+  backpressure to the run)
+- ``JsonlSink``: append results as JSON Lines (gzip when the path ends in .gz)
+- ``ParquetSink``: stream rows into the Parquet exporter
+- ``ListSink``: keep every result in memory (what ``process_multiple_aspirasi``
+  returns)
+
+File sinks serialize and write in a worker thread (``asyncio.to_thread``),
+one result at a time, so disk and compression never block the event loop
+while the run still waits for each write (no unbounded backlog).
+"""
+
+import asyncio
+import gzip
+import inspect
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List, Optional, Union
+
+from ..models import PipelineResult
+
+
+class ResultSink(ABC):
+    """Destination of the results of a bulk run."""
+
+    @abstractmethod
+    async def put(self, result: PipelineResult) -> None:
+        """Consume one completed result."""
+
+    async def close(self) -> None:
+        """Flush and release resources once the run ends."""
+
+
+class ListSink(ResultSink):
+    """Keeps every result in memory."""
+
+    def __init__(self):
+        self.results: List[PipelineResult] = []
+
+    async def put(self, result: PipelineResult) -> None:
+        self.results.append(result)
+
+
+class CallbackSink(ResultSink):
+    """Calls a function, or awaits a coroutine function, with each result."""
+
+    def __init__(self, callback: Callable[[PipelineResult], Union[None, Awaitable[None]]]):
+        self.callback = callback
+
+    async def put(self, result: PipelineResult) -> None:
+        value = self.callback(result)
+        if inspect.isawaitable(value):
+            await value
+
+
+class QueueSink(ResultSink):
+    """Puts results on an asyncio queue, followed by None when the run ends."""
+
+    def __init__(self, queue: Optional[asyncio.Queue] = None, maxsize: int = 0):
+        """
+        Args:
+            queue: Queue to feed (a new one with ``maxsize`` when omitted)
+            maxsize: Size of the new queue; a full queue pauses the run
+        """
+        self.queue: asyncio.Queue = queue if queue is not None else asyncio.Queue(maxsize)
+
+    async def put(self, result: PipelineResult) -> None:
+        await self.queue.put(result)
+
+    async def close(self) -> None:
+        await self.queue.put(None)
+
+
+class JsonlSink(ResultSink):
+    """Appends each result as one JSON line."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        opener: Any = gzip.open if self.path.suffix == ".gz" else open
+        self._file = opener(self.path, "at", encoding="utf-8")
+        self._lock = asyncio.Lock()
+        self.count = 0
+
+    def _write(self, result: PipelineResult) -> None:
+        self._file.write(result.model_dump_json() + "\n")
+
+    async def put(self, result: PipelineResult) -> None:
+        # The lock keeps lines whole and in order when several tasks put at once
+        async with self._lock:
+            await asyncio.to_thread(self._write, result)
+        self.count += 1
+
+    async def close(self) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._file.close)
+
+
+class ParquetSink(ResultSink):
+    """Streams results into partitioned Parquet files (needs pyarrow)."""
+
+    def __init__(self, root: Union[str, Path, None] = None, **exporter_kwargs: Any):
+        from .export import ParquetExporter
+
+        self.exporter = ParquetExporter(root, **exporter_kwargs)
+        self._lock = asyncio.Lock()
+
+    async def put(self, result: PipelineResult) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self.exporter.write, result)
+
+    async def close(self) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self.exporter.close)
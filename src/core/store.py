@@ -0,0 +1,338 @@
+"""
+Durable store of pipeline results with indexed history queries.
+
+Every PipelineResult is written to a SQLite database: the aspiration id,
+category, commission, source, priority, timestamp and cost go into indexed
+columns, and the full result is stored as compressed JSON (zstd when the
+``zstandard`` package is available, zlib otherwise; each row records its
+codec).
+
+Saving only enqueues the result. A background thread serializes,
+compresses and inserts everything queued so far in one transaction, so
+persistence never runs on the event loop or adds to pipeline latency.
+"""
+
+import atexit
+import queue
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..config import settings
+from ..models import PipelineResult, StoredResult
+from .metrics import metrics
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    aspirasi_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    komisi TEXT NOT NULL,
+    source TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    cost_usd REAL NOT NULL,
+    status TEXT NOT NULL,
+    content_preview TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_aspirasi ON results (aspirasi_id);
+CREATE INDEX IF NOT EXISTS idx_results_category_source_time ON results (category, source, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_komisi_time ON results (komisi, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_source_time ON results (source, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_priority_time ON results (priority, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_time ON results (timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_cost ON results (cost_usd);
+"""
+
+_INSERT = (
+    "INSERT INTO results (run_id, aspirasi_id, category, komisi, source, priority, timestamp, "
+    "cost_usd, status, content_preview, codec, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_INDEX_COLUMNS = (
+    "id, run_id, aspirasi_id, category, komisi, source, priority, timestamp, cost_usd, status, content_preview"
+)
+SORT_COLUMNS = ("timestamp", "cost_usd", "aspirasi_id")
+
+_STOP = object()
+
+
+def _compressor(level: int) -> Tuple[str, Callable[[bytes], bytes]]:
+    """Best available (codec name, compress function)."""
+    try:
+        import zstandard
+    except ImportError:
+        return "zlib", lambda data: zlib.compress(data, min(level, 9))
+    return "zstd", zstandard.ZstdCompressor(level=level).compress
+
+
+def _decompress(codec: str, payload: bytes) -> bytes:
+    if codec == "zstd":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if codec == "zlib":
+        return zlib.decompress(payload)
+    raise ValueError(f"Unknown payload codec {codec!r}")
+
+
+class ResultStore:
+    """SQLite result store with a batching background writer."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        batch_size: int | None = None,
+        compression_level: int | None = None,
+    ):
+        """
+        Open (or create) the store and start its writer thread.
+
+        Args:
+            path: SQLite database file
+            batch_size: Maximum results per write transaction (defaults to settings)
+            compression_level: zstd/zlib compression level (defaults to settings)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size or settings.result_store_batch_size
+        self.codec, self._compress = _compressor(compression_level or settings.result_store_compression_level)
+
+        self.written = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._write_loop, name="dpr-result-store", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def save(self, result: PipelineResult) -> None:
+        """Queue a result for persistence (returns immediately)."""
+        if self._closed:
+            raise RuntimeError("ResultStore is closed")
+        self._queue.put(result)
+
+    def flush(self) -> None:
+        """Block until every queued result has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write what is queued and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _row(self, result: PipelineResult) -> Tuple[Any, ...]:
+        aspirasi = result.aspirasi
+        return (
+            result.trace.trace_id,
+            aspirasi.id,
+            aspirasi.category,
+            result.simulation_details.komisi_utama,
+            aspirasi.source,
+            aspirasi.priority,
+            result.timestamp.timestamp(),
+            result.total_cost_usd,
+            result.kompilasi.status,
+            aspirasi.content[:120],
+            self.codec,
+            self._compress(result.model_dump_json().encode()),
+        )
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        stop = False
+        while not stop:
+            # Block for one item, then take whatever else is already queued
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(item is _STOP for item in batch)
+            results = [item for item in batch if item is not _STOP]
+            try:
+                if results:
+                    rows = [self._row(r) for r in results]
+                    with conn:
+                        conn.executemany(_INSERT, rows)
+                    self.written += len(rows)
+                    metrics.store_writes.inc(len(rows), outcome="ok")
+            except Exception as e:
+                self.errors += len(results)
+                self.last_error = f"{type(e).__name__}: {e}"
+                metrics.store_writes.inc(len(results), outcome="error")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        komisi: Optional[str] = None,
+        source: Optional[str] = None,
+        priority: Optional[str] = None,
+        aspirasi_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        order_by: str = "timestamp",
+        descending: bool = True,
+        limit: int = 50,
+    ) -> List[StoredResult]:
+        """
+        Find stored results by their indexed columns.
+
+        Args:
+            category: Exact aspiration category
+            komisi: Exact primary commission
+            source: Exact source province/region
+            priority: Exact priority
+            aspirasi_id: Aspiration id
+            since: Only results completed at or after this time
+            until: Only results completed before this time
+            order_by: One of SORT_COLUMNS
+            descending: Sort direction
+            limit: Maximum rows returned
+
+        Returns:
+            Index records, without payloads (see ``load``)
+        """
+        if order_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {order_by!r}, expected one of {SORT_COLUMNS}")
+
+        clauses, params = self._where(category, komisi, source, priority, aspirasi_id, since, until)
+        sql = f"SELECT {_INDEX_COLUMNS} FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}, id DESC LIMIT ?"
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, [*params, limit]).fetchall()
+        columns = [c.strip() for c in _INDEX_COLUMNS.split(",")]
+        records = []
+        for row in rows:
+            data: Dict[str, Any] = dict(zip(columns, row))
+            data["timestamp"] = datetime.fromtimestamp(data["timestamp"])
+            records.append(StoredResult(**data))
+        return records
+
+    @staticmethod
+    def _where(
+        category: Optional[str] = None,
+        komisi: Optional[str] = None,
+        source: Optional[str] = None,
+        priority: Optional[str] = None,
+        aspirasi_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Tuple[List[str], List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (
+            ("category", category),
+            ("komisi", komisi),
+            ("source", source),
+            ("priority", priority),
+            ("aspirasi_id", aspirasi_id),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until.timestamp())
+        return clauses, params
+
+    def load(self, row_id: int) -> Optional[PipelineResult]:
+        """Load the full PipelineResult of a stored row (None if it doesn't exist)."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT codec, payload FROM results WHERE id = ?", (row_id,)).fetchone()
+        if row is None:
+            return None
+        codec, payload = row
+        return PipelineResult.model_validate_json(_decompress(codec, payload))
+
+    def iter_results(self, **filters: Any) -> Iterator[PipelineResult]:
+        """
+        Stream full stored results in completion order.
+
+        Args:
+            **filters: Same column filters as ``query`` (category, komisi,
+                source, priority, aspirasi_id, since, until)
+
+        Yields:
+            PipelineResult, decoded one row at a time
+        """
+        clauses, params = self._where(**filters)
+        sql = "SELECT codec, payload FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp, id"
+
+        conn = self._connect()
+        try:
+            for codec, payload in conn.execute(sql, params):
+                yield PipelineResult.model_validate_json(_decompress(codec, payload))
+        finally:
+            conn.close()
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+_stores: Dict[Path, ResultStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_result_store(path: str | Path | None = None) -> ResultStore:
+    """
+    Shared store for a database path (defaults to ``settings.result_store_path``).
+
+    Every simulator writing to the same file shares one writer thread; stores
+    are flushed and closed at interpreter exit.
+    """
+    resolved = Path(path or settings.result_store_path).resolve()
+    with _stores_lock:
+        store = _stores.get(resolved)
+        if store is None:
+            store = _stores[resolved] = ResultStore(resolved)
+        return store
+
+
+@atexit.register
+def _close_stores() -> None:
+    for store in list(_stores.values()):
+        store.close()
@@ -0,0 +1,55 @@
+"""
+Stability measures of a parameter sweep.
+
+Each grid point of ``DPRSimulator.sweep_aspirasi`` is compared with the
+reference point of its commission filter (the largest sample size): how
+many of the compiled main themes they share, and how close their relevance
+distributions are. A point is stable when its compile status matches the
+reference and both similarities reach the threshold.
+"""
+
+from typing import Dict, Iterable, List
+
+from ..models import AbsorpsiResponse, KompilasiResponse
+from .analytics import RELEVANSI_LEVELS
+from .dedup import normalize
+
+
+def relevance_counts(responses: Iterable[AbsorpsiResponse]) -> Dict[str, int]:
+    """Successful responses per relevance level."""
+    counts = {level: 0 for level in RELEVANSI_LEVELS}
+    for r in responses:
+        level = r.relevansi.strip().capitalize()
+        if r.error is None and level in counts:
+            counts[level] += 1
+    return counts
+
+
+def theme_similarity(themes: List[str], reference: List[str]) -> float:
+    """Jaccard similarity of two theme lists, compared after normalisation."""
+    a = {normalize(t) for t in themes if t.strip()}
+    b = {normalize(t) for t in reference if t.strip()}
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def relevance_similarity(counts: Dict[str, int], reference: Dict[str, int]) -> float:
+    """One minus the total variation distance of two relevance distributions."""
+    total, ref_total = sum(counts.values()), sum(reference.values())
+    if not total or not ref_total:
+        return 1.0 if total == ref_total else 0.0
+    levels = set(counts) | set(reference)
+    distance = sum(abs(counts.get(l, 0) / total - reference.get(l, 0) / ref_total) for l in levels) / 2
+    return 1.0 - distance
+
+
+def is_stable(
+    kompilasi: KompilasiResponse,
+    reference: KompilasiResponse,
+    tema: float,
+    relevansi: float,
+    threshold: float,
+) -> bool:
+    """Whether a point's compile result agrees with the reference point's."""
+    return kompilasi.status == reference.status and tema >= threshold and relevansi >= threshold
@@ -0,0 +1,92 @@
+"""
+Span recording for pipeline runs.
+
+A run opens a trace with ``start_trace``; stages and LLM calls open spans with
+``span``. Parent/child links and the scheduling reference time follow
+``contextvars``, so tasks created inside a stage (e.g. concurrent absorb
+calls) are recorded as children of that stage automatically. Outside a trace
+``span`` still yields a span object, it is just not recorded.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional
+
+from ..models import PipelineTrace, TraceSpan
+
+
+class Tracer:
+    """Collects the spans of one pipeline run."""
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[TraceSpan] = []
+
+    def to_trace(self) -> PipelineTrace:
+        return PipelineTrace(trace_id=self.trace_id, spans=list(self.spans))
+
+
+_tracer: ContextVar[Optional[Tracer]] = ContextVar("dpr_tracer", default=None)
+_current_span: ContextVar[Optional[TraceSpan]] = ContextVar("dpr_current_span", default=None)
+# Time work in the current scope became ready to run; LLM calls measure queue wait against it
+_enqueued_at: ContextVar[Optional[float]] = ContextVar("dpr_enqueued_at", default=None)
+
+
+@contextmanager
+def start_trace() -> Iterator[Tracer]:
+    """Record every span opened in this context (and tasks created from it)."""
+    tracer = Tracer()
+    token = _tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _tracer.reset(token)
+
+
+@contextmanager
+def span(name: str, kind: str = "stage", **attributes: Any) -> Iterator[TraceSpan]:
+    """
+    Time the enclosed block as a span.
+
+    Args:
+        name: Span name
+        kind: pipeline/stage/llm_call
+        **attributes: Extra attributes stored on the span
+
+    Yields:
+        The span, which the caller may annotate (tokens, retries, ...)
+    """
+    tracer = _tracer.get()
+    parent = _current_span.get()
+    now = time.time()
+    current = TraceSpan(
+        span_id=os.urandom(8).hex(),
+        parent_id=parent.span_id if parent else None,
+        name=name,
+        kind=kind,
+        start=now,
+        attributes=attributes,
+    )
+
+    enqueued_at = _enqueued_at.get()
+    if kind == "llm_call" and enqueued_at is not None:
+        current.queue_wait_ms = max(0.0, (now - enqueued_at) * 1000)
+
+    span_token = _current_span.set(current)
+    # Work started inside a stage is considered queued from the stage start
+    enqueue_token = _enqueued_at.set(now) if kind != "llm_call" else None
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end = time.time()
+        _current_span.reset(span_token)
+        if enqueue_token is not None:
+            _enqueued_at.reset(enqueue_token)
+        if tracer is not None:
+            tracer.spans.append(current)
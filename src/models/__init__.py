@@ -2,11 +2,16 @@
 
 from .dpr_member import DPRMember
 from .aspirasi import Aspirasi
+from .trace import TraceSpan, PipelineTrace
+from .endpoint import LLMEndpoint
+from .history import StoredResult
+from .sweep import SweepPoint, SweepResult
 from .responses import (
     AbsorpsiResponse,
     KompilasiResponse,
     TindakLanjutResponse,
     SimulationDetails,
+    SimulationAnalytics,
     PipelineResult,
 )
 
@@ -17,5 +22,12 @@ __all__ = [
     "KompilasiResponse",
     "TindakLanjutResponse",
     "SimulationDetails",
+    "SimulationAnalytics",
     "PipelineResult",
+    "TraceSpan",
+    "PipelineTrace",
+    "LLMEndpoint",
+    "StoredResult",
+    "SweepPoint",
+    "SweepResult",
 ]
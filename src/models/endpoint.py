@@ -0,0 +1,17 @@
+"""LLM endpoint configuration model."""
+
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class LLMEndpoint(BaseModel):
+    """One OpenAI-compatible endpoint in the routing pool."""
+
+    name: str = Field(..., description="Endpoint name used in metrics and traces")
+    base_url: Optional[str] = Field(default=None, description="API base URL (None for api.openai.com)")
+    api_key: str = Field(default="", description="API key (empty: use the simulator's key)")
+    model: str = Field(default="", description="Model served by this endpoint (empty: default model)")
+    weight: float = Field(default=1.0, gt=0, description="Relative share of traffic")
+    max_concurrency: int = Field(default=0, ge=0, description="Maximum in-flight requests (0 = unlimited)")
+    rpm: int = Field(default=0, ge=0, description="Requests-per-minute budget of the key (0 = unlimited)")
+    tpm: int = Field(default=0, ge=0, description="Tokens-per-minute budget of the key (0 = unlimited)")
@@ -0,0 +1,20 @@
+"""Index record of a persisted pipeline result."""
+
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+class StoredResult(BaseModel):
+    """Indexed columns of one stored PipelineResult (the payload is loaded separately)."""
+
+    id: int = Field(..., description="Row id in the result store")
+    run_id: str = Field(default="", description="Trace id of the run")
+    aspirasi_id: int = Field(..., description="ID of the processed aspiration")
+    category: str = Field(default="", description="Aspiration category")
+    komisi: str = Field(default="", description="Primary responsible commission")
+    source: str = Field(default="", description="Source province/region")
+    priority: str = Field(default="", description="Aspiration priority")
+    timestamp: datetime = Field(..., description="When processing completed")
+    cost_usd: float = Field(default=0.0, description="Total cost in USD")
+    status: str = Field(default="", description="Compile status: terkumpul/tidak_relevan")
+    content_preview: str = Field(default="", description="First characters of the aspiration")
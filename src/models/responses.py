@@ -1,11 +1,12 @@
 """Response models for DPR AI Simulator pipeline stages."""
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 from .dpr_member import DPRMember
 from .aspirasi import Aspirasi
+from .trace import PipelineTrace
 
 
 class AbsorpsiResponse(BaseModel):
@@ -19,6 +20,20 @@ class AbsorpsiResponse(BaseModel):
     rekomendasi_awal: str = Field(default="", description="Initial recommendation")
     sentiment: str = Field(default="Netral", description="Member's stance: Positif/Negatif/Kritis/Netral")
     quote: str = Field(default="", description="Direct verbal statement/opinion from the member")
+    tier: str = Field(
+        default="full", description="Absorb tier that produced the response: full/triage/rules"
+    )
+    triage_cost_usd: float = Field(default=0.0, description="Cost of the cascade triage call (included in cost_usd)")
+    ukuran_grup: int = Field(
+        default=1, description="Aspirations answered by the grouped call that produced this response"
+    )
+    dari_memo: bool = Field(
+        default=False,
+        description="Reused from an earlier run of the same or a near-duplicate aspiration (no LLM call, no cost)",
+    )
+    biaya_asli_usd: float = Field(
+        default=0.0, description="Cost of the original call(s) of a memoized response (not spent in this run)"
+    )
     error: Optional[str] = Field(default=None, description="Error message if any")
     cost_usd: float = Field(default=0.0, description="Cost of this API call in USD")
 
@@ -79,10 +94,56 @@ class SimulationDetails(BaseModel):
     provinsi_terwakili: List[str] = Field(default_factory=list, description="Provinces represented")
     komisi_terwakili: List[str] = Field(default_factory=list, description="Commissions represented")
     komisi_utama: str = Field(default="", description="Primary responsible commission")
+    kategori_otomatis: bool = Field(
+        default=False, description="Whether the category was predicted by the offline classifier"
+    )
+    skor_klasifikasi: float = Field(default=0.0, description="Classifier score of the predicted category")
+    absorb_mode: str = Field(
+        default="single", description="Absorb mode: single/cascade, or group for grouped bulk calls"
+    )
+    panggilan_triase: int = Field(default=0, description="Cascade triage calls made")
+    panggilan_lengkap: int = Field(default=0, description="Full absorb calls made")
+    anggota_dinilai_aturan: int = Field(
+        default=0, description="Members answered by rule-based relevance pre-scoring (no LLM call)"
+    )
+    tanggapan_dari_memo: int = Field(
+        default=0, description="Absorb responses reused from earlier runs of the same aspiration"
+    )
+    biaya_triase_usd: float = Field(default=0.0, description="Cost of cascade triage calls in USD")
+    estimasi_penghematan_usd: float = Field(
+        default=0.0, description="Estimated cost saved by skipping full calls (triage and rules), net of triage cost"
+    )
     # IDs for building dataframes in UI
     relevant_member_ids: List[int] = Field(default_factory=list, description="IDs of relevant members")
 
 
+class SimulationAnalytics(BaseModel):
+    """Aggregated counts and cross-tabs over member responses for dashboards."""
+
+    jumlah_tanggapan: int = Field(default=0, description="Number of responses aggregated")
+    jumlah_aspirasi: int = Field(default=0, description="Number of distinct aspirations covered")
+    jumlah_error: int = Field(default=0, description="Number of responses with errors")
+    relevansi_counts: Dict[str, int] = Field(
+        default_factory=dict, description="Successful responses per relevance level"
+    )
+    sentiment_counts: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Successful responses per sentiment (triage and rule-decided responses have none)",
+    )
+    fraksi_x_sentiment: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict, description="Cross-tab: faction -> sentiment -> count"
+    )
+    komisi_x_relevansi: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict, description="Cross-tab: commission -> relevance -> count"
+    )
+    provinsi_x_relevansi: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict, description="Cross-tab: province -> relevance -> count"
+    )
+    biaya_per_fraksi: Dict[str, float] = Field(
+        default_factory=dict, description="Absorb-stage cost in USD per faction"
+    )
+
+
 class PipelineResult(BaseModel):
     """Complete result from the DPR AI Simulator pipeline."""
 
@@ -95,10 +156,22 @@ class PipelineResult(BaseModel):
     simulation_details: SimulationDetails = Field(
         default_factory=SimulationDetails, description="Simulation setup details"
     )
+    analytics: SimulationAnalytics = Field(
+        default_factory=SimulationAnalytics, description="Aggregated response analytics"
+    )
+    trace: PipelineTrace = Field(
+        default_factory=PipelineTrace, description="Span timeline of the run"
+    )
     timestamp: datetime = Field(
         default_factory=datetime.now, description="When processing completed"
     )
     total_cost_usd: float = Field(default=0.0, description="Total cost in USD")
+    duplikat_dari: Optional[int] = Field(
+        default=None, description="ID of the near-duplicate aspiration whose result was reused"
+    )
+    kemiripan_duplikat: float = Field(
+        default=0.0, description="Estimated similarity to that aspiration (0-1)"
+    )
 
     def summary(self) -> str:
         """Generate a human-readable summary."""
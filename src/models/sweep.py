@@ -0,0 +1,73 @@
+"""Models of a parameter sweep over sample sizes and commission filters."""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from .aspirasi import Aspirasi
+from .responses import KompilasiResponse
+
+
+class SweepPoint(BaseModel):
+    """Compile result and cost of one (sample size, commission filter) grid point."""
+
+    sample_size: int = Field(..., description="Requested sample size")
+    komisi_filter: Optional[str] = Field(default=None, description="Commission filter (None: by category)")
+    anggota: int = Field(default=0, description="Members selected at this point")
+    member_ids: List[int] = Field(default_factory=list, description="IDs of the selected members")
+    kompilasi: KompilasiResponse = Field(..., description="Compile result over the point's responses")
+    relevansi_counts: Dict[str, int] = Field(
+        default_factory=dict, description="Successful responses per relevance level"
+    )
+    biaya_absorb_usd: float = Field(
+        default=0.0,
+        description="Absorb cost of the point's members as if the point ran alone (memoized answers at their original cost)",
+    )
+    biaya_kompilasi_usd: float = Field(default=0.0, description="Cost of the point's compile call")
+    kemiripan_tema: float = Field(
+        default=0.0, description="Jaccard similarity of the main themes to the reference point (0-1)"
+    )
+    kemiripan_relevansi: float = Field(
+        default=0.0, description="Similarity of the relevance distribution to the reference point (0-1)"
+    )
+    stabil: bool = Field(
+        default=False, description="Same compile status as the reference and both similarities at the threshold"
+    )
+
+    @property
+    def biaya_usd(self) -> float:
+        """Cost of the point run on its own (absorb and compile)."""
+        return self.biaya_absorb_usd + self.biaya_kompilasi_usd
+
+
+class SweepResult(BaseModel):
+    """Grid of compile results for one aspiration, sharing one set of absorb calls."""
+
+    aspirasi: Aspirasi = Field(..., description="The swept aspiration")
+    titik: List[SweepPoint] = Field(default_factory=list, description="Grid points, by filter then sample size")
+    ambang_stabilitas: float = Field(default=0.7, description="Similarity threshold of a stable point")
+    panggilan_absorb: int = Field(
+        default=0, description="LLM calls of the shared absorb stage, cascade triage calls included"
+    )
+    panggilan_triase: int = Field(default=0, description="Cascade triage calls among the absorb calls")
+    biaya_absorb_usd: float = Field(default=0.0, description="Cost of the shared absorb calls")
+    biaya_kompilasi_usd: float = Field(default=0.0, description="Cost of every point's compile call")
+    total_cost_usd: float = Field(default=0.0, description="Actual cost of the sweep")
+    biaya_naif_usd: float = Field(
+        default=0.0,
+        description="Cost of running every point as its own pipeline without memo or sharing (absorb and compile)",
+    )
+    timestamp: datetime = Field(default_factory=datetime.now, description="When the sweep completed")
+
+    def sample_size_stabil(self, komisi_filter: Optional[str] = None) -> Optional[int]:
+        """Smallest sample size from which every larger point of the filter is stable, or None."""
+        points = sorted(
+            (p for p in self.titik if p.komisi_filter == komisi_filter), key=lambda p: p.sample_size
+        )
+        stable = None
+        for point in reversed(points):
+            if not point.stabil:
+                break
+            stable = point.sample_size
+        return stable
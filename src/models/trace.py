@@ -0,0 +1,101 @@
+"""Trace span models for per-run pipeline timelines."""
+
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+
+# OTLP SpanKind / StatusCode values
+_OTLP_KIND = {"pipeline": 1, "stage": 1, "llm_call": 3}
+_OTLP_STATUS = {"ok": 1, "error": 2}
+
+
+class TraceSpan(BaseModel):
+    """A timed unit of work: the pipeline, one stage, or one LLM call."""
+
+    span_id: str = Field(..., description="16-hex-digit span identifier")
+    parent_id: Optional[str] = Field(default=None, description="Parent span identifier")
+    name: str = Field(..., description="Span name, e.g. 'absorb' or 'llm.absorb'")
+    kind: str = Field(default="stage", description="pipeline/stage/llm_call")
+    start: float = Field(default=0.0, description="Start time (unix seconds)")
+    end: float = Field(default=0.0, description="End time (unix seconds)")
+    queue_wait_ms: float = Field(default=0.0, description="Time waiting to be scheduled before start")
+    router_wait_ms: float = Field(
+        default=0.0,
+        description="Time inside the span waiting for an endpoint (rate budgets, cooldowns, saturation)",
+    )
+    ttfb_ms: Optional[float] = Field(default=None, description="Time to first byte, when the backend reports it")
+    prompt_tokens: int = Field(default=0, description="Prompt tokens used")
+    completion_tokens: int = Field(default=0, description="Completion tokens used")
+    retries: int = Field(default=0, description="Retries before the final attempt")
+    cost_usd: float = Field(default=0.0, description="Cost of the call in USD")
+    status: str = Field(default="ok", description="ok/error")
+    error: Optional[str] = Field(default=None, description="Error message if any")
+    attributes: Dict[str, Any] = Field(default_factory=dict, description="Extra attributes (member_id, agent, ...)")
+
+    @property
+    def duration_ms(self) -> float:
+        return max(0.0, (self.end - self.start) * 1000)
+
+
+class PipelineTrace(BaseModel):
+    """Span tree recorded for one pipeline run."""
+
+    trace_id: str = Field(default="", description="32-hex-digit trace identifier")
+    spans: List[TraceSpan] = Field(default_factory=list, description="All spans of the run")
+
+    def llm_calls(self) -> List[TraceSpan]:
+        """Return LLM-call spans sorted by duration, slowest first."""
+        calls = [s for s in self.spans if s.kind == "llm_call"]
+        return sorted(calls, key=lambda s: s.duration_ms, reverse=True)
+
+    def llm_cost_usd(self) -> float:
+        """Cost of the LLM calls that completed, in USD."""
+        return sum(s.cost_usd for s in self.spans if s.kind == "llm_call" and s.status == "ok")
+
+    def to_otlp(self, service_name: str = "dpr-simulator") -> Dict[str, Any]:
+        """Export as an OTLP/JSON ``ExportTraceServiceRequest`` payload."""
+
+        def attr(key: str, value: Any) -> Dict[str, Any]:
+            if isinstance(value, bool):
+                return {"key": key, "value": {"boolValue": value}}
+            if isinstance(value, int):
+                return {"key": key, "value": {"intValue": str(value)}}
+            if isinstance(value, float):
+                return {"key": key, "value": {"doubleValue": value}}
+            return {"key": key, "value": {"stringValue": str(value)}}
+
+        spans = []
+        for s in self.spans:
+            attributes = [attr(k, v) for k, v in s.attributes.items()]
+            attributes += [
+                attr("dpr.kind", s.kind),
+                attr("dpr.queue_wait_ms", s.queue_wait_ms),
+                attr("dpr.router_wait_ms", s.router_wait_ms),
+                attr("dpr.retries", s.retries),
+                attr("gen_ai.usage.input_tokens", s.prompt_tokens),
+                attr("gen_ai.usage.output_tokens", s.completion_tokens),
+            ]
+            if s.ttfb_ms is not None:
+                attributes.append(attr("dpr.ttfb_ms", s.ttfb_ms))
+            span = {
+                "traceId": self.trace_id,
+                "spanId": s.span_id,
+                "name": s.name,
+                "kind": _OTLP_KIND.get(s.kind, 1),
+                "startTimeUnixNano": str(int(s.start * 1e9)),
+                "endTimeUnixNano": str(int(s.end * 1e9)),
+                "attributes": attributes,
+                "status": {"code": _OTLP_STATUS.get(s.status, 0), "message": s.error or ""},
+            }
+            if s.parent_id:
+                span["parentSpanId"] = s.parent_id
+            spans.append(span)
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [attr("service.name", service_name)]},
+                    "scopeSpans": [{"scope": {"name": "dpr-simulator"}, "spans": spans}],
+                }
+            ]
+        }
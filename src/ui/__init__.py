@@ -1,5 +1,14 @@
 """UI module for DPR AI Simulator."""
 
-from .app import create_app, launch_app
+from typing import Any
 
 __all__ = ["create_app", "launch_app"]
+
+
+def __getattr__(name: str) -> Any:
+    # Gradio is only imported when the UI is actually built
+    if name in __all__:
+        from . import app
+
+        return getattr(app, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,16 +1,29 @@
 """Gradio UI for DPR AI Simulator."""
 
 import asyncio
-import json
 from datetime import datetime
-from typing import List, Generator, Tuple, Any
+from typing import Dict, Iterator, List, AsyncGenerator, Tuple, Any
 
 import gradio as gr
-import pandas as pd
 
 from ..config import settings
-from ..core import DPRSimulator, DPRMemberFactory
-from ..models import Aspirasi, DPRMember
+from ..core.metrics import start_metrics_server
+from ..core.profiling import profile_section
+from .sessions import simulator_pool
+from .timeline import render_timeline, straggler_summary
+from .tables import (
+    DEFAULT_PAGE_SIZE,
+    MEMBER_COLUMNS,
+    PAGE_SIZES,
+    RESPONSE_COLUMNS,
+    TABLE_NAMES,
+    PagedTable,
+    default_view,
+    response_to_row,
+    roster_table,
+)
+from ..models import Aspirasi, AbsorpsiResponse
+from ..core.classifier import AUTO_CATEGORY
 from ..core.komisi_data import KOMISI_LIST
 from ..config.examples import (
     ASPIRATION_1, ASPIRATION_2, ASPIRATION_3, ASPIRATION_4,
@@ -106,6 +119,11 @@ def format_result_for_display(result) -> str:
 
     # Aspirasi info
     output.append(f"**Aspirasi Diterima:** {result.aspirasi.content}\n")
+    if result.duplikat_dari is not None:
+        output.append(
+            f"♻️ *Aspirasi ini mirip ({result.kemiripan_duplikat:.0%}) dengan aspirasi #{result.duplikat_dari}; "
+            f"hasil pemrosesannya digunakan ulang.*\n"
+        )
     output.append(f"**Kategori:** {result.aspirasi.category}")
     output.append(f"**Sumber:** {result.aspirasi.source}")
     output.append(f"**Prioritas:** {result.aspirasi.priority}\n")
@@ -146,6 +164,24 @@ def format_result_for_display(result) -> str:
     output.append("---\n### 📈 Statistik Pemrosesan\n")
     output.append(f"- **Status Kompilasi:** {result.kompilasi.status}")
     output.append(f"- **Total Biaya Pemrosesan:** ${result.total_cost_usd:.6f} (~Rp {result.total_cost_usd * 16800:.0f})\n")
+    if sim.absorb_mode == "cascade":
+        output.append(
+            f"- **Mode Kaskade:** {sim.panggilan_triase} panggilan triase "
+            f"(${sim.biaya_triase_usd:.6f}), {sim.panggilan_lengkap} panggilan lengkap, "
+            f"estimasi hemat ${sim.estimasi_penghematan_usd:.6f}\n"
+        )
+    if sim.anggota_dinilai_aturan:
+        output.append(
+            f"- **Pra-penilaian Aturan:** {sim.anggota_dinilai_aturan} anggota dinilai tanpa panggilan LLM"
+            + ("" if sim.absorb_mode == "cascade" else f", estimasi hemat ${sim.estimasi_penghematan_usd:.6f}")
+            + "\n"
+        )
+
+    if sim.tanggapan_dari_memo:
+        output.append(
+            f"- **Tanggapan Digunakan Ulang:** {sim.tanggapan_dari_memo} anggota sudah menanggapi aspirasi "
+            f"yang sama sebelumnya, tanpa panggilan LLM baru\n"
+        )
 
     # Kompilasi
     if result.kompilasi.status == "terkumpul":
@@ -195,23 +231,67 @@ def format_result_for_display(result) -> str:
     return "\n".join(output)
 
 
-def members_to_dataframe(members: List[DPRMember]) -> pd.DataFrame:
-    """Convert list of DPRMember to a DataFrame for display."""
-    if not members:
-        return pd.DataFrame(columns=["ID", "Nama", "Fraksi", "Komisi", "Dapil", "Provinsi", "Keahlian"])
-    
-    data = []
-    for m in members:
-        data.append({
-            "ID": m.id,
-            "Nama": m.name,
-            "Fraksi": m.faction,
-            "Komisi": m.komisi,
-            "Dapil": m.dapil,
-            "Provinsi": m.province,
-            "Keahlian": ", ".join(m.expertise) if m.expertise else "-",
-        })
-    return pd.DataFrame(data)
+def format_live_stats(counts: dict, responded: int) -> str:
+    """Format live relevance counters shown while members are responding."""
+    return (
+        f"**Merespons:** {responded} anggota &nbsp;|&nbsp; "
+        f"🟢 Tinggi: {counts['Tinggi']} &nbsp;|&nbsp; "
+        f"🟡 Sedang: {counts['Sedang']} &nbsp;|&nbsp; "
+        f"🔴 Rendah: {counts['Rendah']}"
+    )
+
+
+def default_views() -> Dict[str, Dict[str, Any]]:
+    """Default view parameters for every table."""
+    return {name: default_view() for name in TABLE_NAMES}
+
+
+def render_tables(tables: Dict[str, PagedTable], views: Dict[str, Dict[str, Any]] | None) -> Tuple:
+    """Render the visible page of every table.
+
+    Returns a flat tuple of (rows, page_info) pairs in TABLE_NAMES order.
+    """
+    views = views or default_views()
+    output = []
+    with profile_section("ui_table"):
+        for name in TABLE_NAMES:
+            table = tables.get(name)
+            if table is None:
+                output.extend([[], ""])
+            else:
+                output.extend(table.page(**views.get(name, default_view())))
+    return tuple(output)
+
+
+def render_table_page(
+    tables: Dict[str, PagedTable] | None,
+    views: Dict[str, Dict[str, Any]] | None,
+    name: str,
+    query: str,
+    sort_by: str,
+    descending: bool,
+    page: int,
+    page_size: int,
+) -> Tuple:
+    """Gradio handler for table controls: store the view and render its page.
+
+    Returns (views, rows, page_info). The session's views dict is updated in
+    place, so a run that is still streaming renders the new view on its next
+    update instead of the one captured when it was submitted.
+    """
+    views = views if views is not None else default_views()
+    views[name] = {
+        "query": query,
+        "sort_by": sort_by,
+        "descending": descending,
+        "page": page,
+        "page_size": page_size,
+    }
+    table = (tables or {}).get(name)
+    if table is None:
+        return views, [], ""
+    rows, info = table.page(**views[name])
+    return views, rows, info
 
 
 async def process_aspirasi_async(
@@ -223,31 +303,43 @@ async def process_aspirasi_async(
     member_count: int,
     sample_size: int,
     api_key: str,
-) -> Generator:
+    history: List | None = None,
+    views: Dict[str, Dict[str, Any]] | None = None,
+) -> AsyncGenerator:
     """Process aspiration asynchronously with streaming updates.
-    
-    Yields tuples of (messages, all_members_df, relevant_members_df, responding_members_df)
+
+    Used directly as a native async Gradio event handler, so it runs on the
+    server's event loop instead of a private loop per request.
+
+    Member responses are streamed into the responding-members table and the
+    relevance counters as each absorb call completes. Tables are kept on the
+    server and only the visible page of each is sent to the browser.
+
+    When the run is abandoned (the clear button cancels the event, or the
+    browser tab or HTTP client disconnects) the simulation task is
+    cancelled, so its outstanding LLM calls are aborted.
+
+    Yields tuples of (messages, members_rows, members_info, relevant_rows,
+    relevant_info, responses_rows, responses_info, live_stats, tables,
+    timeline_summary, timeline_html)
     """
 
-    # Empty dataframes for initial state
-    empty_df = pd.DataFrame(columns=["ID", "Nama", "Fraksi", "Komisi", "Dapil", "Provinsi", "Keahlian"])
-    empty_response_df = pd.DataFrame(columns=["ID", "Nama", "Fraksi", "Komisi", "Provinsi", "Relevansi", "Sikap", "Tanggapan"])
+    tables: Dict[str, PagedTable] = {}
+    # The session's views state; table controls update it in place while the run streams
+    views = views if views is not None else default_views()
 
     # Validate API key
     if not api_key:
         yield (
             [{"role": "assistant", "content": "❌ Error: Mohon masukkan OpenAI API Key terlebih dahulu."}],
-            empty_df, empty_df, empty_response_df
+            *render_tables(tables, views), "", tables, "", ""
         )
         return
 
-    # Initialize simulator
-    simulator = DPRSimulator(api_key=api_key)
-    simulator.create_members(member_count)
-    
-    # Get all members for display
-    all_members = simulator.members
-    all_members_df = members_to_dataframe(all_members)
+    # Reuse a long-lived simulator (and its cached roster table) for this API key and member count
+    simulator = simulator_pool.get(api_key, member_count)
+    tables["members"] = roster_table(simulator)
+    tables["responses"] = PagedTable(RESPONSE_COLUMNS)
 
     # Create aspiration
     aspirasi = Aspirasi(
@@ -262,8 +354,21 @@ async def process_aspirasi_async(
     # Progress messages - Gradio 6.x uses OpenAI-style message format by default
     messages = []
 
+    # Live state updated as each absorb response arrives
+    counts = {"Tinggi": 0, "Sedang": 0, "Rendah": 0}
+    events: asyncio.Queue = asyncio.Queue()
+
     def progress_callback(msg: str):
-        messages.append({"role": "assistant", "content": msg})
+        events.put_nowait(("log", msg))
+
+    def response_callback(resp: AbsorpsiResponse):
+        events.put_nowait(("response", resp))
+
+    timeline = ["", ""]
+
+    def snapshot():
+        stats = format_live_stats(counts, len(tables["responses"]))
+        return (messages, *render_tables(tables, views), stats, tables, *timeline)
 
     # Initial message
     user_msg = f"**Aspirasi Baru**\n\n{content}\n\n*Kategori: {category} | Komisi: {komisi} | Sumber: {source} | Prioritas: {priority}*"
@@ -272,53 +377,72 @@ async def process_aspirasi_async(
     messages.append({"role": "assistant", "content": f"🚀 Memulai simulasi dengan {member_count} anggota DPR"})
     
     # Yield initial state with all members populated
-    yield (messages, all_members_df, empty_df, empty_response_df)
+    yield snapshot()
 
     # Process
+    task = None
     try:
         # Resolve komisi filter
         komisi_filter = komisi if komisi != "Auto (Sesuai Kategori)" else None
 
-        result = await simulator.process_aspirasi(
-            aspirasi,
-            sample_size=sample_size,
-            komisi_filter=komisi_filter,
-            progress_callback=progress_callback,
+        task = asyncio.create_task(
+            simulator.process_aspirasi(
+                aspirasi,
+                sample_size=sample_size,
+                komisi_filter=komisi_filter,
+                progress_callback=progress_callback,
+                response_callback=response_callback,
+            )
         )
-
-        # Build relevant members dataframe
-        relevant_members = []
-        if result.simulation_details and result.simulation_details.relevant_member_ids:
-            for m in all_members:
-                if m.id in result.simulation_details.relevant_member_ids:
-                    relevant_members.append(m)
-        relevant_members_df = members_to_dataframe(relevant_members)
-        
-        # Build responding members dataframe with their responses
-        responding_data = []
-        for resp in result.tanggapan_anggota:
-            # Find the member
-            member = next((m for m in all_members if m.id == resp.member_id), None)
-            if member:
-                responding_data.append({
-                    "ID": member.id,
-                    "Nama": member.name,
-                    "Fraksi": member.faction,
-                    "Komisi": member.komisi,
-                    "Provinsi": member.province,
-                    "Relevansi": resp.relevansi,
-                    "Sikap": resp.sentiment,
-                    "Tanggapan": f'"{resp.quote}"' if resp.quote else resp.alasan_relevansi,
-                })
-        responding_members_df = pd.DataFrame(responding_data) if responding_data else empty_response_df
+        task.add_done_callback(lambda _: events.put_nowait(("done", None)))
+
+        # Stream updates: drain every pending event, then yield one update
+        done = False
+        while not done:
+            pending = [await events.get()]
+            while not events.empty():
+                pending.append(events.get_nowait())
+
+            for kind, payload in pending:
+                if kind == "log":
+                    messages.append({"role": "assistant", "content": payload})
+                elif kind == "response":
+                    member = simulator.members_by_id.get(payload.member_id)
+                    if member:
+                        tables["responses"].append(response_to_row(member, payload))
+                    level = payload.relevansi.strip().capitalize()
+                    if payload.error is None and level in counts:
+                        counts[level] += 1
+                else:
+                    done = True
+
+            if not done:
+                yield snapshot()
+
+        result = task.result()
+
+        # Build relevant members table
+        with profile_section("ui_table"):
+            tables["relevant"] = PagedTable.from_members([
+                simulator.members_by_id[member_id]
+                for member_id in result.simulation_details.relevant_member_ids
+                if member_id in simulator.members_by_id
+            ])
+
+        # Execution timeline of this run
+        timeline[:] = [straggler_summary(result.trace), render_timeline(result.trace)]
 
         # Final result
         messages.append({"role": "assistant", "content": format_result_for_display(result)})
-        yield (messages, all_members_df, relevant_members_df, responding_members_df)
+        yield snapshot()
 
     except Exception as e:
         messages.append({"role": "assistant", "content": f"❌ Error: {str(e)}"})
-        yield (messages, all_members_df, empty_df, empty_response_df)
+        yield snapshot()
+    finally:
+        # Reached on cancellation and when the client goes away mid-stream
+        if task is not None and not task.done():
+            task.cancel()
 
 
 def process_aspirasi_sync(
@@ -330,35 +454,47 @@ def process_aspirasi_sync(
     member_count: int,
     sample_size: int,
     api_key: str,
-    history: List,
-):
-    """Synchronous wrapper for async processing.
-    
-    Yields tuples of (messages, all_members_df, relevant_members_df, responding_members_df)
+    history: List | None = None,
+    views: Dict[str, Dict[str, Any]] | None = None,
+) -> Iterator[Tuple]:
+    """Synchronous wrapper around ``process_aspirasi_async`` for callers without an event loop.
+
+    The UI uses the async handler directly; this runs it on a private event
+    loop and yields the same update tuples. Closing the iterator early
+    cancels the simulation like an abandoned UI run.
     """
-    # Run async function
-    async def run():
-        async for result in process_aspirasi_async(
-            content, category, komisi, source, priority, member_count, sample_size, api_key
-        ):
-            yield result
-
-    # Use asyncio to run
     loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
+    gen = process_aspirasi_async(
+        content, category, komisi, source, priority, member_count, sample_size, api_key, history, views
+    )
     try:
-        gen = run()
         while True:
             try:
-                result = loop.run_until_complete(gen.__anext__())
-                yield result
+                yield loop.run_until_complete(gen.__anext__())
             except StopAsyncIteration:
                 break
     finally:
+        loop.run_until_complete(gen.aclose())
+        # Let the cancelled calls unwind before the loop goes away
+        pending = asyncio.all_tasks(loop)
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
         loop.close()
 
 
+def _table_controls(columns: List[str]) -> Tuple:
+    """Create filter/sort/paging controls for one table.
+
+    Returns (query, sort_by, descending, page, page_size) components.
+    """
+    with gr.Row():
+        query = gr.Textbox(label="Cari", placeholder="Filter...", scale=3)
+        sort_by = gr.Dropdown(choices=[""] + columns, value="", label="Urutkan", scale=2)
+        descending = gr.Checkbox(label="Menurun", value=False, scale=1)
+        page = gr.Number(label="Halaman", value=1, precision=0, minimum=1, scale=1)
+        page_size = gr.Dropdown(choices=PAGE_SIZES, value=DEFAULT_PAGE_SIZE, label="Baris", scale=1)
+    return query, sort_by, descending, page, page_size
+
+
 def create_app() -> gr.Blocks:
     """Create the Gradio application."""
 
@@ -394,9 +530,9 @@ def create_app() -> gr.Blocks:
 
                 api_key = gr.Textbox(
                     label="OpenAI API Key",
-                    placeholder="sk-...",
+                    placeholder="sk-... (beberapa key dipisahkan koma)",
                     type="password",
-                    info="API key Anda tidak disimpan dan hanya digunakan untuk sesi ini. Silahkan buat di https://platform.openai.com/api-keys.",
+                    info="API key Anda tidak disimpan dan hanya digunakan untuk sesi ini. Beberapa key dipisahkan koma akan dirotasi untuk throughput lebih tinggi. Silahkan buat di https://platform.openai.com/api-keys.",
                 )
 
                 with gr.Accordion("Pengaturan Simulasi", open=False):
@@ -441,6 +577,7 @@ def create_app() -> gr.Blocks:
                 with gr.Row():
                     category = gr.Dropdown(
                         choices=[
+                            AUTO_CATEGORY,
                             "Ekonomi", "Pendidikan", "Kesehatan", "Infrastruktur",
                             "Pertanian", "Kelautan", "Energi", "Hukum", "Teknologi",
                             "Sosial", "Lingkungan", "Pertahanan", "Keuangan",
@@ -490,31 +627,47 @@ def create_app() -> gr.Blocks:
                 clear_btn = gr.Button("🗑️ Bersihkan", variant="secondary")
                 
                 # Simulation Details Panel
-                gr.Markdown("### 🏛️ Detail Simulasi")
-                
-                with gr.Accordion("📋 Semua Anggota DPR (Generated)", open=False):
-                    all_members_df = gr.Dataframe(
-                        headers=["ID", "Nama", "Fraksi", "Komisi", "Dapil", "Provinsi", "Keahlian"],
-                        label="Daftar Semua Anggota DPR dalam Simulasi",
-                        interactive=False,
-                        wrap=True,
-                    )
-                
-                with gr.Accordion("🎯 Anggota Relevan Terpilih (Sample)", open=False):
-                    relevant_members_df = gr.Dataframe(
-                        headers=["ID", "Nama", "Fraksi", "Komisi", "Dapil", "Provinsi", "Keahlian"],
-                        label="Anggota yang Terpilih Berdasarkan Relevansi",
-                        interactive=False,
-                        wrap=True,
-                    )
-                
-                with gr.Accordion("✅ Anggota yang Merespons & Relevansinya", open=True):
-                    responding_members_df = gr.Dataframe(
-                        headers=["ID", "Nama", "Fraksi", "Komisi", "Provinsi", "Relevansi", "Sikap", "Tanggapan"],
-                        label="Detail Respons dari Setiap Anggota",
-                        interactive=False,
-                        wrap=True,
-                    )
+                with gr.Tabs():
+                    with gr.Tab("🏛️ Detail Simulasi"):
+                        # Tables live on the server (tables_state); only the visible page is sent
+                        tables_state = gr.State({})
+                        views_state = gr.State(default_views())
+                        table_controls = {}
+
+                        with gr.Accordion("📋 Semua Anggota DPR (Generated)", open=False):
+                            table_controls["members"] = _table_controls(MEMBER_COLUMNS)
+                            all_members_df = gr.Dataframe(
+                                headers=MEMBER_COLUMNS,
+                                label="Daftar Semua Anggota DPR dalam Simulasi",
+                                interactive=False,
+                                wrap=True,
+                            )
+                            all_members_info = gr.Markdown()
+
+                        with gr.Accordion("🎯 Anggota Relevan Terpilih (Sample)", open=False):
+                            table_controls["relevant"] = _table_controls(MEMBER_COLUMNS)
+                            relevant_members_df = gr.Dataframe(
+                                headers=MEMBER_COLUMNS,
+                                label="Anggota yang Terpilih Berdasarkan Relevansi",
+                                interactive=False,
+                                wrap=True,
+                            )
+                            relevant_members_info = gr.Markdown()
+
+                        with gr.Accordion("✅ Anggota yang Merespons & Relevansinya", open=True):
+                            live_stats = gr.Markdown()
+                            table_controls["responses"] = _table_controls(RESPONSE_COLUMNS)
+                            responding_members_df = gr.Dataframe(
+                                headers=RESPONSE_COLUMNS,
+                                label="Detail Respons dari Setiap Anggota",
+                                interactive=False,
+                                wrap=True,
+                            )
+                            responding_members_info = gr.Markdown()
+
+                    with gr.Tab("⏱️ Timeline Eksekusi"):
+                        timeline_summary = gr.Markdown()
+                        timeline_html = gr.HTML()
 
         # Example aspirations - store full text separately
         aspiration_1 = ASPIRATION_1
@@ -589,19 +742,47 @@ Where **N** = sample size (number of DPR members processing the aspiration)
         """)
 
         # Event handlers
-        submit_btn.click(
-            fn=process_aspirasi_sync,
-            inputs=[content, category, komisi, source, priority, member_count, sample_size, api_key, chatbot],
-            outputs=[chatbot, all_members_df, relevant_members_df, responding_members_df],
+        table_outputs = {
+            "members": (all_members_df, all_members_info),
+            "relevant": (relevant_members_df, relevant_members_info),
+            "responses": (responding_members_df, responding_members_info),
+        }
+        submit_event = submit_btn.click(
+            fn=process_aspirasi_async,
+            api_name="process_aspirasi",
+            inputs=[content, category, komisi, source, priority, member_count, sample_size, api_key, chatbot, views_state],
+            outputs=[
+                chatbot,
+                *[component for name in TABLE_NAMES for component in table_outputs[name]],
+                live_stats,
+                tables_state,
+                timeline_summary,
+                timeline_html,
+            ],
         )
 
-        # Clear all outputs
-        empty_df = pd.DataFrame(columns=["ID", "Nama", "Fraksi", "Dapil", "Provinsi", "Keahlian"])
-        empty_response_df = pd.DataFrame(columns=["ID", "Nama", "Fraksi", "Provinsi", "Relevansi", "Alasan"])
-        
+        # Paging, filtering and sorting re-render one table from server-side state
+        for name in TABLE_NAMES:
+            controls = table_controls[name]
+            for control in controls:
+                control.change(
+                    fn=lambda tables, views, *view, name=name: render_table_page(tables, views, name, *view),
+                    inputs=[tables_state, views_state, *controls],
+                    outputs=[views_state, *table_outputs[name]],
+                )
+
+        # Clear all outputs, stopping a simulation still running
         clear_btn.click(
-            fn=lambda: ([], empty_df, empty_df, empty_response_df),
-            outputs=[chatbot, all_members_df, relevant_members_df, responding_members_df],
+            fn=lambda: ([], *render_tables({}, None), "", {}, "", ""),
+            cancels=[submit_event],
+            outputs=[
+                chatbot,
+                *[component for name in TABLE_NAMES for component in table_outputs[name]],
+                live_stats,
+                tables_state,
+                timeline_summary,
+                timeline_html,
+            ],
         )
 
     return app
@@ -609,7 +790,14 @@ Where **N** = sample size (number of DPR members processing the aspiration)
 
 def launch_app():
     """Launch the Gradio application."""
+    if settings.metrics_port:
+        start_metrics_server(settings.metrics_port, settings.metrics_host)
+
     app = create_app()
+    app.queue(
+        default_concurrency_limit=settings.gradio_concurrency_limit,
+        max_size=settings.gradio_max_queue_size,
+    )
     app.launch(
         server_name=settings.gradio_server_name,
         server_port=settings.gradio_server_port,
@@ -0,0 +1,68 @@
+"""Long-lived simulator sessions shared across Gradio requests."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+from ..config import settings
+from ..core import DPRSimulator
+from ..core.metrics import metrics
+
+
+class SimulatorPool:
+    """
+    LRU pool of ready-to-use DPRSimulator instances.
+
+    Simulators are keyed by API key and member count, so repeated clicks (and
+    concurrent users sharing a key) reuse the same agents, LLM clients and
+    member roster instead of rebuilding them per request.
+    """
+
+    def __init__(self, max_size: int | None = None):
+        """
+        Initialize the pool.
+
+        Args:
+            max_size: Maximum number of cached simulators (defaults to settings)
+        """
+        self.max_size = max_size or settings.simulator_pool_size
+        self._simulators: "OrderedDict[Tuple[str, int], DPRSimulator]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(api_key: str, member_count: int) -> Tuple[str, int]:
+        # Never keep raw API keys as dictionary keys
+        return hashlib.sha256(api_key.encode()).hexdigest(), int(member_count)
+
+    def get(self, api_key: str, member_count: int) -> DPRSimulator:
+        """
+        Return the simulator for this API key and member count, creating it if needed.
+
+        Args:
+            api_key: OpenAI API key of the session
+            member_count: Number of simulated DPR members
+
+        Returns:
+            A DPRSimulator with its members already created
+        """
+        key = self._key(api_key, member_count)
+        with self._lock:
+            simulator = self._simulators.get(key)
+            metrics.record_cache("simulator_pool", simulator is not None)
+            if simulator is not None:
+                self._simulators.move_to_end(key)
+                return simulator
+
+            simulator = DPRSimulator(api_key=api_key)
+            simulator.create_members(int(member_count))
+            self._simulators[key] = simulator
+            while len(self._simulators) > self.max_size:
+                self._simulators.popitem(last=False)
+            return simulator
+
+    def __len__(self) -> int:
+        return len(self._simulators)
+
+
+simulator_pool = SimulatorPool()
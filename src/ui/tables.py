@@ -0,0 +1,179 @@
+"""Server-side paginated, filterable and sortable tables for the Gradio UI."""
+
+import math
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ..core import DPRSimulator
+from ..core.analytics import NO_STANCE_TIERS
+from ..models import AbsorpsiResponse, DPRMember
+
+
+MEMBER_COLUMNS = ["ID", "Nama", "Fraksi", "Komisi", "Dapil", "Provinsi", "Keahlian"]
+RESPONSE_COLUMNS = ["ID", "Nama", "Fraksi", "Komisi", "Provinsi", "Relevansi", "Sikap", "Tanggapan"]
+
+PAGE_SIZES = [10, 25, 50, 100]
+DEFAULT_PAGE_SIZE = 25
+
+# Table names used in the UI state
+TABLE_NAMES = ["members", "relevant", "responses"]
+
+
+def member_to_row(m: DPRMember) -> List[Any]:
+    """Build one row of a member table."""
+    return [
+        m.id,
+        m.name,
+        m.faction,
+        m.komisi,
+        m.dapil,
+        m.province,
+        ", ".join(m.expertise) if m.expertise else "-",
+    ]
+
+
+def response_to_row(member: DPRMember, resp: AbsorpsiResponse) -> List[Any]:
+    """Build one row of the responding-members table."""
+    return [
+        member.id,
+        member.name,
+        member.faction,
+        member.komisi,
+        member.province,
+        resp.relevansi,
+        resp.sentiment if resp.tier not in NO_STANCE_TIERS else "-",
+        f'"{resp.quote}"' if resp.quote else resp.alasan_relevansi,
+    ]
+
+
+def default_view() -> Dict[str, Any]:
+    """Default view parameters for a table."""
+    return {
+        "query": "",
+        "sort_by": "",
+        "descending": False,
+        "page": 1,
+        "page_size": DEFAULT_PAGE_SIZE,
+    }
+
+
+class PagedTable:
+    """
+    Rows kept on the server; only the requested page is sent to the browser.
+
+    Rows can be appended while a run is streaming. The pandas frame (with a
+    lower-cased search column) is built lazily, only when a filter or sort is
+    requested, and reused until new rows arrive.
+
+    Tables are shared between a session's handlers, and the synchronous
+    paging handlers run in Gradio's thread pool. Each cache is therefore
+    one tuple, replaced in a single assignment and tagged with what it was
+    built from, so a concurrent request never pairs one request's rows
+    with another's key.
+    """
+
+    def __init__(self, columns: List[str], rows: Optional[List[List[Any]]] = None):
+        self.columns = columns
+        self._rows: List[List[Any]] = list(rows or [])
+        # (row count, frame, search column) and (key, (rows, info)) of the last page
+        self._indexed: Optional[Tuple[int, pd.DataFrame, pd.Series]] = None
+        self._last: Optional[Tuple[Tuple, Tuple[List[List[Any]], str]]] = None
+
+    @classmethod
+    def from_members(cls, members: List[DPRMember]) -> "PagedTable":
+        """Create a member table from DPRMember instances."""
+        return cls(MEMBER_COLUMNS, [member_to_row(m) for m in members])
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def append(self, row: List[Any]) -> None:
+        """Append a row; caches built from fewer rows are no longer used."""
+        self._rows.append(row)
+
+    def _build_frame(self, count: int) -> Tuple[pd.DataFrame, pd.Series]:
+        """Frame and search column of the first ``count`` rows."""
+        indexed = self._indexed
+        if indexed is None or indexed[0] != count:
+            frame = pd.DataFrame(self._rows[:count], columns=self.columns)
+            search = (
+                frame.astype(str).agg(" ".join, axis=1).str.lower()
+                if len(frame)
+                else pd.Series([], dtype=str)
+            )
+            indexed = (count, frame, search)
+            self._indexed = indexed
+        return indexed[1], indexed[2]
+
+    def page(
+        self,
+        page: int = 1,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        query: str = "",
+        sort_by: str = "",
+        descending: bool = False,
+    ) -> Tuple[List[List[Any]], str]:
+        """
+        Return one page of rows plus a short page-info label.
+
+        Args:
+            page: 1-based page number (clamped to the valid range)
+            page_size: Rows per page
+            query: Case-insensitive substring filter across all columns
+            sort_by: Column to sort by (empty keeps insertion order)
+            descending: Sort direction
+
+        Returns:
+            Tuple of (rows of the page, page-info markdown)
+        """
+        page_size = max(1, int(page_size or DEFAULT_PAGE_SIZE))
+        query = (query or "").strip().lower()
+        sort_by = sort_by if sort_by in self.columns else ""
+        key = (len(self._rows), page, page_size, query, sort_by, descending)
+        last = self._last
+        if last is not None and last[0] == key:
+            return last[1]
+
+        if not query and not sort_by:
+            # Fast path: slice the row list without touching pandas
+            total = key[0]
+            page, start = self._clamp(page, page_size, total)
+            rows = self._rows[start : min(start + page_size, total)]
+        else:
+            frame, search = self._build_frame(key[0])
+            if query:
+                frame = frame[search.str.contains(query, regex=False)]
+            if sort_by:
+                frame = frame.sort_values(sort_by, ascending=not descending, kind="stable")
+            total = len(frame)
+            page, start = self._clamp(page, page_size, total)
+            rows = frame.iloc[start : start + page_size].values.tolist()
+
+        pages = max(1, math.ceil(total / page_size))
+        info = f"Halaman {page}/{pages} · {total} baris"
+        if query:
+            info += f" (difilter dari {key[0]})"
+
+        self._last = (key, (rows, info))
+        return rows, info
+
+    @staticmethod
+    def _clamp(page: int, page_size: int, total: int) -> Tuple[int, int]:
+        pages = max(1, math.ceil(total / page_size))
+        page = min(max(1, int(page or 1)), pages)
+        return page, (page - 1) * page_size
+
+
+# Full-roster tables cached per (long-lived) simulator session
+_roster_tables: "weakref.WeakKeyDictionary[DPRSimulator, PagedTable]" = weakref.WeakKeyDictionary()
+
+
+def roster_table(simulator: DPRSimulator) -> PagedTable:
+    """Return the cached full-roster table of a simulator, building it once."""
+    table = _roster_tables.get(simulator)
+    if table is None or len(table) != len(simulator.members):
+        table = PagedTable.from_members(simulator.members)
+        _roster_tables[simulator] = table
+    return table
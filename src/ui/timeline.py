@@ -0,0 +1,150 @@
+"""Gantt-style timeline rendering of pipeline traces for the Gradio UI."""
+
+import html
+from typing import Dict, List
+
+from ..models import PipelineTrace, TraceSpan
+
+
+SPAN_COLORS = {
+    "pipeline": "#3b82f6",
+    "stage": "#60a5fa",
+    "llm_call": "#ed8936",
+}
+ERROR_COLOR = "#e53e3e"
+QUEUE_COLOR = "#475569"
+ROUTER_COLOR = "#a855f7"
+
+
+def _ordered_spans(trace: PipelineTrace) -> List[TraceSpan]:
+    """Order spans depth-first (parent before children, siblings by start)."""
+    children: Dict[str, List[TraceSpan]] = {}
+    roots = []
+    for s in trace.spans:
+        if s.parent_id:
+            children.setdefault(s.parent_id, []).append(s)
+        else:
+            roots.append(s)
+
+    ordered: List[TraceSpan] = []
+
+    def visit(s: TraceSpan) -> None:
+        ordered.append(s)
+        for child in sorted(children.get(s.span_id, []), key=lambda c: c.start):
+            visit(child)
+
+    for root in sorted(roots, key=lambda r: r.start):
+        visit(root)
+    return ordered
+
+
+def _label(s: TraceSpan) -> str:
+    if s.kind == "llm_call" and "member_id" in s.attributes:
+        return f"Anggota #{s.attributes['member_id']}"
+    if s.kind == "llm_call":
+        return s.name
+    return s.name.capitalize()
+
+
+def render_timeline(trace: PipelineTrace) -> str:
+    """
+    Render a trace as an HTML Gantt chart.
+
+    Each span is a bar positioned on a shared time axis; LLM calls show their
+    queue wait as a grey lead-in, the time spent waiting for an endpoint's
+    rate budget or cooldown as a purple head of the bar and retries as a ↻
+    marker, so stragglers, rate limiting and scheduler waits are visible at
+    a glance.
+
+    Args:
+        trace: The pipeline trace to render
+
+    Returns:
+        HTML string (empty when the trace has no spans)
+    """
+    if not trace.spans:
+        return ""
+
+    spans = _ordered_spans(trace)
+    t0 = min(s.start - s.queue_wait_ms / 1000 for s in spans)
+    t1 = max(s.end for s in spans)
+    total = max(t1 - t0, 1e-6)
+
+    rows = []
+    for s in spans:
+        queue_left = (s.start - s.queue_wait_ms / 1000 - t0) / total * 100
+        queue_width = s.queue_wait_ms / 1000 / total * 100
+        left = (s.start - t0) / total * 100
+        width = max((s.end - s.start) / total * 100, 0.2)
+        router_width = min(s.router_wait_ms / 1000 / total * 100, width)
+        color = ERROR_COLOR if s.status == "error" else SPAN_COLORS.get(s.kind, "#94a3b8")
+        indent = {"pipeline": 0, "stage": 12, "llm_call": 24}.get(s.kind, 0)
+
+        tooltip = (
+            f"{s.name} | {s.duration_ms:.0f} ms | antre {s.queue_wait_ms:.0f} ms"
+            + (f" | tunggu kuota {s.router_wait_ms:.0f} ms" if s.router_wait_ms else "")
+            + (f" | TTFB {s.ttfb_ms:.0f} ms" if s.ttfb_ms is not None else "")
+            + f" | token {s.prompt_tokens}+{s.completion_tokens} | retry {s.retries}"
+            + (f" | {s.error}" if s.error else "")
+        )
+        retry_marker = f" ↻{s.retries}" if s.retries else ""
+
+        rows.append(
+            f'<div style="display:flex;align-items:center;height:18px;font-size:11px;" title="{html.escape(tooltip)}">'
+            f'<div style="width:140px;padding-left:{indent}px;color:#e2e8f0;white-space:nowrap;overflow:hidden;">'
+            f"{html.escape(_label(s))}{retry_marker}</div>"
+            f'<div style="position:relative;flex:1;height:12px;background:rgba(255,255,255,0.04);">'
+            + (
+                f'<div style="position:absolute;left:{queue_left:.3f}%;width:{queue_width:.3f}%;height:100%;background:{QUEUE_COLOR};"></div>'
+                if queue_width > 0
+                else ""
+            )
+            + f'<div style="position:absolute;left:{left:.3f}%;width:{width:.3f}%;height:100%;background:{color};border-radius:2px;"></div>'
+            + (
+                f'<div style="position:absolute;left:{left:.3f}%;width:{router_width:.3f}%;height:100%;background:{ROUTER_COLOR};"></div>'
+                if router_width > 0
+                else ""
+            )
+            + f"</div>"
+            f'<div style="width:70px;text-align:right;color:#94a3b8;">{s.duration_ms:.0f} ms</div>'
+            f"</div>"
+        )
+
+    legend = (
+        f'<div style="font-size:11px;color:#94a3b8;margin-bottom:6px;">'
+        f"Total {total * 1000:.0f} ms · "
+        f'<span style="color:{SPAN_COLORS["stage"]};">■</span> tahap · '
+        f'<span style="color:{SPAN_COLORS["llm_call"]};">■</span> panggilan LLM · '
+        f'<span style="color:{QUEUE_COLOR};">■</span> antre · '
+        f'<span style="color:{ROUTER_COLOR};">■</span> tunggu kuota · '
+        f'<span style="color:{ERROR_COLOR};">■</span> error · ↻ retry</div>'
+    )
+    return (
+        f'<div style="max-height:600px;overflow-y:auto;padding:8px;">{legend}{"".join(rows)}</div>'
+    )
+
+
+def straggler_summary(trace: PipelineTrace, top: int = 5) -> str:
+    """Summarize the slowest calls, queue waits and retries as markdown."""
+    calls = trace.llm_calls()
+    if not calls:
+        return ""
+
+    durations = sorted(c.duration_ms for c in calls)
+    median = durations[len(durations) // 2]
+    lines = [
+        f"**Panggilan LLM:** {len(calls)} · median {median:.0f} ms · "
+        f"maks {durations[-1]:.0f} ms · total retry {sum(c.retries for c in calls)} · "
+        f"antre maks {max(c.queue_wait_ms for c in calls):.0f} ms · "
+        f"tunggu kuota maks {max(c.router_wait_ms for c in calls):.0f} ms",
+        "",
+        "**Panggilan paling lambat:**",
+    ]
+    for c in calls[:top]:
+        ratio = c.duration_ms / median if median else 0
+        lines.append(
+            f"- {_label(c)} ({c.attributes.get('agent', '')}): {c.duration_ms:.0f} ms "
+            f"({ratio:.1f}× median), antre {c.queue_wait_ms:.0f} ms, "
+            f"tunggu kuota {c.router_wait_ms:.0f} ms, retry {c.retries}"
+        )
+    return "\n".join(lines)
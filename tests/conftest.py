@@ -0,0 +1,21 @@
+"""Shared fixtures: offline, instant LLM calls and no result store."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import settings  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def offline_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Answer every call from the fake backend without latency or rate limiting."""
+    monkeypatch.setattr(settings, "llm_backend", "fake")
+    monkeypatch.setattr(settings, "fake_llm_latency", 0.0)
+    monkeypatch.setattr(settings, "fake_llm_latency_sigma", 0.0)
+    monkeypatch.setattr(settings, "rate_limit_delay", 0.0)
+    monkeypatch.setattr(settings, "result_store_path", "")
+    monkeypatch.setattr(settings, "cassette_mode", "")
@@ -0,0 +1,74 @@
+"""Multi-aspiration-per-member absorb calls."""
+
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+from src.core import DPRSimulator
+from src.core.agents import AbsorbAgent
+from src.core.sinks import ListSink
+from src.models import Aspirasi, DPRMember
+
+MEMBER = DPRMember(
+    id=7,
+    name="Anggota Uji",
+    faction="Fraksi Uji",
+    komisi="Komisi V",
+    dapil="Jawa Tengah I",
+    province="Jawa Tengah",
+    expertise=["Infrastruktur"],
+)
+
+
+def aspirasi(i: int, content: str, priority: str = "Sedang") -> Aspirasi:
+    return Aspirasi(
+        id=i,
+        source="Jawa Tengah",
+        category="Infrastruktur",
+        content=content,
+        priority=priority,
+        timestamp=datetime.now(),
+    )
+
+
+def test_items_are_matched_by_position_not_id(monkeypatch):
+    agent = AbsorbAgent(api_key="sk-test", mode="single")
+    answer = {
+        "tanggapan": [
+            {"nomor": n, "relevansi": "Tinggi", "alasan_relevansi": "Uji", "quote": f"Tanggapan {n}"}
+            for n in (2, 1)
+        ]
+    }
+
+    async def complete(messages, **kwargs):
+        return json.dumps(answer), 0.002
+
+    monkeypatch.setattr(agent, "_complete", complete)
+    group = [aspirasi(1, "Jalan desa rusak parah."), aspirasi(1, "Jembatan gantung putus.")]
+
+    responses = asyncio.run(agent.invoke_group(MEMBER, group))
+
+    assert [r.quote for r in responses] == ["Tanggapan 1", "Tanggapan 2"]
+    assert [r.ukuran_grup for r in responses] == [2, 2]
+
+
+def test_grouped_traces_hold_their_absorb_calls():
+    simulator = DPRSimulator(api_key="sk-test", deduplicate=False, memoize=False)
+    simulator.create_members(50)
+    sink = ListSink()
+    aspirations = [aspirasi(i, f"Aspirasi nomor {i}: jalan rusak.", "Tinggi") for i in range(1, 5)]
+
+    asyncio.run(simulator.stream_multiple_aspirasi(aspirations, sink, sample_size=3, group_size=2))
+
+    assert len(sink.results) == 4
+    for result in sink.results:
+        spans = {s.span_id: s for s in result.trace.spans}
+        absorb = [s for s in spans.values() if s.name == "absorb" and s.kind == "stage"]
+        calls = [s for s in spans.values() if s.name == "llm.absorb"]
+        assert len(absorb) == 1 and len(calls) == 3
+        assert all(s.parent_id == absorb[0].span_id for s in calls)
+        assert all(s.attributes["group_size"] == 2 for s in calls)
+        # Each trace carries its share of the group calls, as the responses are priced
+        assert sum(s.cost_usd for s in calls) == pytest.approx(sum(r.cost_usd for r in result.tanggapan_anggota))
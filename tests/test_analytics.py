@@ -0,0 +1,57 @@
+"""Aggregation of member responses."""
+
+from types import SimpleNamespace
+
+from src.core.analytics import aggregate_responses, aggregate_results
+from src.core.member_factory import DPRMemberFactory
+from src.models import AbsorpsiResponse
+
+
+def test_relevance_only_tiers_have_no_sentiment():
+    members = DPRMemberFactory.create_members(3)
+    responses = [
+        AbsorpsiResponse(
+            member_id=member.id,
+            aspirasi_id=1,
+            relevansi=relevansi,
+            alasan_relevansi="Uji",
+            sentiment=sentiment,
+            tier=tier,
+        )
+        for member, (tier, relevansi, sentiment) in zip(
+            members, [("full", "Tinggi", "Positif"), ("triage", "Rendah", "Netral"), ("rules", "Rendah", "Netral")]
+        )
+    ]
+
+    analytics = aggregate_responses(responses, members)
+
+    assert analytics.relevansi_counts == {"Tinggi": 1, "Sedang": 0, "Rendah": 2}
+    assert analytics.sentiment_counts == {"Positif": 1}
+    assert analytics.fraksi_x_sentiment == {members[0].faction: {"Positif": 1}}
+
+
+def test_bulk_cross_tabs_span_every_result():
+    members = DPRMemberFactory.create_members(4)
+    results = []
+    for aspirasi_id in (1, 2):
+        responses = [
+            AbsorpsiResponse(
+                member_id=m.id,
+                aspirasi_id=aspirasi_id,
+                relevansi=" tinggi" if m.id % 2 else "RENDAH",
+                alasan_relevansi="Uji",
+                sentiment="Positif",
+                cost_usd=0.5,
+            )
+            for m in members
+        ]
+        results.append(SimpleNamespace(tanggapan_anggota=responses))
+
+    analytics = aggregate_results(results, members)
+
+    assert (analytics.jumlah_tanggapan, analytics.jumlah_aspirasi) == (8, 2)
+    assert analytics.relevansi_counts == {"Tinggi": 4, "Sedang": 0, "Rendah": 4}
+    assert analytics.komisi_x_relevansi == {
+        m.komisi: {"Tinggi" if m.id % 2 else "Rendah": 2} for m in members
+    }
+    assert sum(analytics.biaya_per_fraksi.values()) == 4.0
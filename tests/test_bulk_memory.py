@@ -0,0 +1,67 @@
+"""Memory of a streamed 10k-aspiration bulk run stays flat (tracemalloc).
+
+Takes about two minutes; skip it with ``-m "not slow"``.
+"""
+
+import asyncio
+import tracemalloc
+from datetime import datetime
+
+import pytest
+
+from src.core import DPRSimulator
+from src.core.komisi_data import CATEGORY_TO_KOMISI
+from src.core.sinks import CallbackSink
+from src.models import Aspirasi
+
+ASPIRATIONS = 10_000
+CHECKPOINTS = 10
+MAX_GROWTH_MB = 2.0
+
+
+def generate(count: int):
+    categories = list(CATEGORY_TO_KOMISI)
+    for i in range(count):
+        yield Aspirasi(
+            id=i + 1,
+            source="Jawa Tengah",
+            category=categories[i % len(categories)],
+            content=f"Aspirasi nomor {i}: jalan rusak dan layanan kesehatan kurang memadai di desa kami.",
+            priority="Sedang",
+            timestamp=datetime.now(),
+        )
+
+
+async def stream(simulator: DPRSimulator) -> list:
+    every = ASPIRATIONS // CHECKPOINTS
+    checkpoints = []
+    done = 0
+
+    def checkpoint(_result) -> None:
+        nonlocal done
+        done += 1
+        if done % every == 0:
+            checkpoints.append(tracemalloc.get_traced_memory()[0] / 1e6)
+
+    await simulator.stream_multiple_aspirasi(
+        generate(ASPIRATIONS), CallbackSink(checkpoint), sample_size=5, concurrency=32
+    )
+    return checkpoints
+
+
+@pytest.mark.slow
+def test_streamed_bulk_run_memory_is_bounded():
+    # The memo and duplicate index are bounded caches of their own; they are off here
+    simulator = DPRSimulator(api_key="sk-test", result_store_path="", deduplicate=False, memoize=False)
+    simulator.create_members(50)
+
+    tracemalloc.start()
+    try:
+        checkpoints = asyncio.run(stream(simulator))
+    finally:
+        tracemalloc.stop()
+
+    assert len(checkpoints) == CHECKPOINTS
+    # The first checkpoint absorbs one-off allocations (imports, caches, metric labels)
+    growth = checkpoints[-1] - checkpoints[1]
+    assert growth < MAX_GROWTH_MB, f"memory grew {growth:.2f} MB over the run: {checkpoints}"
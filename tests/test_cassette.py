@@ -0,0 +1,81 @@
+"""Record/replay cassettes of LLM calls."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.config import settings
+from src.core.agents import AbsorbAgent
+from src.core.cassette import Cassette, CassetteBackend, CassetteMissError, read_entries
+from src.core.routing import EndpointRouter
+from src.core.tracing import start_trace
+from src.models import Aspirasi, DPRMember, LLMEndpoint
+
+MEMBER = DPRMember(
+    id=7,
+    name="Anggota Uji",
+    faction="Fraksi Uji",
+    komisi="Komisi V",
+    dapil="Jawa Tengah I",
+    province="Jawa Tengah",
+    expertise=["Infrastruktur"],
+)
+
+
+def aspirasi(content: str = "Jalan desa rusak parah dan belum diperbaiki.") -> Aspirasi:
+    return Aspirasi(
+        id=1,
+        source="Jawa Tengah",
+        category="Infrastruktur",
+        content=content,
+        priority="Tinggi",
+        timestamp=datetime.now(),
+    )
+
+
+def replay_agent(path) -> AbsorbAgent:
+    cassette = Cassette(path, "replay", latency_scale=0)
+    router = EndpointRouter([LLMEndpoint(name="replay", api_key="sk-replay")], backend="cassette")
+    return AbsorbAgent(api_key="sk-replay", mode="single", router=router, cassette=cassette)
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    """A cassette holding one recorded absorb call, and the response it produced."""
+    path = tmp_path / "calls.jsonl.gz"
+    cassette = Cassette(path, "record")
+    agent = AbsorbAgent(api_key="sk-test", mode="single", backend="fake", cassette=cassette)
+    response = asyncio.run(agent.invoke(MEMBER, aspirasi()))
+    cassette.close()
+    return path, response
+
+
+def test_replay_reproduces_recorded_response(recorded):
+    path, response = recorded
+    assert [e["stage"] for e in read_entries(path)] == ["absorb"]
+
+    agent = replay_agent(path)
+    with start_trace() as tracer:
+        replayed = asyncio.run(agent.invoke(MEMBER, aspirasi()))
+
+    assert replayed == response
+    assert agent.cassette.hits == 1
+    calls = [s for s in tracer.spans if s.kind == "llm_call"]
+    assert [s.attributes["backend"] for s in calls] == ["cassette"]
+
+
+def test_unrecorded_request_is_a_miss(recorded):
+    path, _ = recorded
+    cassette = Cassette(path, "replay", latency_scale=0)
+    with pytest.raises(CassetteMissError):
+        asyncio.run(cassette.replay(settings.openai_model, [{"role": "user", "content": "belum direkam"}]))
+    assert cassette.misses == 1
+
+
+def test_router_from_settings_replays_without_live_backend(recorded, monkeypatch):
+    path, _ = recorded
+    monkeypatch.setattr(settings, "cassette_mode", "replay")
+    monkeypatch.setattr(settings, "cassette_path", str(path))
+    router = EndpointRouter.from_settings("sk-replay")
+    assert all(isinstance(e.backend, CassetteBackend) for e in router.endpoints)
@@ -0,0 +1,86 @@
+"""Offline category and commission classification."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.config import settings
+from src.core import DPRSimulator
+from src.core import simulator as simulator_module
+from src.core.classifier import AUTO_CATEGORY, AspirasiPrediction, classify_aspirasi
+from src.models import Aspirasi
+
+PUPUK = "Harga pupuk bersubsidi naik, petani kesulitan menanam padi."
+MINYAK = "Harga minyak goreng di pasar naik terus, pedagang kecil merugi."
+
+
+@pytest.mark.parametrize(
+    "content, category, komisi",
+    [
+        (PUPUK, "Pertanian", "Komisi IV"),
+        ("Puskesmas kekurangan dokter dan obat.", "Kesehatan", "Komisi IX"),
+        ("Jalan desa rusak parah dan jembatan putus.", "Infrastruktur", "Komisi V"),
+        (MINYAK, "Ekonomi", "Komisi VI"),
+    ],
+)
+def test_prediction(content, category, komisi):
+    prediction = classify_aspirasi(content)
+    assert (prediction.category, prediction.komisi) == (category, komisi)
+    assert prediction.confident and prediction.routes_komisi
+
+
+def test_text_without_known_terms_is_not_confident():
+    prediction = classify_aspirasi("Bagaimana kabar anda hari ini")
+    assert prediction.score == 0
+    assert not prediction.confident and not prediction.routes_komisi
+
+
+def test_min_score_threshold(monkeypatch):
+    prediction = AspirasiPrediction("Ekonomi", "Komisi VI", score=0.12, komisi_score=0.08)
+    monkeypatch.setattr(settings, "classifier_min_score", 0.05)
+    assert prediction.confident and prediction.routes_komisi
+    monkeypatch.setattr(settings, "classifier_min_score", 0.1)
+    assert prediction.confident and not prediction.routes_komisi
+    monkeypatch.setattr(settings, "classifier_min_score", 0.15)
+    assert not prediction.confident and not prediction.routes_komisi
+
+
+def run_auto(content: str):
+    simulator = DPRSimulator(api_key="sk-test", deduplicate=False, memoize=False)
+    simulator.create_members(575)
+    aspirasi = Aspirasi(
+        id=1,
+        source="Jawa Tengah",
+        category=AUTO_CATEGORY,
+        content=content,
+        priority="Sedang",
+        timestamp=datetime.now(),
+    )
+    result = asyncio.run(simulator.process_aspirasi(aspirasi, sample_size=20))
+    members = {m.id: m for m in simulator.members}
+    return result, {members[i].komisi for i in result.simulation_details.relevant_member_ids}
+
+
+def test_predicted_commission_routes_auto_aspiration():
+    result, komisi = run_auto(MINYAK)
+    assert result.aspirasi.category == "Ekonomi"
+    assert komisi == {"Komisi VI"}
+    assert result.simulation_details.komisi_utama == "Komisi VI"
+    assert result.simulation_details.kategori_otomatis
+
+
+def test_uncertain_commission_routes_to_all_of_the_category(monkeypatch):
+    prediction = AspirasiPrediction("Ekonomi", "Komisi VI", score=0.2, komisi_score=0.01)
+    monkeypatch.setattr(simulator_module, "classify_aspirasi", lambda text: prediction)
+    result, komisi = run_auto(MINYAK)
+    assert result.aspirasi.category == "Ekonomi"
+    assert komisi == {"Komisi VI", "Komisi VII", "Komisi XI"}
+
+
+def test_undetected_category_routes_to_every_commission(monkeypatch):
+    monkeypatch.setattr(settings, "classifier_min_score", 1.0)
+    result, komisi = run_auto(MINYAK)
+    assert result.aspirasi.category == AUTO_CATEGORY
+    assert not result.simulation_details.kategori_otomatis
+    assert len(komisi) > 1
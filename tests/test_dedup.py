@@ -0,0 +1,100 @@
+"""Near-duplicate detection of aspirations."""
+
+import asyncio
+from datetime import datetime
+
+from src.core import DPRSimulator
+from src.core.dedup import DuplicateIndex
+from src.models import Aspirasi
+
+CONTENT = "Jalan utama di desa kami rusak parah sejak musim hujan dan belum pernah diperbaiki oleh pemerintah daerah."
+REWORDED = "Jalan utama di desa kami rusak parah sejak musim hujan, dan belum pernah diperbaiki pemerintah daerah!"
+OTHER = "Harga pupuk bersubsidi naik dua kali lipat sehingga petani kesulitan menanam padi musim ini."
+KEY = ("Infrastruktur", "Jawa Tengah", 10, None)
+
+
+def index(**kwargs) -> DuplicateIndex:
+    return DuplicateIndex(threshold=0.8, freshness_seconds=60, num_perm=64, max_entries=100, **kwargs)
+
+
+def test_near_duplicate_is_found():
+    async def run():
+        idx = index()
+        entry = idx.add(1, idx.signature(CONTENT), KEY)
+        return entry, idx.find(idx.signature(REWORDED), KEY)
+
+    entry, found = asyncio.run(run())
+    assert found is not None
+    assert found[0] is entry and found[1] >= 0.8
+
+
+def test_different_content_or_run_parameters_do_not_match():
+    async def run():
+        idx = index()
+        idx.add(1, idx.signature(CONTENT), KEY)
+        other_key = ("Infrastruktur", "Jawa Barat", 10, None)
+        return idx.find(idx.signature(OTHER), KEY), idx.find(idx.signature(CONTENT), other_key)
+
+    assert asyncio.run(run()) == (None, None)
+
+
+def test_expired_result_is_not_reused():
+    async def run():
+        idx = DuplicateIndex(threshold=0.8, freshness_seconds=0, num_perm=64, max_entries=100)
+        entry = idx.add(1, idx.signature(CONTENT), KEY)
+        in_flight = idx.find(idx.signature(CONTENT), KEY)
+        entry.complete(None)
+        await asyncio.sleep(0.01)
+        return entry, in_flight, idx.find(idx.signature(CONTENT), KEY)
+
+    entry, in_flight, expired = asyncio.run(run())
+    # In-flight entries never expire; completed ones do after the freshness window
+    assert in_flight is not None and in_flight[0] is entry
+    assert expired is None
+
+
+def test_removed_entry_is_not_found():
+    async def run():
+        idx = index()
+        entry = idx.add(1, idx.signature(CONTENT), KEY)
+        idx.remove(entry)
+        idx.remove(entry)
+        return idx, idx.find(idx.signature(CONTENT), KEY)
+
+    idx, found = asyncio.run(run())
+    assert found is None
+    assert idx.stats() == {"entries": 0, "in_flight": 0, "buckets": 0}
+
+
+def test_reused_result_is_filed_under_the_duplicate():
+    simulator = DPRSimulator(api_key="sk-test", deduplicate=True, memoize=False)
+    simulator.create_members(50)
+
+    def aspirasi(i: int, content: str) -> Aspirasi:
+        return Aspirasi(
+            id=i,
+            source="Jawa Tengah",
+            category="Infrastruktur",
+            content=content,
+            priority="Tinggi",
+            timestamp=datetime.now(),
+        )
+
+    async def run():
+        first = await simulator.process_aspirasi(aspirasi(1, CONTENT), sample_size=5)
+        second = await simulator.process_aspirasi(aspirasi(2, REWORDED), sample_size=5)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert second.duplikat_dari == 1
+    assert {r.aspirasi_id for r in second.tanggapan_anggota} == {2}
+    assert all(r.dari_memo and r.cost_usd == 0 for r in second.tanggapan_anggota)
+    original_cost = sum(r.cost_usd for r in first.tanggapan_anggota)
+    assert sum(r.biaya_asli_usd for r in second.tanggapan_anggota) == original_cost
+    assert second.total_cost_usd == 0
+    assert second.kompilasi.cost_usd == 0 and second.tindak_lanjut.cost_usd == 0
+    assert sum(second.analytics.biaya_per_fraksi.values()) == 0
+    assert second.analytics.jumlah_tanggapan == first.analytics.jumlah_tanggapan
+    assert second.simulation_details.tanggapan_dari_memo == len(second.tanggapan_anggota)
+    assert second.trace.trace_id != first.trace.trace_id
+    assert [s.attributes.get("duplikat_dari") for s in second.trace.spans] == [1]
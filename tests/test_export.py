@@ -0,0 +1,63 @@
+"""Columnar Parquet export of pipeline results."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from src.core import DPRSimulator  # noqa: E402
+from src.core.export import ParquetExporter, read_table  # noqa: E402
+from src.core.sinks import ParquetSink  # noqa: E402
+from src.models import Aspirasi  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def result():
+    simulator = DPRSimulator(api_key="sk-test", deduplicate=False, memoize=False, result_store_path="")
+    simulator.create_members(50)
+    aspirasi = Aspirasi(
+        id=3,
+        source="Jawa Tengah",
+        category="Kesehatan",
+        content="Puskesmas di kecamatan kami kekurangan tenaga medis.",
+        priority="Tinggi",
+        timestamp=datetime.now(),
+    )
+    return asyncio.run(simulator.process_aspirasi(aspirasi, sample_size=4))
+
+
+def test_result_round_trips_through_parquet(result, tmp_path):
+    with ParquetExporter(tmp_path) as exporter:
+        exporter.write(result)
+    assert exporter.rows_written == {"tanggapan": 4, "kompilasi": 1, "tindak_lanjut": 1}
+
+    tanggapan = read_table(tmp_path, "tanggapan")
+    assert tanggapan.num_rows == 4
+    for column in ("fraksi", "komisi", "provinsi", "relevansi", "sentiment", "tier"):
+        assert pa.types.is_dictionary(tanggapan.schema.field(column).type)
+    rows = sorted(tanggapan.to_pylist(), key=lambda row: row["member_id"])
+    responses = sorted(result.tanggapan_anggota, key=lambda r: r.member_id)
+    assert [row["member_id"] for row in rows] == [r.member_id for r in responses]
+    assert [row["relevansi"] for row in rows] == [r.relevansi for r in responses]
+    assert [row["poin_kunci"] for row in rows] == [r.poin_kunci for r in responses]
+    assert {row["run_id"] for row in rows} == {result.trace.trace_id}
+    assert {row["kategori"] for row in rows} == {"Kesehatan"}
+
+    (kompilasi,) = read_table(tmp_path, "kompilasi", filters=[("kategori", "=", "Kesehatan")]).to_pylist()
+    assert kompilasi["status"] == result.kompilasi.status
+    assert kompilasi["total_cost_usd"] == pytest.approx(result.total_cost_usd)
+    assert read_table(tmp_path, "tindak_lanjut", columns=["aspirasi_id"]).to_pydict() == {"aspirasi_id": [3]}
+
+
+def test_parquet_sink_streams_results(result, tmp_path):
+    async def run():
+        sink = ParquetSink(tmp_path, batch_rows=2)
+        await sink.put(result)
+        await sink.put(result)
+        await sink.close()
+
+    asyncio.run(run())
+    assert read_table(tmp_path, "tanggapan").num_rows == 8
+    assert read_table(tmp_path, "kompilasi").num_rows == 2
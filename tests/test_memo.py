@@ -0,0 +1,109 @@
+"""Member-level memo of absorb responses."""
+
+import asyncio
+
+import pytest
+
+from src.core.memo import AbsorbMemo
+from src.models import AbsorpsiResponse
+
+
+def response(member_id: int = 1, aspirasi_id: int = 1, **fields) -> AbsorpsiResponse:
+    return AbsorpsiResponse(
+        member_id=member_id,
+        aspirasi_id=aspirasi_id,
+        relevansi="Tinggi",
+        alasan_relevansi="Uji",
+        cost_usd=0.01,
+        **fields,
+    )
+
+
+class Calls:
+    """Counts calls and answers after an optional delay."""
+
+    def __init__(self, result=None, delay: float = 0.0):
+        self.count = 0
+        self.result = result
+        self.delay = delay
+
+    async def __call__(self) -> AbsorpsiResponse:
+        self.count += 1
+        await asyncio.sleep(self.delay)
+        if isinstance(self.result, BaseException):
+            raise self.result
+        return self.result or response()
+
+
+def test_hit_is_reused_at_no_cost():
+    async def run():
+        memo = AbsorbMemo(max_entries=10)
+        calls = Calls()
+        first = await memo.get_or_call("k", 1, calls)
+        second = await memo.get_or_call("k", 2, calls)
+        return memo, calls, first, second
+
+    memo, calls, first, second = asyncio.run(run())
+    assert calls.count == 1
+    assert (memo.hits, memo.misses) == (1, 1)
+    assert not first.dari_memo and first.cost_usd == 0.01
+    assert second.dari_memo and second.aspirasi_id == 2
+    assert second.cost_usd == 0.0 and second.biaya_asli_usd == 0.01
+
+
+def test_concurrent_calls_share_one_call():
+    async def run():
+        memo = AbsorbMemo(max_entries=10)
+        calls = Calls(delay=0.01)
+        results = await asyncio.gather(*(memo.get_or_call("k", i, calls) for i in range(5)))
+        return calls, results
+
+    calls, results = asyncio.run(run())
+    assert calls.count == 1
+    assert sum(r.dari_memo for r in results) == 4
+
+
+def test_errors_are_not_kept():
+    async def run():
+        memo = AbsorbMemo(max_entries=10)
+        calls = Calls(result=response(error="timeout"))
+        await memo.get_or_call("k", 1, calls)
+        await memo.get_or_call("k", 1, calls)
+        return memo, calls
+
+    memo, calls = asyncio.run(run())
+    assert calls.count == 2
+    assert len(memo) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    async def run():
+        memo = AbsorbMemo(max_entries=2)
+        calls = Calls()
+        for key in ("a", "b", "a", "c"):
+            await memo.get_or_call(key, 1, calls)
+        await memo.get_or_call("b", 1, calls)
+        return memo, calls
+
+    memo, calls = asyncio.run(run())
+    # "b" was the least recently used when "c" arrived
+    assert calls.count == 4
+    assert len(memo) == 2
+
+
+@pytest.mark.parametrize("failure", [RuntimeError("boom"), asyncio.CancelledError()])
+def test_waiter_falls_back_when_the_shared_call_fails(failure):
+    async def run():
+        memo = AbsorbMemo(max_entries=10)
+        failing = Calls(result=failure, delay=0.01)
+        fallback = Calls()
+        first = asyncio.ensure_future(memo.get_or_call("k", 1, failing))
+        await asyncio.sleep(0)
+        second = await memo.get_or_call("k", 2, fallback)
+        with pytest.raises(type(failure)):
+            await first
+        return fallback, second
+
+    fallback, second = asyncio.run(run())
+    assert fallback.count == 1
+    assert not second.dari_memo
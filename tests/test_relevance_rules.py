@@ -0,0 +1,107 @@
+"""Rule-based relevance pre-scoring."""
+
+import asyncio
+from datetime import datetime
+
+from src.core import DPRSimulator
+from src.core.member_factory import DPRMemberFactory
+from src.core.metrics import metrics
+from src.core.relevance_rules import same_province, score_relevance, select_members
+from src.models import Aspirasi, DPRMember
+
+
+def member(komisi: str = "Komisi I", province: str = "Jawa Tengah", expertise=None) -> DPRMember:
+    return DPRMember(
+        id=1,
+        name="Anggota Uji",
+        faction="Fraksi Uji",
+        komisi=komisi,
+        dapil="Dapil Uji",
+        province=province,
+        expertise=expertise or [],
+    )
+
+
+def test_commission_match_is_certainly_high():
+    prior = score_relevance(member(komisi="Komisi X"), "Pendidikan", "Papua")
+    assert (prior.relevansi, prior.certain) == ("Tinggi", True)
+
+
+def test_komisi_filter_overrides_category():
+    prior = score_relevance(member(komisi="Komisi III"), "Pendidikan", "Papua", komisi_filter="Komisi III")
+    assert (prior.relevansi, prior.certain) == ("Tinggi", True)
+
+
+def test_same_province_is_certainly_high():
+    prior = score_relevance(member(province="Papua"), "Pendidikan", "papua ")
+    assert (prior.relevansi, prior.certain) == ("Tinggi", True)
+
+
+def test_province_prefix_is_not_a_match():
+    assert not same_province("Papua", "Papua Barat")
+    assert not same_province("Maluku", "Maluku Utara")
+    prior = score_relevance(member(province="Papua"), "Pendidikan", "Papua Barat")
+    assert (prior.relevansi, prior.certain) == ("Rendah", True)
+
+
+def test_province_aliases():
+    assert same_province("Daerah Istimewa Yogyakarta", "Yogyakarta")
+    assert same_province("DKI Jakarta", "Jakarta")
+    assert not same_province("", "")
+
+
+def test_unmapped_category_is_uncertain():
+    prior = score_relevance(member(), "Kategori Baru", "Papua")
+    assert (prior.relevansi, prior.certain) == ("Sedang", False)
+
+
+def test_expertise_outside_commission_is_uncertain():
+    prior = score_relevance(member(expertise=["Pendidikan"]), "Pendidikan", "Papua")
+    assert (prior.relevansi, prior.certain) == ("Sedang", False)
+
+
+def test_unrelated_member_is_certainly_low():
+    prior = score_relevance(member(), "Pendidikan", "Papua")
+    assert (prior.relevansi, prior.certain) == ("Rendah", True)
+
+
+def test_sample_is_filled_beyond_the_commission_by_prior():
+    roster = DPRMemberFactory.create_members(575)
+    commission = DPRMemberFactory.get_relevant_members(roster, "Pendidikan", "Papua", limit=200)
+    selected = select_members(roster, "Pendidikan", "Papua", limit=200)
+
+    assert len(selected) == 200
+    assert selected[: len(commission)] == commission
+    order = {"Tinggi": 0, "Sedang": 1, "Rendah": 2}
+    fill = [order[score_relevance(m, "Pendidikan", "Papua").relevansi] for m in selected[len(commission) :]]
+    assert fill == sorted(fill) and fill[-1] == 2
+    assert select_members(roster, "Pendidikan", "Papua", limit=10) == commission[:10]
+
+
+def absorb_calls() -> float:
+    return sum(v for k, v in metrics.llm_calls._values.items() if ("agent", "absorb") in k)
+
+
+def test_prescoring_answers_ruled_out_members_without_calls():
+    simulator = DPRSimulator(
+        api_key="sk-test", absorb_mode="single", relevance_prescoring=True, deduplicate=False, memoize=False
+    )
+    simulator.create_members(575)
+    aspirasi = Aspirasi(
+        id=1,
+        source="Papua",
+        category="Pendidikan",
+        content="Gedung sekolah dasar di kampung kami rusak.",
+        priority="Tinggi",
+        timestamp=datetime.now(),
+    )
+
+    before = absorb_calls()
+    result = asyncio.run(simulator.process_aspirasi(aspirasi, sample_size=200))
+    calls = absorb_calls() - before
+
+    templated = [r for r in result.tanggapan_anggota if r.tier == "rules"]
+    assert len(result.tanggapan_anggota) == 200
+    assert templated and all(r.relevansi == "Rendah" and r.cost_usd == 0 for r in templated)
+    assert calls == 200 - len(templated)
+    assert result.simulation_details.anggota_dinilai_aturan == len(templated)
@@ -0,0 +1,15 @@
+"""Settings access through the proxy and the former settings module."""
+
+import src.config
+from src.config import settings
+
+
+def test_former_module_imports_keep_working(monkeypatch):
+    from src.config.settings import Settings, get_settings
+
+    module = src.config.settings
+    assert isinstance(get_settings(), Settings)
+    # The submodule replaced the proxy on the package but reads and writes the same instance
+    monkeypatch.setattr(module, "rate_limit_delay", 2.5)
+    assert settings.rate_limit_delay == get_settings().rate_limit_delay == 2.5
+    assert module.llm_backend == settings.llm_backend == "fake"
@@ -0,0 +1,65 @@
+"""Result sinks for bulk runs."""
+
+import asyncio
+import gzip
+import json
+import threading
+from datetime import datetime
+
+from src.core.sinks import JsonlSink
+from src.models import Aspirasi, KompilasiResponse, PipelineResult, TindakLanjutResponse
+
+
+def result(i: int) -> PipelineResult:
+    return PipelineResult(
+        aspirasi=Aspirasi(
+            id=i,
+            source="Jawa Tengah",
+            category="Kesehatan",
+            content=f"Aspirasi {i}",
+            priority="Sedang",
+            timestamp=datetime.now(),
+        ),
+        kompilasi=KompilasiResponse(
+            aspirasi_id=i,
+            jumlah_anggota=0,
+            ringkasan="",
+            tema_utama=[],
+            rekomendasi_tindak_lanjut="",
+            status="tidak_relevan",
+        ),
+        tindak_lanjut=TindakLanjutResponse(
+            langkah_tindak_lanjut=[],
+            komisi_penanggung_jawab="",
+            timeline="",
+            indikator_keberhasilan=[],
+            mekanisme="",
+        ),
+    )
+
+
+class RecordingSink(JsonlSink):
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = set()
+
+    def _write(self, result: PipelineResult) -> None:
+        self.threads.add(threading.get_ident())
+        super()._write(result)
+
+
+def test_jsonl_sink_writes_off_the_event_loop(tmp_path):
+    path = tmp_path / "hasil.jsonl.gz"
+    sink = RecordingSink(path)
+
+    async def run():
+        await asyncio.gather(*(sink.put(result(i)) for i in range(1, 21)))
+        await sink.close()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert sink.threads and loop_thread not in sink.threads
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        ids = [json.loads(line)["aspirasi"]["id"] for line in f]
+    assert sorted(ids) == list(range(1, 21)) and sink.count == 20
@@ -0,0 +1,48 @@
+"""Server-side paging, filtering and sorting of UI tables."""
+
+from src.ui.tables import PagedTable
+
+COLUMNS = ["ID", "Nama", "Provinsi"]
+
+
+def table(count: int = 30) -> PagedTable:
+    provinces = ["Papua", "Aceh", "Bali"]
+    return PagedTable(COLUMNS, [[i, f"Anggota {i}", provinces[i % 3]] for i in range(1, count + 1)])
+
+
+def test_pages_are_sliced_and_clamped():
+    t = table()
+    rows, info = t.page(page=2, page_size=10)
+    assert [r[0] for r in rows] == list(range(11, 21))
+    assert info == "Halaman 2/3 · 30 baris"
+
+    rows, info = t.page(page=99, page_size=10)
+    assert [r[0] for r in rows] == list(range(21, 31))
+    assert info == "Halaman 3/3 · 30 baris"
+    assert t.page(page=0, page_size=10)[1] == "Halaman 1/3 · 30 baris"
+
+
+def test_query_filters_across_columns():
+    rows, info = table().page(page_size=5, query="  PAPUA ")
+    assert all(r[2] == "Papua" for r in rows)
+    assert info == "Halaman 1/2 · 10 baris (difilter dari 30)"
+
+
+def test_sort_descending_and_unknown_column():
+    rows, _ = table().page(page_size=3, sort_by="ID", descending=True)
+    assert [r[0] for r in rows] == [30, 29, 28]
+    rows, _ = table().page(page_size=3, sort_by="Tidak Ada")
+    assert [r[0] for r in rows] == [1, 2, 3]
+
+
+def test_appended_rows_invalidate_cached_pages():
+    t = table(3)
+    assert t.page(query="papua")[1] == "Halaman 1/1 · 1 baris (difilter dari 3)"
+    assert t.page(sort_by="ID", descending=True)[0][0][0] == 3
+
+    t.append([4, "Anggota 4", "Papua"])
+    rows, info = t.page(query="papua")
+    assert [r[0] for r in rows] == [3, 4]
+    assert info == "Halaman 1/1 · 2 baris (difilter dari 4)"
+    assert t.page(sort_by="ID", descending=True)[0][0][0] == 4
+    assert len(t) == 4
@@ -0,0 +1,48 @@
+"""Trace spans of LLM calls."""
+
+import asyncio
+from datetime import datetime
+
+from src.core.agents import AbsorbAgent
+from src.core.tracing import start_trace
+from src.models import Aspirasi, DPRMember
+from src.ui.timeline import render_timeline, straggler_summary
+
+MEMBER = DPRMember(
+    id=7,
+    name="Anggota Uji",
+    faction="Fraksi Uji",
+    komisi="Komisi V",
+    dapil="Jawa Tengah I",
+    province="Jawa Tengah",
+    expertise=["Infrastruktur"],
+)
+ASPIRASI = Aspirasi(
+    id=1,
+    source="Jawa Tengah",
+    category="Infrastruktur",
+    content="Jalan desa rusak parah.",
+    priority="Tinggi",
+    timestamp=datetime.now(),
+)
+
+
+def test_router_wait_is_recorded_apart_from_the_call(monkeypatch):
+    agent = AbsorbAgent(api_key="sk-test", mode="single")
+    acquire = agent.router.acquire
+
+    async def throttled(tokens: int = 0):
+        # Stands in for a per-key RPM budget that is used up
+        await asyncio.sleep(0.05)
+        return await acquire(tokens)
+
+    monkeypatch.setattr(agent.router, "acquire", throttled)
+    with start_trace() as tracer:
+        asyncio.run(agent.invoke(MEMBER, ASPIRASI))
+
+    (call,) = [s for s in tracer.spans if s.kind == "llm_call"]
+    assert call.router_wait_ms >= 50
+    assert call.duration_ms >= call.router_wait_ms
+    trace = tracer.to_trace()
+    assert "tunggu kuota" in render_timeline(trace)
+    assert "tunggu kuota" in straggler_summary(trace)